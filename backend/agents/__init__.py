@@ -1,7 +1,8 @@
 """Agent runtime package"""
 
-from .recipe_evaluator import RecipeEvaluator
+from .recipe_evaluator import RecipeEvaluator, RecipeTimeoutError
+from .recipe_compiler import CompiledRecipe, recipe_plan_cache
 from .cookbook_loader import CookbookLoader
 from .agent import Agent, create_agent
 
-__all__ = ['RecipeEvaluator', 'CookbookLoader', 'Agent', 'create_agent']
+__all__ = ['RecipeEvaluator', 'RecipeTimeoutError', 'CompiledRecipe', 'recipe_plan_cache', 'CookbookLoader', 'Agent', 'create_agent']
@@ -19,7 +19,9 @@ from sqlalchemy import select
 
 from app.models.agent import AgentInstance, Recipe, Cookbook, AgentRole
 from agents.recipe_evaluator import RecipeEvaluator
-from agents.recipe_schema import validate_recipe_yaml, validate_recipe_inputs
+from agents.checkpoint_store import CheckpointError
+from agents.recipe_schema import validate_recipe_inputs
+from agents.recipe_compiler import recipe_plan_cache
 from components.subscription_tracker import SubscriptionTracker
 
 
@@ -56,7 +58,7 @@ class Agent:
         self.agent_role: Optional[AgentRole] = None
         self.cookbooks: List[Cookbook] = []
         self.recipes: List[Recipe] = []
-        
+    
     async def initialize(self) -> bool:
         """
         Load AgentInstance from database with all relationships
@@ -131,7 +133,7 @@ class Agent:
         
         Args:
             recipe_id: UUID of recipe to validate
-            
+        
         Returns:
             True if agent owns recipe, False otherwise
         """
@@ -152,7 +154,10 @@ class Agent:
         self, 
         recipe_id: UUID, 
         inputs: Dict[str, Any],
-        mock_mode: bool = False
+        mock_mode: bool = False,
+        checkpoint_id: Optional[str] = None,
+        resume: bool = False,
+        output_node: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Execute a recipe with mandatory subscription tracking
@@ -161,10 +166,15 @@ class Agent:
             recipe_id: UUID of recipe to execute
             inputs: Input parameters for recipe execution
             mock_mode: If True, components run in mock mode (no external API calls)
-            
+            checkpoint_id: If set, checkpoint progress after each node (e.g. TaskQueue ID)
+            resume: If True, resume from checkpoint_id (falls back to a full run
+                    when no usable checkpoint exists)
+            output_node: If set, return this node's output and run only the
+                         nodes it depends on (plus mandatory nodes)
+        
         Returns:
             Execution result dictionary with output, metrics, tracking info
-            
+        
         Raises:
             ValueError: If recipe not owned by agent
             RuntimeError: If agent not initialized
@@ -188,16 +198,21 @@ class Agent:
         # Extract yaml_definition from database (JSONB field)
         recipe_yaml = recipe.yaml_definition
         
+        if not recipe_yaml:
+            raise ValueError(f"Recipe {recipe_id} has no yaml_definition in database")
+        
+        # Compiled plan (schema validation, DAG order, templates) is built once per
+        # (recipe id, version, content hash) and shared with RecipeEvaluator
+        compiled_recipe = recipe_plan_cache.get_or_compile(recipe_yaml, RecipeEvaluator.COMPONENTS.keys())
+        
         # Validate recipe schema and inputs
         try:
-            validated_recipe_schema = validate_recipe_yaml({'recipe': recipe_yaml})
-            validated_inputs = validate_recipe_inputs(validated_recipe_schema, inputs)
+            if compiled_recipe.schema is None:
+                raise ValueError(compiled_recipe.schema_error)
+            validated_inputs = validate_recipe_inputs(compiled_recipe.schema, inputs)
         except Exception as e:
             raise ValueError(f"Input validation failed: {e}")
         
-        if not recipe_yaml:
-            raise ValueError(f"Recipe {recipe_id} has no yaml_definition in database")
-        
         # Initialize RecipeEvaluator with mandatory tracking
         tracking_config = {
             'agent_instance_id': str(self.agent_instance_id),
@@ -207,13 +222,22 @@ class Agent:
         
         evaluator = RecipeEvaluator(
             recipe_definition=recipe_yaml,
+            compiled_recipe=compiled_recipe,
             tracking_config=tracking_config,
             db_session=self.session,  # Pass DB session for audit log persistence
-            mock_mode=mock_mode
+            mock_mode=mock_mode,
+            checkpoint_id=checkpoint_id
         )
         
-        # Execute recipe with validated inputs
-        result = await evaluator.execute(validated_inputs)
+        # Execute recipe with validated inputs (skipping checkpointed nodes on resume)
+        result = None
+        if resume and checkpoint_id:
+            try:
+                result = await evaluator.resume(checkpoint_id, output_node)
+            except CheckpointError as e:
+                print(f"[Agent] Cannot resume ({e}), running from scratch")
+        if result is None:
+            result = await evaluator.execute(validated_inputs, output_node)
         
         # Update agent activity timestamp
         self.agent_instance.last_active_at = datetime.now(timezone.utc)
@@ -270,10 +294,10 @@ async def create_agent(agent_instance_id: UUID, session: AsyncSession) -> Agent:
     Args:
         agent_instance_id: UUID of AgentInstance
         session: Database session
-        
+    
     Returns:
         Initialized Agent instance
-        
+    
     Raises:
         ValueError: If agent not found or inactive
     """
@@ -0,0 +1,245 @@
+"""
+Blob Store
+Out-of-line storage for large node outputs
+
+RecipeEvaluator keeps node outputs above a size threshold here and puts a
+small BlobRef handle in execution_state instead. Blobs are content-addressed
+(SHA-256 of the serialized JSON), so identical outputs are stored once.
+The default store writes to local disk; implement BlobStore to plug in an
+object store (S3, Azure Blob) and register it with set_blob_store().
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+# Marker key of a serialized BlobRef
+BLOB_REF_KEY = '$blob'
+
+_KEY_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+@dataclass(frozen=True)
+class BlobRef:
+    """Handle to a JSON value held in a BlobStore"""
+    key: str
+    size: int
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form (used in checkpoints, caches and API state)"""
+        return {BLOB_REF_KEY: self.key, 'size': self.size}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BlobRef':
+        """Rebuild handle from to_dict() output"""
+        return cls(key=data[BLOB_REF_KEY], size=data.get('size', 0))
+    
+    @staticmethod
+    def is_ref_dict(value: Any) -> bool:
+        """True if value is a serialized BlobRef"""
+        return isinstance(value, dict) and BLOB_REF_KEY in value
+
+
+class BlobStore(ABC):
+    """
+    Content-addressed byte storage
+    
+    Implementations must be safe to call from multiple threads and
+    processes; put() must be idempotent for identical data.
+    """
+    
+    @abstractmethod
+    def put(self, data: bytes) -> str:
+        """
+        Store bytes
+        
+        Args:
+            data: Blob content
+        
+        Returns:
+            Blob key (SHA-256 hex digest of data)
+        """
+        pass
+    
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        """
+        Load bytes
+        
+        Raises:
+            KeyError: If blob does not exist (never stored or expired)
+        """
+        pass
+    
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """True if blob is available"""
+        pass
+    
+    @abstractmethod
+    def delete(self, key: str):
+        """Delete blob (no-op if missing)"""
+        pass
+    
+    def put_json(self, value: Any) -> BlobRef:
+        """Serialize value as JSON and store it"""
+        data = json.dumps(value, default=str).encode()
+        return BlobRef(key=self.put(data), size=len(data))
+    
+    def get_json(self, ref: BlobRef) -> Any:
+        """Load and deserialize value stored with put_json()"""
+        return json.loads(self.get(ref.key))
+    
+    @staticmethod
+    def key_for(data: bytes) -> str:
+        """Content address of data"""
+        return hashlib.sha256(data).hexdigest()
+
+
+class LocalBlobStore(BlobStore):
+    """
+    Blob store on local disk
+    
+    Files live under <directory>/<key[:2]>/<key> and are written atomically
+    (temp file + rename). Blobs untouched for max_age seconds are pruned by a
+    background thread (the directory scan never runs inside put()).
+    """
+    
+    # Start a background prune every N puts
+    PRUNE_INTERVAL = 100
+    
+    def __init__(self, directory: str, max_age: int = 86400):
+        """
+        Initialize local blob store
+        
+        Args:
+            directory: Root directory for blob files
+            max_age: Seconds a blob is kept after its last write (default: 24 hours)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self._puts = 0
+        self._lock = threading.Lock()
+        self._pruner: Optional[threading.Thread] = None
+    
+    def _path(self, key: str) -> Path:
+        if not _KEY_PATTERN.match(key):
+            raise KeyError(f"Invalid blob key: {key}")
+        return self.directory / key[:2] / key
+    
+    def put(self, data: bytes) -> str:
+        key = self.key_for(data)
+        path = self._path(key)
+        
+        if path.exists():
+            # Already stored - refresh age so it is not pruned while in use
+            os.utime(path)
+        else:
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        
+        with self._lock:
+            self._puts += 1
+            if self._puts % self.PRUNE_INTERVAL == 0 and not (self._pruner and self._pruner.is_alive()):
+                self._pruner = threading.Thread(target=self.prune, name='blob-prune', daemon=True)
+                self._pruner.start()
+        
+        return key
+    
+    def get(self, key: str) -> bytes:
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            raise KeyError(f"Blob not found: {key}")
+    
+    def exists(self, key: str) -> bool:
+        try:
+            return self._path(key).exists()
+        except KeyError:
+            return False
+    
+    def delete(self, key: str):
+        try:
+            self._path(key).unlink()
+        except (FileNotFoundError, KeyError):
+            pass
+    
+    def prune(self) -> int:
+        """
+        Delete blobs older than max_age
+        
+        Returns:
+            Number of blobs deleted
+        """
+        cutoff = time.time() - self.max_age
+        deleted = 0
+        for path in self.directory.glob('*/*'):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    deleted += 1
+            except FileNotFoundError:
+                continue
+        return deleted
+
+
+class InMemoryBlobStore(BlobStore):
+    """Blob store in process memory (tests, single-process development)"""
+    
+    def __init__(self):
+        self._blobs: Dict[str, bytes] = {}
+    
+    def put(self, data: bytes) -> str:
+        key = self.key_for(data)
+        self._blobs[key] = data
+        return key
+    
+    def get(self, key: str) -> bytes:
+        try:
+            return self._blobs[key]
+        except KeyError:
+            raise KeyError(f"Blob not found: {key}")
+    
+    def exists(self, key: str) -> bool:
+        return key in self._blobs
+    
+    def delete(self, key: str):
+        self._blobs.pop(key, None)
+
+
+_blob_store: Optional[BlobStore] = None
+_blob_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """
+    Get process-wide blob store
+    
+    Defaults to LocalBlobStore in BLOB_STORE_DIR (or <tmp>/teamai-blobs)
+    """
+    global _blob_store
+    with _blob_store_lock:
+        if _blob_store is None:
+            directory = os.getenv('BLOB_STORE_DIR') or os.path.join(tempfile.gettempdir(), 'teamai-blobs')
+            _blob_store = LocalBlobStore(directory)
+        return _blob_store
+
+
+def set_blob_store(store: Optional[BlobStore]):
+    """Replace process-wide blob store (None restores the default)"""
+    global _blob_store
+    with _blob_store_lock:
+        _blob_store = store
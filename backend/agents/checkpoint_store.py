@@ -0,0 +1,81 @@
+"""
+Checkpoint Store
+Persists partial recipe execution state so failed runs can resume
+without re-running (and re-paying for) nodes that already succeeded
+"""
+import sys
+from pathlib import Path
+from typing import Dict, Any, Optional
+from datetime import datetime, timezone
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+if str(backend_path) not in sys.path:
+    sys.path.insert(0, str(backend_path))
+
+from components.utils.cache_manager import CacheManager, create_cache_manager
+
+
+class CheckpointError(ValueError):
+    """Raised when a checkpoint is missing or cannot be resumed"""
+
+
+class CheckpointStore:
+    """
+    Redis-backed checkpoint storage (in-memory fallback via CacheManager)
+    
+    A checkpoint holds the recipe inputs, the content hash of the recipe
+    it was produced by, and the execution_state entries of every node that
+    completed successfully. Checkpoints are written after each successful
+    node and deleted when the execution finishes.
+    """
+    
+    NAMESPACE = 'recipe_checkpoint'
+    
+    def __init__(self, cache_manager: Optional[CacheManager] = None, ttl: int = 86400):
+        """
+        Initialize checkpoint store
+        
+        Args:
+            cache_manager: Backing cache (Redis-backed in production)
+            ttl: Checkpoint lifetime in seconds (default: 24 hours)
+        """
+        self.cache = cache_manager or CacheManager(default_ttl=ttl)
+        self.ttl = ttl
+    
+    async def save(self, checkpoint_id: str, checkpoint: Dict[str, Any]):
+        """
+        Save (overwrite) checkpoint
+        
+        Args:
+            checkpoint_id: Checkpoint identifier (e.g. TaskQueue ID)
+            checkpoint: JSON-serializable checkpoint data
+        """
+        checkpoint = dict(checkpoint, saved_at=datetime.now(timezone.utc).isoformat())
+        await self.cache.set(self.NAMESPACE, checkpoint_id, checkpoint, ttl=self.ttl)
+    
+    async def load(self, checkpoint_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load checkpoint
+        
+        Args:
+            checkpoint_id: Checkpoint identifier
+        
+        Returns:
+            Checkpoint data or None if not found/expired
+        """
+        return await self.cache.get(self.NAMESPACE, checkpoint_id)
+    
+    async def delete(self, checkpoint_id: str):
+        """
+        Delete checkpoint
+        
+        Args:
+            checkpoint_id: Checkpoint identifier
+        """
+        await self.cache.delete(self.NAMESPACE, checkpoint_id)
+
+
+# Process-wide default store: Redis (REDIS_URL), so a retry resumes in any
+# worker and after restarts; in-memory fallback only without Redis
+checkpoint_store = CheckpointStore(create_cache_manager('recipe checkpoints', default_ttl=86400))
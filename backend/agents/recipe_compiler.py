@@ -0,0 +1,342 @@
+"""
+Recipe Compiler
+Builds an immutable execution plan (CompiledRecipe) once per recipe version
+and shares it between Agent and RecipeEvaluator through a bounded LRU cache
+"""
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Set, Iterable, Tuple
+
+from jinja2 import Template, TemplateError
+
+from agents.recipe_schema import RecipeSchema, validate_recipe_yaml
+from agents.template_engine import get_template
+
+# Components that run on every execution regardless of the requested output
+MANDATORY_COMPONENTS = frozenset({'SubscriptionTracker'})
+
+
+def validate_recipe_structure(recipe: Dict[str, Any], component_names: Iterable[str]) -> List[str]:
+    """
+    Validate recipe structure against the component registry
+    
+    Args:
+        recipe: Recipe dictionary (without the top-level 'recipe' key)
+        component_names: Registered component class names
+    
+    Returns:
+        List of validation errors (empty if recipe is valid)
+    """
+    errors = []
+    for key in ['id', 'name', 'workflow']:
+        if key not in recipe:
+            errors.append(f"Missing required key: {key}")
+    if errors:
+        return errors
+    
+    workflow = recipe['workflow']
+    if 'nodes' not in workflow or 'edges' not in workflow:
+        return ["Invalid workflow structure"]
+    
+    registry = set(component_names)
+    for node in workflow['nodes']:
+        if 'id' not in node or 'component' not in node:
+            errors.append(f"Invalid node structure: {node}")
+            break
+        if node['component'] not in registry:
+            errors.append(f"Unknown component: {node['component']}")
+            break
+        map_config = node.get('map')
+        if map_config is not None:
+            source = map_config.get('over', '') if isinstance(map_config, dict) else ''
+            if source.split('.')[0] not in (node.get('depends_on') or []):
+                errors.append(f"Map node {node['id']} must depend on its source node: {source or '(missing over)'}")
+                break
+    
+    return errors
+
+
+def build_execution_order(nodes: Dict[str, Dict[str, Any]], edges: List[Dict]) -> List[str]:
+    """
+    Build execution order from DAG edges
+    Simple topological sort
+    """
+    # Build adjacency list
+    dependencies = {node_id: [] for node_id in nodes.keys()}
+    for edge in edges:
+        to_node = edge['to']
+        from_node = edge['from']
+        if to_node not in dependencies[from_node]:
+            dependencies[to_node].append(from_node)
+    
+    # Topological sort
+    visited = set()
+    order = []
+    
+    def visit(node_id):
+        if node_id in visited:
+            return
+        visited.add(node_id)
+        for dep in dependencies.get(node_id, []):
+            visit(dep)
+        order.append(node_id)
+    
+    for node_id in nodes.keys():
+        visit(node_id)
+    
+    return order
+
+
+def build_dependency_map(nodes: Dict[str, Dict[str, Any]], edges: List[Dict]) -> Dict[str, Set[str]]:
+    """
+    Build predecessor sets from both edges and depends_on
+    
+    Args:
+        nodes: Node configurations keyed by node ID
+        edges: Workflow edges
+    
+    Returns:
+        Dict mapping node ID to the set of node IDs it waits for
+    """
+    dependencies = {node_id: set() for node_id in nodes.keys()}
+    for edge in edges:
+        dependencies[edge['to']].add(edge['from'])
+    for node_id, node in nodes.items():
+        for dep in node.get('depends_on') or []:
+            dependencies[node_id].add(dep)
+    return dependencies
+
+
+def recipe_content_hash(recipe: Dict[str, Any]) -> str:
+    """Stable SHA-256 hash of a recipe definition"""
+    serialized = json.dumps(recipe, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+class CompiledRecipe:
+    """
+    Execution plan for one recipe version
+    
+    Holds everything RecipeEvaluator would otherwise recompute per run:
+    the validated Pydantic schema, structural validation result, node map,
+    topological order, dependency map and precompiled Jinja2 templates.
+    Treat instances as read-only - they are shared across executions.
+    """
+    
+    def __init__(self, recipe: Dict[str, Any], component_names: Iterable[str]):
+        """
+        Compile recipe
+        
+        Args:
+            recipe: Recipe dictionary ({recipe: {...}} or {...} format)
+            component_names: Registered component class names
+        """
+        # Private copy so later mutation of the caller's dict cannot desync the plan
+        self.recipe = copy.deepcopy(recipe.get('recipe', recipe))
+        self.recipe_id = self.recipe.get('id')
+        self.version = self.recipe.get('version', '1.0.0')
+        self.content_hash = recipe_content_hash(self.recipe)
+        
+        # Pydantic schema (optional - legacy/test recipes may omit fields)
+        self.schema: Optional[RecipeSchema] = None
+        self.schema_error: Optional[str] = None
+        try:
+            self.schema = validate_recipe_yaml(self.recipe)
+        except Exception as e:
+            self.schema_error = str(e)
+        
+        # Structural validation against component registry
+        self.validation_errors = validate_recipe_structure(self.recipe, component_names)
+        
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.execution_order: List[str] = []
+        self.dependencies: Dict[str, Set[str]] = {}
+        self.templates: Dict[str, Template] = {}
+        # execution_plan() results keyed by target node
+        self._plans: Dict[Optional[str], Tuple[List[str], Dict[str, Set[str]]]] = {}
+        self._plans_lock = threading.Lock()
+        
+        if self.validation_errors:
+            return
+        
+        workflow = self.recipe['workflow']
+        self.nodes = {node['id']: node for node in workflow['nodes']}
+        self.execution_order = build_execution_order(self.nodes, workflow['edges'])
+        self.dependencies = build_dependency_map(self.nodes, workflow['edges'])
+        
+        for node in workflow['nodes']:
+            self._precompile(node.get('config', {}))
+    
+    @property
+    def is_valid(self) -> bool:
+        """True if recipe passed structural validation"""
+        return not self.validation_errors
+    
+    @property
+    def output_node(self) -> Optional[str]:
+        """Node named by workflow.output.source ('node_id.output'), None if not a node"""
+        source = self.recipe.get('workflow', {}).get('output', {}).get('source', '')
+        node_id = source.split('.')[0]
+        return node_id if node_id in self.nodes else None
+    
+    def is_mandatory(self, node_id: str) -> bool:
+        """True if node runs on every execution (mandatory: true or a metering component)"""
+        node = self.nodes[node_id]
+        return bool(node.get('mandatory')) or node['component'] in MANDATORY_COMPONENTS
+    
+    def ancestors(self, node_id: str) -> Set[str]:
+        """All nodes node_id transitively depends on"""
+        seen: Set[str] = set()
+        stack = list(self.dependencies.get(node_id, ()))
+        while stack:
+            dep = stack.pop()
+            if dep not in seen:
+                seen.add(dep)
+                stack.extend(self.dependencies.get(dep, ()))
+        return seen
+    
+    def execution_plan(self, target: Optional[str] = None) -> Tuple[List[str], Dict[str, Set[str]]]:
+        """
+        Nodes needed to produce target, plus mandatory nodes
+        
+        Nodes nothing requested depends on are dropped. Mandatory nodes always
+        run; if one of their dependencies was dropped they instead wait for
+        every other planned node, so metering still happens last.
+        
+        Args:
+            target: Node whose output is requested (default: workflow output source;
+                    every node runs if that is not a node)
+        
+        Returns:
+            (execution order, dependency map) restricted to planned nodes
+        
+        Raises:
+            ValueError: If target is not a node of this recipe
+        """
+        if target is not None and target not in self.nodes:
+            raise ValueError(f"Unknown output node: {target}")
+        
+        with self._plans_lock:
+            if target in self._plans:
+                return self._plans[target]
+        
+        target_node = target or self.output_node
+        if target_node is None:
+            plan = (list(self.execution_order), self.dependencies)
+        else:
+            needed = {target_node} | self.ancestors(target_node)
+            mandatory = [node_id for node_id in self.nodes if self.is_mandatory(node_id) and node_id not in needed]
+            for node_id in mandatory:
+                needed.add(node_id)
+            
+            dependencies = {node_id: set(self.dependencies[node_id]) for node_id in needed}
+            for node_id in mandatory:
+                if not dependencies[node_id] <= needed:
+                    dependencies[node_id] = needed - set(mandatory)
+            
+            order = [node_id for node_id in self.execution_order if node_id in needed]
+            plan = (order, dependencies)
+        
+        with self._plans_lock:
+            self._plans[target] = plan
+        return plan
+    
+    def _precompile(self, config: Dict[str, Any]):
+        """Precompile every template string in a node config (recursively)"""
+        for key, value in config.items():
+            if isinstance(value, dict):
+                self._precompile(value)
+            elif isinstance(value, str) and (key == 'prompt_template' or ('{{' in value and '}}' in value)):
+                try:
+                    self.templates[value] = get_template(value)
+                except TemplateError:
+                    # Leave invalid templates to the runtime path for error reporting
+                    pass
+    
+    def get_template(self, source: str) -> Template:
+        """
+        Get precompiled template for source string
+        
+        Falls back to the shared template engine for sources outside the
+        recipe (not stored, so ad-hoc templates cannot grow the plan)
+        """
+        template = self.templates.get(source)
+        if template is None:
+            template = get_template(source)
+        return template
+
+
+class RecipePlanCache:
+    """
+    Bounded LRU of CompiledRecipe plans
+    Keyed by (recipe id, version, content hash, component registry)
+    """
+    
+    def __init__(self, max_size: int = 128):
+        """
+        Initialize plan cache
+        
+        Args:
+            max_size: Maximum number of compiled plans kept in memory
+        """
+        self.max_size = max_size
+        self._plans: "OrderedDict[Tuple, CompiledRecipe]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get_or_compile(self, recipe: Dict[str, Any], component_names: Iterable[str]) -> CompiledRecipe:
+        """
+        Return cached plan for recipe, compiling it on first use
+        
+        Args:
+            recipe: Recipe dictionary ({recipe: {...}} or {...} format)
+            component_names: Registered component class names
+        
+        Returns:
+            Shared CompiledRecipe instance
+        """
+        recipe = recipe.get('recipe', recipe)
+        component_names = frozenset(component_names)
+        key = (recipe.get('id'), recipe.get('version', '1.0.0'), recipe_content_hash(recipe), component_names)
+        
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return plan
+            self.misses += 1
+        
+        plan = CompiledRecipe(recipe, component_names)
+        
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_size:
+                self._plans.popitem(last=False)
+        
+        return plan
+    
+    def clear(self):
+        """Drop all compiled plans"""
+        with self._lock:
+            self._plans.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            'size': len(self._plans),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+# Process-wide plan cache shared by Agent and RecipeEvaluator
+recipe_plan_cache = RecipePlanCache()
@@ -4,12 +4,18 @@ Executes YAML-defined recipes using LangGraph with mandatory subscription tracki
 """
 import yaml
 import asyncio
+import copy
+import hashlib
+import json
+import os
 import sys
 import re
-from typing import Dict, Any, List, Optional, Set
+import time
+from typing import Dict, Any, List, Optional, Set, AsyncIterator
 from pathlib import Path
+from collections.abc import Mapping
 from datetime import datetime
-from jinja2 import Template, TemplateError
+from jinja2 import TemplateError
 import jinja2
 
 # Add backend to path for imports
@@ -18,11 +24,71 @@ if str(backend_path) not in sys.path:
     sys.path.insert(0, str(backend_path))
 
 # Import our components
+from components.base import emit_event, get_event_sink, set_event_sink, set_deadline, set_tenant
 from components.processors.web_crawler import WebCrawler
 from components.processors.llm_processor import LLMProcessor
 from components.processors.report_generator import ReportGenerator
 from components.subscription_tracker import SubscriptionTracker
+from components.utils.cache_manager import CacheManager, create_cache_manager
+from components.component_pool import ComponentPool, component_pool as default_component_pool
 from app.utils.secrets import SecretInjector
+from agents.blob_store import BlobStore, BlobRef, get_blob_store
+from agents.checkpoint_store import CheckpointStore, CheckpointError
+from agents.checkpoint_store import checkpoint_store as default_checkpoint_store
+from agents.template_engine import template_variables
+from agents.recipe_compiler import (
+    CompiledRecipe,
+    recipe_plan_cache,
+    validate_recipe_structure,
+    build_execution_order,
+    build_dependency_map,
+)
+
+
+# Process-wide cache for memoized node results: Redis (REDIS_URL), else a
+# bounded in-memory LRU (entries can be whole crawl results)
+node_result_cache = create_cache_manager('memoized node results', max_entries=256)
+
+
+class _LazyNodeOutput(Mapping):
+    """
+    Template context entry ({'output': ...}) that loads a blob on first use
+    The value is kept after the first load; nodes whose templates never
+    reference the output never load it
+    """
+    
+    _UNLOADED = object()
+    
+    def __init__(self, evaluator: 'RecipeEvaluator', ref: BlobRef):
+        self._evaluator = evaluator
+        self._ref = ref
+        self._value = self._UNLOADED
+    
+    async def preload(self):
+        """Load the blob in a worker thread so rendering never blocks the loop"""
+        if self._value is self._UNLOADED:
+            self._value = await self._evaluator._load_output_async(self._ref)
+    
+    def __getitem__(self, key):
+        if key != 'output':
+            raise KeyError(key)
+        if self._value is self._UNLOADED:
+            self._value = self._evaluator._load_output(self._ref)
+        return self._value
+    
+    def __iter__(self):
+        return iter(('output',))
+    
+    def __len__(self):
+        return 1
+
+
+class RecipeTimeoutError(TimeoutError):
+    """Raised when a node or the whole recipe exceeds its time budget"""
+    
+    def __init__(self, message: str, node_id: Optional[str] = None):
+        super().__init__(message)
+        self.node_id = node_id
 
 
 class RecipeEvaluator:
@@ -39,13 +105,36 @@ class RecipeEvaluator:
         'SubscriptionTracker': SubscriptionTracker
     }
     
+    # Default number of workflow nodes allowed to run concurrently
+    DEFAULT_MAX_PARALLELISM = 4
+    
+    # Default number of batch items (execute_many) running at once
+    DEFAULT_BATCH_CONCURRENCY = 4
+    
+    # Default number of concurrent component calls per map node
+    DEFAULT_MAP_CONCURRENCY = 4
+    
+    # Node outputs larger than this (serialized JSON bytes) go to the blob store
+    BLOB_THRESHOLD_BYTES = int(os.getenv('BLOB_THRESHOLD_BYTES', 256 * 1024))
+    
+    # CacheManager namespace for memoized node results (node.cache_ttl)
+    NODE_CACHE_NAMESPACE = 'recipe_node'
+    
     def __init__(
         self, 
         recipe_path: Optional[str] = None,
         recipe_definition: Optional[Dict[str, Any]] = None,
         mock_mode: bool = False, 
         tracking_config: Optional[Dict[str, Any]] = None,
-        db_session: Optional[Any] = None
+        db_session: Optional[Any] = None,
+        compiled_recipe: Optional[CompiledRecipe] = None,
+        cache_manager: Optional[CacheManager] = None,
+        checkpoint_id: Optional[str] = None,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        timeout_ms: Optional[int] = None,
+        component_pool: Optional[ComponentPool] = None,
+        blob_store: Optional[BlobStore] = None,
+        blob_threshold_bytes: Optional[int] = None
     ):
         """
         Initialize recipe evaluator
@@ -56,6 +145,14 @@ class RecipeEvaluator:
             mock_mode: If True, use mock data instead of real API calls
             tracking_config: Configuration for subscription tracking (agency_id, agent_instance_id, recipe_id)
             db_session: Optional AsyncSession for database persistence
+            compiled_recipe: Pre-built execution plan (shared via recipe_plan_cache)
+            cache_manager: Cache for memoized node results (defaults to process-wide cache)
+            checkpoint_id: If set, persist state after each successful node under this ID
+            checkpoint_store: Store for checkpoints (defaults to process-wide store)
+            timeout_ms: Recipe deadline in milliseconds (overrides workflow.timeout_ms)
+            component_pool: Pool of long-lived component instances (defaults to process-wide pool)
+            blob_store: Store for large node outputs (defaults to process-wide store)
+            blob_threshold_bytes: Outputs above this size are stored out of line (0 disables)
         """
         if recipe_path:
             # Legacy mode - load from file
@@ -66,13 +163,34 @@ class RecipeEvaluator:
             self.recipe_path = None
             # Handle both {recipe: {...}} and {...} formats
             self.recipe = recipe_definition.get('recipe', recipe_definition)
+        elif compiled_recipe:
+            self.recipe_path = None
+            self.recipe = compiled_recipe.recipe
         else:
             raise ValueError("Either recipe_path or recipe_definition must be provided")
         
         self.mock_mode = mock_mode
         self.tracking_config = tracking_config or {}
         self.db_session = db_session
+        self._compiled_recipe = compiled_recipe
+        self.cache_manager = cache_manager or node_result_cache
+        self.checkpoint_id = checkpoint_id
+        self.checkpoint_store = checkpoint_store or default_checkpoint_store
+        self.timeout_ms = timeout_ms
+        self._deadline: Optional[float] = None
+        self._restored_nodes: Set[str] = set()
+        self._checkpoint: Optional[Dict[str, Any]] = None
+        self.component_pool = component_pool or default_component_pool
+        self._blob_store = blob_store
+        self.blob_threshold_bytes = (
+            self.BLOB_THRESHOLD_BYTES if blob_threshold_bytes is None else blob_threshold_bytes
+        )
+        # Serializes subscription tracking when batch items share db_session
+        self._tracking_lock = asyncio.Lock()
         self.execution_state = {}
+        # Live Jinja2 context, updated as nodes complete (see _template_context)
+        self._context: Dict[str, Any] = {}
+        self._context_state: Optional[Dict[str, Any]] = None
         self.metrics = {
             'start_time': None,
             'end_time': None,
@@ -80,7 +198,15 @@ class RecipeEvaluator:
             'total_cost': 0.0,
             'tokens_used': 0,
             'nodes_executed': 0,
-            'nodes_failed': 0
+            'nodes_failed': 0,
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'nodes_resumed': 0,
+            'nodes_timed_out': 0,
+            'blobs_stored': 0,
+            'blob_bytes': 0,
+            'nodes_skipped': 0,
+            'map_items': 0
         }
         
         # Initialize subscription tracker (mandatory for billing)
@@ -117,47 +243,50 @@ class RecipeEvaluator:
         
         return recipe['recipe']
     
+    @property
+    def compiled_recipe(self) -> CompiledRecipe:
+        """Execution plan for this recipe (compiled once, shared via LRU)"""
+        if self._compiled_recipe is None:
+            self._compiled_recipe = recipe_plan_cache.get_or_compile(self.recipe, self.COMPONENTS.keys())
+        return self._compiled_recipe
+    
     def validate_recipe(self) -> bool:
         """Validate recipe structure"""
-        required_keys = ['id', 'name', 'workflow']
-        for key in required_keys:
-            if key not in self.recipe:
-                print(f"Missing required key: {key}")
-                return False
-        
-        workflow = self.recipe['workflow']
-        if 'nodes' not in workflow or 'edges' not in workflow:
-            print("Invalid workflow structure")
-            return False
-        
-        # Validate nodes
-        for node in workflow['nodes']:
-            if 'id' not in node or 'component' not in node:
-                print(f"Invalid node structure: {node}")
-                return False
-            
-            component_name = node['component']
-            if component_name not in self.COMPONENTS:
-                print(f"Unknown component: {component_name}")
-                return False
-        
-        return True
+        errors = validate_recipe_structure(self.recipe, self.COMPONENTS.keys())
+        for error in errors:
+            print(error)
+        return not errors
     
-    async def execute(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute(self, inputs: Dict[str, Any], output_node: Optional[str] = None) -> Dict[str, Any]:
         """
         Execute recipe with given inputs (DAG workflow execution)
         
+        Only nodes the requested output depends on (plus mandatory nodes)
+        are executed; the rest are marked 'skipped'.
+        
         Args:
             inputs: Input parameters defined in recipe
-            
+            output_node: Return this node's output instead of workflow.output.source
+                         (executes only its ancestors and mandatory nodes)
+        
         Returns:
             Execution results with metrics
+        
+        Raises:
+            ValueError: If recipe is invalid or output_node is unknown
         """
-        if not self.validate_recipe():
+        plan = self.compiled_recipe
+        if not plan.is_valid:
+            for error in plan.validation_errors:
+                print(error)
             raise ValueError("Invalid recipe")
         
+        execution_order, dependencies = plan.execution_plan(output_node)
+        
         self.metrics['start_time'] = datetime.utcnow()
         self.execution_state = {'inputs': inputs}
+        self._deadline = self._compute_deadline()
+        self._restore_checkpoint_state()
         
         print(f"\n🚀 Executing Recipe: {self.recipe['name']}")
         print(f"Recipe ID: {self.recipe['id']}")
@@ -165,35 +294,37 @@ class RecipeEvaluator:
         print(f"Mock Mode: {self.mock_mode}\n")
         
         try:
-            # Execute workflow as DAG
+            # Execute workflow as DAG (node map, order and dependencies precompiled)
             workflow = self.recipe['workflow']
-            nodes = {node['id']: node for node in workflow['nodes']}
+            nodes = plan.nodes
+            print(f"Execution order: {' → '.join(execution_order)}")
             
-            # Build execution order from edges
-            execution_order = self._build_execution_order(nodes, workflow['edges'])
-            print(f"Execution order: {' → '.join(execution_order)}\n")
+            # Dead-node elimination - nothing requested consumes these
+            planned = set(execution_order)
+            for node_id in plan.execution_order:
+                if node_id not in planned:
+                    self.execution_state[f"{node_id}.status"] = 'skipped'
+                    self.metrics['nodes_skipped'] += 1
+            if self.metrics['nodes_skipped']:
+                print(f"Skipped (unused): {', '.join(n for n in plan.execution_order if n not in planned)}")
             
-            # Execute nodes in order
-            for node_id in execution_order:
-                try:
-                    await self._execute_node(nodes[node_id])
-                except Exception as e:
-                    # Check if node allows failure
-                    allow_failure = nodes[node_id].get('allow_failure', False)
-                    if allow_failure:
-                        print(f"⚠️  Node {node_id} failed (allowed): {e}")
-                        self.execution_state[f"{node_id}.error"] = str(e)
-                        self.execution_state[f"{node_id}.status"] = 'failed'
-                        self.metrics['nodes_failed'] += 1
-                    else:
-                        print(f"❌ Node {node_id} failed (critical): {e}")
-                        raise
+            # Run independent branches concurrently (ready-queue scheduler)
+            max_parallelism = self._get_max_parallelism()
+            print(f"Max parallelism: {max_parallelism}\n")
+            emit_event('execution_started', recipe_id=self.recipe['id'], execution_order=execution_order)
+            
+            await self._run_dag(nodes, execution_order, dependencies, max_parallelism)
+            
+            # Completed run - checkpoint no longer needed
+            if self.checkpoint_id:
+                await self.checkpoint_store.delete(self.checkpoint_id)
             
             execution_status = 'success'
             self.metrics['execution_status'] = execution_status
-            
+        
         except Exception as e:
-            execution_status = 'failed'
+            # SubscriptionTracker bills timeouts as partial executions
+            execution_status = 'timeout' if isinstance(e, RecipeTimeoutError) else 'failed'
             self.metrics['execution_status'] = execution_status
             print(f"\n❌ Recipe execution failed: {e}")
             
@@ -206,13 +337,14 @@ class RecipeEvaluator:
             # Track failure
             if self.subscription_tracker:
                 try:
-                    await self.subscription_tracker.execute({
-                        'execution_time_ms': self.metrics['execution_time_ms'],
-                        'tokens_used': self.metrics['tokens_used'],
-                        'cost_incurred': self.metrics['total_cost'],
-                        'status': execution_status,
-                        'metadata': {'error': str(e)}
-                    })
+                    async with self._tracking_lock:
+                        await self.subscription_tracker.execute({
+                            'execution_time_ms': self.metrics['execution_time_ms'],
+                            'tokens_used': self.metrics['tokens_used'],
+                            'cost_incurred': self.metrics['total_cost'],
+                            'status': execution_status,
+                            'metadata': {'error': str(e)}
+                        })
                 except:
                     pass
             
@@ -229,17 +361,18 @@ class RecipeEvaluator:
         tracking_result = None
         if self.subscription_tracker:
             try:
-                tracking_result = await self.subscription_tracker.execute({
-                    'execution_time_ms': self.metrics['execution_time_ms'],
-                    'tokens_used': self.metrics['tokens_used'],
-                    'cost_incurred': self.metrics['total_cost'],
-                    'status': execution_status,
-                    'metadata': {
-                        'nodes_executed': self.metrics['nodes_executed'],
-                        'nodes_failed': self.metrics['nodes_failed'],
-                        'recipe_version': self.recipe.get('version', '1.0.0')
-                    }
-                })
+                async with self._tracking_lock:
+                    tracking_result = await self.subscription_tracker.execute({
+                        'execution_time_ms': self.metrics['execution_time_ms'],
+                        'tokens_used': self.metrics['tokens_used'],
+                        'cost_incurred': self.metrics['total_cost'],
+                        'status': execution_status,
+                        'metadata': {
+                            'nodes_executed': self.metrics['nodes_executed'],
+                            'nodes_failed': self.metrics['nodes_failed'],
+                            'recipe_version': self.recipe.get('version', '1.0.0')
+                        }
+                    })
                 print(f"\n✅ Subscription tracked: {tracking_result.get('billable_units', 0)} units")
             except Exception as e:
                 print(f"⚠️  Subscription tracking failed: {e}")
@@ -247,8 +380,8 @@ class RecipeEvaluator:
         
         # Get output from workflow
         output_config = workflow.get('output', {})
-        output_source = output_config.get('source', 'final_node.output')
-        final_output = self._resolve_output(output_source)
+        output_source = f"{output_node}.output" if output_node else output_config.get('source', 'final_node.output')
+        final_output = await self._resolve_output(output_source)
         
         print(f"\n✅ Recipe execution complete in {self.metrics['execution_time_ms']}ms")
         
@@ -261,35 +394,347 @@ class RecipeEvaluator:
             'execution_state': self.execution_state
         }
     
+    async def execute_stream(
+        self,
+        inputs: Dict[str, Any],
+        output_node: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute recipe, yielding progress events as they happen
+        
+        Events are dicts with an 'event' key:
+        - execution_started: recipe_id, execution_order
+        - node_started: node_id, component
+        - node_finished: node_id, status, elapsed_ms (+ cached or error)
+        - page_fetched: node_id, url, status_code, depth, elapsed_ms, pages_crawled
+        - llm_token: node_id, model, delta
+        - execution_finished: result (same dict execute() returns)
+        - execution_failed: error
+        
+        Closing the generator early cancels the execution.
+        
+        Args:
+            inputs: Input parameters defined in recipe
+            output_node: Requested node output (see execute())
+        
+        Yields:
+            Event dictionaries; the last one is execution_finished or execution_failed
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        async def run():
+            # Runs in its own task, so the sink is only visible to this execution
+            set_event_sink(queue.put_nowait)
+            try:
+                result = await self.execute(inputs, output_node)
+                queue.put_nowait({'event': 'execution_finished', 'result': result})
+            except Exception as e:
+                queue.put_nowait({'event': 'execution_failed', 'error': str(e)})
+            finally:
+                queue.put_nowait(None)
+        
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+    
+    async def execute_many(
+        self,
+        inputs_list: List[Dict[str, Any]],
+        concurrency: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute recipe for many inputs, yielding results as items finish
+        
+        Identical inputs run once. All items share this evaluator's compiled
+        plan, component pool, node cache and tracking configuration;
+        each item gets its own execution state and metrics.
+        
+        Args:
+            inputs_list: Input parameter sets (one per item)
+            concurrency: Maximum items running at once (default: DEFAULT_BATCH_CONCURRENCY)
+        
+        Yields:
+            Item dicts in completion order: indices (positions in inputs_list),
+            inputs, success, result (execute() return value) and error
+        """
+        concurrency = concurrency or self.DEFAULT_BATCH_CONCURRENCY
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        
+        # Dedupe identical inputs, remembering every position they appeared at
+        items: Dict[str, Dict[str, Any]] = {}
+        for index, inputs in enumerate(inputs_list):
+            key = json.dumps(inputs, sort_keys=True, default=str)
+            items.setdefault(key, {'inputs': inputs, 'indices': []})['indices'].append(index)
+        
+        print(f"\n📚 Batch: {len(inputs_list)} items ({len(items)} unique), concurrency {concurrency}")
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run(item: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                evaluator = self._spawn()
+                try:
+                    result = await evaluator.execute(item['inputs'])
+                    return {**item, 'success': True, 'result': result, 'error': None}
+                except Exception as e:
+                    return {**item, 'success': False, 'result': None, 'error': str(e)}
+        
+        tasks = [asyncio.create_task(run(item)) for item in items.values()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early - cancel items still queued or running
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def _spawn(self) -> 'RecipeEvaluator':
+        """Create evaluator for one batch item sharing plan, components and caches"""
+        evaluator = RecipeEvaluator(
+            compiled_recipe=self.compiled_recipe,
+            mock_mode=self.mock_mode,
+            tracking_config=self.tracking_config,
+            db_session=self.db_session,
+            cache_manager=self.cache_manager,
+            checkpoint_store=self.checkpoint_store,
+            timeout_ms=self.timeout_ms,
+            component_pool=self.component_pool,
+            blob_store=self._blob_store,
+            blob_threshold_bytes=self.blob_threshold_bytes
+        )
+        evaluator._tracking_lock = self._tracking_lock
+        return evaluator
+    
+    def _compute_deadline(self) -> Optional[float]:
+        """Absolute (time.monotonic) recipe deadline, None if unbounded"""
+        timeout_ms = self.timeout_ms or self.recipe['workflow'].get('timeout_ms')
+        if not timeout_ms:
+            return None
+        return time.monotonic() + timeout_ms / 1000
+    
+    def _node_deadline(self, node: Dict[str, Any]) -> Optional[float]:
+        """Earlier of the recipe deadline and the node's own timeout_ms"""
+        deadlines = [self._deadline] if self._deadline is not None else []
+        if node.get('timeout_ms'):
+            deadlines.append(time.monotonic() + node['timeout_ms'] / 1000)
+        return min(deadlines) if deadlines else None
+    
     def _build_execution_order(self, nodes: Dict, edges: List[Dict]) -> List[str]:
         """
         Build execution order from DAG edges
         Simple topological sort
         """
-        # Build adjacency list
-        dependencies = {node_id: [] for node_id in nodes.keys()}
-        for edge in edges:
-            to_node = edge['to']
-            from_node = edge['from']
-            if to_node not in dependencies[from_node]:
-                dependencies[to_node].append(from_node)
+        return build_execution_order(nodes, edges)
+    
+    def _build_dependency_map(self, nodes: Dict, edges: List[Dict]) -> Dict[str, Set[str]]:
+        """Build predecessor sets from both edges and depends_on"""
+        return build_dependency_map(nodes, edges)
+    
+    def _get_max_parallelism(self) -> int:
+        """Get per-recipe node concurrency limit (workflow.max_parallelism)"""
+        max_parallelism = self.recipe['workflow'].get('max_parallelism') or self.DEFAULT_MAX_PARALLELISM
+        return max(1, int(max_parallelism))
+    
+    async def _run_dag(
+        self,
+        nodes: Dict[str, Dict[str, Any]],
+        execution_order: List[str],
+        dependencies: Dict[str, Set[str]],
+        max_parallelism: int
+    ):
+        """
+        Ready-queue DAG scheduler
+        
+        Launches every node whose predecessors have finished as its own asyncio
+        task, with at most max_parallelism nodes in flight. Ready nodes are
+        launched in topological order so single-branch recipes behave exactly
+        like sequential execution. A critical node failure cancels in-flight
+        siblings and propagates.
+        
+        Args:
+            nodes: Node configurations keyed by node ID
+            execution_order: Topological order (used for launch priority)
+            dependencies: Predecessor sets from _build_dependency_map
+            max_parallelism: Maximum number of nodes running at once
+        """
+        # Nodes restored from a checkpoint count as finished
+        finished: Set[str] = set(self._restored_nodes)
+        pending = [node_id for node_id in execution_order if node_id not in finished]
+        running: Dict[asyncio.Task, str] = {}
         
-        # Topological sort
-        visited = set()
-        order = []
+        try:
+            while pending or running:
+                # Launch every ready node while we have capacity
+                for node_id in list(pending):
+                    if len(running) >= max_parallelism:
+                        break
+                    if dependencies[node_id] <= finished:
+                        pending.remove(node_id)
+                        task = asyncio.create_task(self._run_node(nodes[node_id]))
+                        running[task] = node_id
+                
+                if not running:
+                    raise ValueError(f"Workflow has unresolvable dependencies (cycle?): {pending}")
+                
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node_id = running.pop(task)
+                    task.result()  # Re-raise critical node failures
+                    finished.add(node_id)
+        finally:
+            # Critical failure (or cancellation) - stop in-flight siblings
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running.keys(), return_exceptions=True)
+    
+    async def _run_node(self, node: Dict[str, Any]):
+        """
+        Execute a node applying allow_failure semantics
         
-        def visit(node_id):
-            if node_id in visited:
-                return
-            visited.add(node_id)
-            for dep in dependencies.get(node_id, []):
-                visit(dep)
-            order.append(node_id)
+        Args:
+            node: Node configuration from workflow
+        """
+        node_id = node['id']
+        
+        # Tag events from this node's task (and its component) with node_id
+        sink = get_event_sink()
+        if sink is not None:
+            set_event_sink(lambda event: sink({'node_id': node_id, **event}))
+        
+        # Components isolating per-tenant state (HTTP cache) read the agency
+        set_tenant(self.tracking_config.get('agency_id'))
+        
+        deadline = self._node_deadline(node)
         
-        for node_id in nodes.keys():
-            visit(node_id)
+        emit_event('node_started', component=node['component'])
+        start = time.perf_counter()
+        try:
+            if deadline is None:
+                await self._execute_node(node)
+            else:
+                # Components read the remaining budget via remaining_time()
+                set_deadline(deadline)
+                try:
+                    await asyncio.wait_for(
+                        self._execute_node(node),
+                        timeout=max(0.0, deadline - time.monotonic())
+                    )
+                except asyncio.TimeoutError:
+                    raise RecipeTimeoutError(f"Node {node_id} timed out", node_id=node_id)
+        except Exception as e:
+            status = 'timeout' if isinstance(e, RecipeTimeoutError) else 'failed'
+            emit_event(
+                'node_finished',
+                status=status,
+                error=str(e),
+                elapsed_ms=int((time.perf_counter() - start) * 1000)
+            )
+            if status == 'timeout':
+                self.execution_state[f"{node_id}.status"] = 'timeout'
+                self.execution_state[f"{node_id}.error"] = str(e)
+                self.metrics['nodes_timed_out'] += 1
+            
+            # Check if node allows failure (never once the recipe deadline has passed)
+            recipe_expired = self._deadline is not None and time.monotonic() >= self._deadline
+            allow_failure = node.get('allow_failure', False) and not recipe_expired
+            if allow_failure:
+                print(f"⚠️  Node {node_id} {status} (allowed): {e}")
+                self.execution_state[f"{node_id}.error"] = str(e)
+                self.execution_state[f"{node_id}.status"] = status
+                if status == 'failed':
+                    self.metrics['nodes_failed'] += 1
+            else:
+                print(f"❌ Node {node_id} failed (critical): {e}")
+                raise
+        else:
+            emit_event(
+                'node_finished',
+                status='success',
+                cached=self.execution_state.get(f"{node_id}.cached", False),
+                elapsed_ms=int((time.perf_counter() - start) * 1000)
+            )
+            if self.checkpoint_id:
+                await self._save_checkpoint()
+    
+    async def _save_checkpoint(self):
+        """Persist inputs and successful node state under checkpoint_id"""
+        completed = [
+            key[:-len('.status')] for key, value in self.execution_state.items()
+            if key.endswith('.status') and value == 'success'
+        ]
+        state = {}
+        for node_id in completed:
+            for suffix in ('.output', '.status', '.cached'):
+                if f"{node_id}{suffix}" in self.execution_state:
+                    state[f"{node_id}{suffix}"] = self._serialize_value(self.execution_state[f"{node_id}{suffix}"])
         
-        return order
+        await self.checkpoint_store.save(self.checkpoint_id, {
+            'recipe_id': self.recipe.get('id'),
+            'recipe_hash': self.compiled_recipe.content_hash,
+            'inputs': self.execution_state.get('inputs', {}),
+            'completed_nodes': completed,
+            'execution_state': state
+        })
+    
+    async def resume(
+        self,
+        checkpoint_id: Optional[str] = None,
+        output_node: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Resume a failed execution from its checkpoint
+        
+        Nodes that completed before the failure are restored from the
+        checkpoint and skipped; only the remaining nodes are executed.
+        
+        Args:
+            checkpoint_id: Checkpoint to resume (defaults to self.checkpoint_id)
+            output_node: Return this node's output (see execute())
+        
+        Returns:
+            Execution results with metrics (metrics.nodes_resumed > 0)
+        
+        Raises:
+            CheckpointError: If checkpoint is missing or was made by another recipe version
+        """
+        checkpoint_id = checkpoint_id or self.checkpoint_id
+        if not checkpoint_id:
+            raise CheckpointError("No checkpoint_id to resume from")
+        
+        checkpoint = await self.checkpoint_store.load(checkpoint_id)
+        if not checkpoint:
+            raise CheckpointError(f"Checkpoint not found: {checkpoint_id}")
+        if checkpoint.get('recipe_hash') != self.compiled_recipe.content_hash:
+            raise CheckpointError(f"Checkpoint {checkpoint_id} was created by a different recipe version")
+        
+        self.checkpoint_id = checkpoint_id
+        self._checkpoint = checkpoint
+        print(f"\n♻️  Resuming from checkpoint {checkpoint_id}: {', '.join(checkpoint['completed_nodes']) or 'no completed nodes'}")
+        
+        return await self.execute(checkpoint['inputs'], output_node)
+    
+    def _restore_checkpoint_state(self):
+        """Restore execution_state from a checkpoint loaded by resume()"""
+        checkpoint = self._checkpoint
+        if not checkpoint:
+            return
+        self._checkpoint = None
+        
+        for key, value in checkpoint.get('execution_state', {}).items():
+            self.execution_state[key] = BlobRef.from_dict(value) if BlobRef.is_ref_dict(value) else value
+        self._restored_nodes = set(checkpoint.get('completed_nodes', []))
+        self.metrics['nodes_resumed'] = len(self._restored_nodes)
     
     async def _execute_node(self, node: Dict[str, Any]):
         """
@@ -302,11 +747,48 @@ class RecipeEvaluator:
         component_name = node['component']
         config = node.get('config', {})
         secrets = node.get('secrets', {})
+        map_config = node.get('map')
         
         print(f"📦 Executing Node: {node_id} ({component_name})")
         
         try:
-            # Step 1: Inject secrets from Azure Key Vault
+            # Step 1: Interpolate config parameters with Jinja2
+            # (map nodes interpolate per chunk, once the item variable is bound)
+            await self._preload_templates(config)
+            resolved_config = copy.deepcopy(config) if map_config else self._interpolate_config(config)
+            
+            # Step 2: Get inputs from depends_on nodes
+            depends_on = node.get('depends_on', [])
+            node_inputs = {}
+            for dep in depends_on:
+                if f"{dep}.output" in self.execution_state:
+                    node_inputs[dep] = self.execution_state[f"{dep}.output"]
+            
+            # Step 3: Serve opt-in memoized result (cache_ttl) - key excludes secrets.
+            # Blob inputs are keyed by their content hash, without loading them.
+            cache_ttl = node.get('cache_ttl')
+            cache_key = None
+            if cache_ttl:
+                cache_key = self._node_cache_key(component_name, resolved_config, node_inputs)
+                cached = await self.cache_manager.get(self.NODE_CACHE_NAMESPACE, cache_key) if cache_key else None
+                if BlobRef.is_ref_dict(cached):
+                    cached = BlobRef.from_dict(cached)
+                    if not await asyncio.to_thread(self.blob_store.exists, cached.key):
+                        cached = None  # Blob expired - recompute
+                if cached is not None:
+                    self.metrics['cache_hits'] += 1
+                    self._set_node_output(node_id, copy.deepcopy(cached))
+                    self.execution_state[f"{node_id}.status"] = 'success'
+                    self.execution_state[f"{node_id}.cached"] = True
+                    self.metrics['nodes_executed'] += 1
+                    print(f"  ♻️  Node {node_id} served from cache\n")
+                    return
+                self.metrics['cache_misses'] += 1
+            
+            # Materialize blob outputs of upstream nodes for the component
+            node_inputs = {dep: await self._load_output_async(value) for dep, value in node_inputs.items()}
+            
+            # Step 4: Inject secrets from Azure Key Vault
             if secrets and self.tracking_config:
                 agency_id = self.tracking_config.get('agency_id')
                 team_id = self.tracking_config.get('team_id')
@@ -315,57 +797,290 @@ class RecipeEvaluator:
                     secrets = secret_injector.inject_secrets(secrets)
                     print(f"  🔐 Secrets injected: {list(secrets.keys())}")
             
-            # Step 2: Interpolate config parameters with Jinja2
-            resolved_config = self._interpolate_config(config)
-            
-            # Merge secrets into config
-            resolved_config.update(secrets)
-            
-            # Step 3: Instantiate component
-            component_class = self.COMPONENTS[component_name]
-            component = component_class(config=resolved_config, mock_mode=self.mock_mode)
-            
-            # Step 4: Get inputs from depends_on nodes
-            depends_on = node.get('depends_on', [])
-            node_inputs = {}
-            for dep in depends_on:
-                if f"{dep}.output" in self.execution_state:
-                    node_inputs[dep] = self.execution_state[f"{dep}.output"]
-            
-            # Step 5: Execute component based on type
-            result = await self._execute_component(
-                component, 
-                component_name, 
-                resolved_config, 
-                node_inputs
-            )
+            if map_config:
+                # Steps 5-6: Fan out over the upstream list, gather results in order
+                result = await self._execute_map(node_id, component_name, config, map_config, secrets, node_inputs)
+            else:
+                # Step 5: Get pooled component instance (instances holding secrets
+                # are keyed by agency and secret digest, never shared across tenants)
+                component = self.component_pool.acquire(
+                    self.COMPONENTS[component_name],
+                    resolved_config,
+                    secrets=secrets,
+                    mock_mode=self.mock_mode,
+                    scope=self.tracking_config.get('agency_id')
+                )
+                
+                # Merge secrets into config
+                resolved_config.update(secrets)
+                
+                # Step 6: Execute component based on type
+                try:
+                    result = await self._execute_component(
+                        component, 
+                        component_name, 
+                        resolved_config, 
+                        node_inputs
+                    )
+                finally:
+                    await self.component_pool.release(component)
             
-            # Step 6: Store result in execution state
-            self.execution_state[f"{node_id}.output"] = result
+            # Step 7: Store result in execution state (large outputs by reference)
+            stored = await self._store_output(result)
+            self._set_node_output(node_id, stored)
             self.execution_state[f"{node_id}.status"] = 'success'
             self.metrics['nodes_executed'] += 1
             
-            # Track LLM costs
-            if isinstance(result, dict):
-                if 'cost' in result:
-                    self.metrics['total_cost'] += result.get('cost', 0)
-                if 'usage' in result:
-                    self.metrics['tokens_used'] += result.get('usage', {}).get('total_tokens', 0)
+            if cache_key:
+                await self.cache_manager.set(
+                    self.NODE_CACHE_NAMESPACE,
+                    cache_key,
+                    copy.deepcopy(self._serialize_value(stored)),
+                    ttl=cache_ttl
+                )
             
-            print(f"  ✅ Node {node_id} completed\n")
+            # Track LLM costs (per element for map nodes)
+            for item_result in (result if map_config else [result]):
+                if isinstance(item_result, dict):
+                    if 'cost' in item_result:
+                        self.metrics['total_cost'] += item_result.get('cost', 0)
+                    if 'usage' in item_result:
+                        self.metrics['tokens_used'] += item_result.get('usage', {}).get('total_tokens', 0)
             
+            print(f"  ✅ Node {node_id} completed\n")
+        
         except Exception as e:
             print(f"  ❌ Node {node_id} failed: {str(e)}\n")
             self.execution_state[f"{node_id}.status"] = 'failed'
             self.execution_state[f"{node_id}.error"] = str(e)
             raise
     
+    async def _execute_map(
+        self,
+        node_id: str,
+        component_name: str,
+        config: Dict[str, Any],
+        map_config: Dict[str, Any],
+        secrets: Dict[str, Any],
+        node_inputs: Dict[str, Any]
+    ) -> List[Any]:
+        """
+        Execute a map node: one component call per chunk of an upstream list
+        
+        The current element (or list of elements when chunk_size > 1) is bound
+        as-is to item_var in config templates, in the prompt and in the
+        component's node_inputs. One pooled instance serves every chunk: only
+        the component's RUNTIME_CONFIG_KEYS (prompt_template, ...) are
+        interpolated per chunk; other config keys are resolved once per node,
+        without the item variable.
+        
+        Args:
+            node_id: Map node ID
+            component_name: Component class name
+            config: Raw (uninterpolated) node config
+            map_config: Node 'map' section (over, item_var, chunk_size, concurrency)
+            secrets: Injected secret values
+            node_inputs: Materialized outputs of dependent nodes
+        
+        Returns:
+            Component results, one per chunk, in input order
+        """
+        items = await self._resolve_map_items(map_config['over'])
+        item_var = map_config.get('item_var') or 'item'
+        chunk_size = map_config.get('chunk_size') or 1
+        concurrency = map_config.get('concurrency') or self.DEFAULT_MAP_CONCURRENCY
+        
+        if chunk_size == 1:
+            chunks = list(items)
+        else:
+            chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        base_context = self._template_context()
+        component_class = self.COMPONENTS[component_name]
+        runtime_keys = component_class.RUNTIME_CONFIG_KEYS
+        runtime_config = {key: value for key, value in config.items() if key in runtime_keys}
+        instance_config = self._interpolate_config(
+            {key: value for key, value in config.items() if key not in runtime_keys},
+            base_context
+        )
+        component = self.component_pool.acquire(
+            component_class,
+            instance_config,
+            secrets=secrets,
+            mock_mode=self.mock_mode,
+            scope=self.tracking_config.get('agency_id')
+        )
+        
+        async def run_chunk(chunk: Any) -> Any:
+            async with semaphore:
+                variables = {item_var: chunk}
+                resolved_config = {
+                    **instance_config,
+                    **self._interpolate_config(runtime_config, {**base_context, **variables}),
+                    **secrets
+                }
+                return await self._execute_component(
+                    component,
+                    component_name,
+                    resolved_config,
+                    {**node_inputs, **variables},
+                    variables
+                )
+        
+        tasks = [asyncio.ensure_future(run_chunk(chunk)) for chunk in chunks]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            # One chunk failed (or the node was cancelled) - stop the rest
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            await self.component_pool.release(component)
+        
+        self.metrics['map_items'] += len(items)
+        print(f"  🔀 Node {node_id} mapped {len(items)} items in {len(chunks)} calls (concurrency {concurrency})")
+        return list(results)
+    
+    async def _resolve_map_items(self, source: str) -> List[Any]:
+        """
+        Resolve a map source path (e.g. 'fetch_pages.output.pages') to a list
+        
+        Raises:
+            ValueError: If the path does not exist or is not a list
+        """
+        node_id, _, path = source.partition('.output')
+        key = f"{node_id}.output"
+        if key not in self.execution_state:
+            raise ValueError(f"Map source node has no output: {node_id}")
+        
+        value = await self._load_output_async(self.execution_state[key])
+        for part in filter(None, path.split('.')):
+            if isinstance(value, Mapping) and part in value:
+                value = value[part]
+            elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+                value = value[int(part)]
+            else:
+                raise ValueError(f"Map source not found: {source}")
+        
+        if not isinstance(value, list):
+            raise ValueError(f"Map source is not a list: {source}")
+        return value
+    
+    def _node_cache_key(
+        self,
+        component_name: str,
+        resolved_config: Dict[str, Any],
+        node_inputs: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Build memoization key for a node execution
+        
+        Covers component name, resolved config (before secrets are merged),
+        upstream node outputs and recipe inputs (WebCrawler and prompts read
+        inputs directly). Scoped per agency so results never cross tenants.
+        
+        Returns:
+            Cache key, or None if the inputs cannot be serialized
+        """
+        try:
+            inputs_hash = hashlib.sha256(
+                json.dumps(
+                    {dep: self._serialize_value(value) for dep, value in node_inputs.items()},
+                    sort_keys=True,
+                    default=str
+                ).encode()
+            ).hexdigest()
+            return self.cache_manager.create_cache_key_from_dict({
+                'component': component_name,
+                'config': resolved_config,
+                'node_inputs': inputs_hash,
+                'inputs': self.execution_state.get('inputs', {}),
+                'agency_id': self.tracking_config.get('agency_id'),
+                'mock_mode': self.mock_mode
+            })
+        except (TypeError, ValueError) as e:
+            print(f"  ⚠️  Node result not cacheable: {e}")
+            return None
+    
+    @property
+    def blob_store(self) -> BlobStore:
+        """Blob store for large outputs (process-wide store unless one was passed)"""
+        if self._blob_store is None:
+            self._blob_store = get_blob_store()
+        return self._blob_store
+    
+    async def _store_output(self, result: Any) -> Any:
+        """
+        Move output to the blob store if it exceeds blob_threshold_bytes
+        
+        Serialization, hashing and the write run in a worker thread, so
+        multi-MB outputs do not stall other executions and SSE streams.
+        
+        Returns:
+            BlobRef for large outputs, otherwise result unchanged
+        """
+        if not self.blob_threshold_bytes or not isinstance(result, (dict, list)):
+            return result
+        ref = await asyncio.to_thread(self._put_if_large, result)
+        if ref is None:
+            return result
+        
+        self.metrics['blobs_stored'] += 1
+        self.metrics['blob_bytes'] += ref.size
+        return ref
+    
+    def _put_if_large(self, result: Any) -> Optional[BlobRef]:
+        """Serialize result and store it if above the threshold (worker thread)"""
+        try:
+            data = json.dumps(result, default=str).encode()
+        except (TypeError, ValueError):
+            return None
+        if len(data) <= self.blob_threshold_bytes:
+            return None
+        return BlobRef(key=self.blob_store.put(data), size=len(data))
+    
+    def _load_output(self, value: Any) -> Any:
+        """Materialize BlobRef (other values are returned as-is)"""
+        if isinstance(value, BlobRef):
+            return self.blob_store.get_json(value)
+        return value
+    
+    async def _load_output_async(self, value: Any) -> Any:
+        """_load_output() with the blob read run in a worker thread"""
+        if isinstance(value, BlobRef):
+            return await asyncio.to_thread(self.blob_store.get_json, value)
+        return value
+    
+    @staticmethod
+    def _serialize_value(value: Any) -> Any:
+        """JSON-friendly form of an execution_state value (BlobRef -> handle dict)"""
+        if isinstance(value, BlobRef):
+            return value.to_dict()
+        return value
+    
+    @classmethod
+    def serialize_state(cls, execution_state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        execution_state with large outputs as blob handles
+        
+        Args:
+            execution_state: State returned by execute()
+        
+        Returns:
+            Dict safe to return from the API or persist (outputs above the
+            blob threshold appear as {'$blob': key, 'size': bytes})
+        """
+        return {key: cls._serialize_value(value) for key, value in execution_state.items()}
+    
     async def _execute_component(
         self, 
         component, 
         component_name: str, 
         config: Dict[str, Any],
-        node_inputs: Dict[str, Any]
+        node_inputs: Dict[str, Any],
+        variables: Optional[Dict[str, Any]] = None
     ) -> Any:
         """
         Execute component based on its type
@@ -375,7 +1090,8 @@ class RecipeEvaluator:
             component_name: Component class name
             config: Resolved configuration
             node_inputs: Outputs from dependent nodes
-            
+            variables: Prompt variables bound as-is (map item)
+        
         Returns:
             Component execution result
         """
@@ -390,7 +1106,7 @@ class RecipeEvaluator:
             # LLMProcessor needs prompt (may include data from previous nodes)
             # Note: model and temperature are set via component config in __init__
             prompt_template = config.get('prompt_template', '')
-            prompt = self._build_prompt(prompt_template, node_inputs)
+            prompt = self._build_prompt(prompt_template, node_inputs, variables)
             
             system_message = config.get('system_message')
             
@@ -418,7 +1134,64 @@ class RecipeEvaluator:
             # Generic execution - pass all node_inputs
             return await component.execute(**node_inputs)
     
-    def _interpolate_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
+    def _set_node_output(self, node_id: str, value: Any):
+        """Record node output in execution_state and the live template context"""
+        self.execution_state[f"{node_id}.output"] = value
+        if self._context_state is self.execution_state:
+            self._context[node_id] = self._context_entry(value)
+    
+    def _context_entry(self, value: Any) -> Mapping:
+        """Template context entry for a node output (blobs load only if the template uses them)"""
+        if isinstance(value, BlobRef):
+            return _LazyNodeOutput(self, value)
+        return {'output': value}
+    
+    def _template_context(self) -> Dict[str, Any]:
+        """
+        Live Jinja2 context for config interpolation
+        
+        Built once per execution and updated by _set_node_output() as nodes
+        complete, instead of rescanning execution_state for every node. Rebuilt
+        only when execution_state is replaced (new execution, tests).
+        """
+        if self._context_state is not self.execution_state:
+            self._context = {
+                'inputs': self.execution_state.get('inputs', {}),
+                'config': self.config if hasattr(self, 'config') else {},
+                # Runtime context for subscription tracking variables
+                'runtime': {
+                    'agent_instance_id': self.tracking_config.get('agent_instance_id', 'test-agent'),
+                    'recipe_id': self.tracking_config.get('recipe_id') or self.recipe.get('id', 'unknown'),
+                    'agency_id': self.tracking_config.get('agency_id', 'test-agency')
+                }
+            }
+            for key, value in self.execution_state.items():
+                if key.endswith('.output'):
+                    self._context[key[:-len('.output')]] = self._context_entry(value)
+            self._context_state = self.execution_state
+        return self._context
+    
+    async def _preload_templates(self, config: Dict[str, Any]):
+        """Load blob outputs referenced by config templates off the event loop"""
+        names = set()
+        pending = [config]
+        while pending:
+            for value in pending.pop().values():
+                if isinstance(value, str) and '{{' in value and '}}' in value:
+                    names |= template_variables(value)
+                elif isinstance(value, dict):
+                    pending.append(value)
+        context = self._template_context()
+        for name in names:
+            entry = context.get(name)
+            if isinstance(entry, _LazyNodeOutput):
+                await entry.preload()
+    
+    def _interpolate_config(
+        self,
+        config: Dict[str, Any],
+        context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Interpolate config parameters using Jinja2 templates
         
@@ -429,40 +1202,25 @@ class RecipeEvaluator:
         
         Args:
             config: Configuration dict with template strings
-            
+            context: Template context (nested calls reuse the caller's)
+        
         Returns:
             Resolved configuration
         """
         resolved = {}
-        
-        # Build template context
-        context = {
-            'inputs': self.execution_state.get('inputs', {}),
-            'config': self.config if hasattr(self, 'config') else {},
-            # Runtime context for subscription tracking variables
-            'runtime': {
-                'agent_instance_id': self.tracking_config.get('agent_instance_id', 'test-agent'),
-                'recipe_id': self.tracking_config.get('recipe_id') or self.recipe.get('id', 'unknown'),
-                'agency_id': self.tracking_config.get('agency_id', 'test-agency')
-            }
-        }
-        
-        # Add node outputs to context
-        for key, value in self.execution_state.items():
-            if '.output' in key:
-                node_name = key.replace('.output', '')
-                context[node_name] = {'output': value}
+        if context is None:
+            context = self._template_context()
         
         for key, value in config.items():
             if isinstance(value, str) and '{{' in value and '}}' in value:
                 try:
-                    # Render with Jinja2
-                    template = Template(value)
-                    rendered = template.render(**context)
+                    # Render with Jinja2 (precompiled in the recipe plan)
+                    template = self.compiled_recipe.get_template(value)
+                    rendered = template.render(context)
                     
                     # Try to convert to appropriate type
                     resolved[key] = self._cast_value(rendered)
-                    
+                
                 except jinja2.exceptions.UndefinedError as e:
                     raise ValueError(f"Template variable not found in '{key}': {e}") from e
                 except jinja2.exceptions.TemplateSyntaxError as e:
@@ -472,7 +1230,7 @@ class RecipeEvaluator:
                     resolved[key] = value
             elif isinstance(value, dict):
                 # Recursively interpolate nested dicts
-                resolved[key] = self._interpolate_config(value)
+                resolved[key] = self._interpolate_config(value, context)
             else:
                 resolved[key] = value
                 resolved[key] = value
@@ -485,7 +1243,7 @@ class RecipeEvaluator:
         
         Args:
             value: String value to cast
-            
+        
         Returns:
             Typed value (int, float, bool, or string)
         """
@@ -519,14 +1277,21 @@ class RecipeEvaluator:
         # Return as string
         return value
     
-    def _build_prompt(self, template: str, node_inputs: Dict) -> str:
+    def _build_prompt(
+        self,
+        template: str,
+        node_inputs: Dict,
+        variables: Optional[Dict[str, Any]] = None
+    ) -> str:
         """
         Build LLM prompt from template and node inputs
         
         Args:
             template: Prompt template with placeholders
             node_inputs: Outputs from dependent nodes
-            
+            variables: Extra variables bound as-is, like in config
+                       interpolation (map item, a list when chunked)
+        
         Returns:
             Rendered prompt
         """
@@ -542,10 +1307,11 @@ class RecipeEvaluator:
                 context[node_id] = output
             else:
                 context[node_id] = {'output': output}
+        context.update(variables or {})
         
         try:
-            # Render with Jinja2
-            jinja_template = Template(template)
+            # Render with Jinja2 (precompiled in the recipe plan)
+            jinja_template = self.compiled_recipe.get_template(template)
             rendered = jinja_template.render(**context)
             return rendered
         except TemplateError as e:
@@ -575,15 +1341,15 @@ class RecipeEvaluator:
                 report_data[node_id] = output
         return report_data
     
-    def _resolve_output(self, output_source: str) -> Any:
+    async def _resolve_output(self, output_source: str) -> Any:
         """Resolve final output from execution state"""
         if output_source in self.execution_state:
-            return self.execution_state[output_source]
+            return await self._load_output_async(self.execution_state[output_source])
         
         # Try to find last node output
         for key in reversed(list(self.execution_state.keys())):
             if key.endswith('.output'):
-                return self.execution_state[key]
+                return await self._load_output_async(self.execution_state[key])
         
         return self.execution_state
 
@@ -65,6 +65,28 @@ class RecipeInputSchema(BaseModel):
         return self
 
 
+class MapSchema(BaseModel):
+    """
+    Schema for a map (fan-out) node
+    
+    The node's component runs once per chunk of an upstream list; results
+    are gathered, in order, into a list that becomes the node's output.
+    """
+    over: str = Field(..., description="Upstream list to map over (e.g., 'fetch_pages.output.pages')")
+    item_var: str = Field("item", description="Template variable bound to the current element (or chunk)")
+    chunk_size: int = Field(1, ge=1, description="Elements per component call (>1 binds a list)")
+    concurrency: Optional[int] = Field(None, ge=1, description="Maximum concurrent component calls")
+    
+    @field_validator('over')
+    @classmethod
+    def validate_over(cls, v):
+        """Ensure path has the form <node_id>.output[.key...]"""
+        parts = v.split('.')
+        if len(parts) < 2 or parts[1] != 'output':
+            raise ValueError(f"Map source must look like '<node_id>.output[.key]', got: {v}")
+        return v
+
+
 class WorkflowNodeSchema(BaseModel):
     """Schema for recipe workflow node"""
     id: str = Field(..., description="Unique node identifier")
@@ -72,6 +94,10 @@ class WorkflowNodeSchema(BaseModel):
     config: Dict[str, Any] = Field(default_factory=dict, description="Component configuration")
     secrets: Optional[Dict[str, str]] = Field(None, description="Secret references (secret:key_name)")
     depends_on: Optional[List[str]] = Field(None, description="Node IDs this node depends on")
+    cache_ttl: Optional[int] = Field(None, ge=1, description="Memoize node result for this many seconds (opt-in)")
+    timeout_ms: Optional[int] = Field(None, ge=1, description="Cancel node after this many milliseconds")
+    mandatory: bool = Field(False, description="Always execute, even when the requested output does not need it")
+    map: Optional[MapSchema] = Field(None, description="Run component once per element of an upstream list")
     
     @field_validator('component')
     @classmethod
@@ -107,6 +133,8 @@ class WorkflowSchema(BaseModel):
     nodes: List[WorkflowNodeSchema] = Field(..., description="Workflow nodes")
     edges: List[WorkflowEdgeSchema] = Field(..., description="Workflow edges (execution order)")
     output: WorkflowOutputSchema = Field(..., description="Final output definition")
+    max_parallelism: Optional[int] = Field(None, ge=1, description="Maximum number of nodes executed concurrently")
+    timeout_ms: Optional[int] = Field(None, ge=1, description="Deadline for the whole workflow in milliseconds")
     
     @model_validator(mode='after')
     def validate_workflow_graph(self):
@@ -131,6 +159,13 @@ class WorkflowSchema(BaseModel):
                     if dep not in node_ids:
                         raise ValueError(f"Node {node.id} depends on unknown node: {dep}")
         
+        # Validate map sources are upstream dependencies
+        for node in nodes:
+            if node.map:
+                source_node_id = node.map.over.split('.')[0]
+                if source_node_id not in (node.depends_on or []):
+                    raise ValueError(f"Map node {node.id} must depend on its source node: {source_node_id}")
+        
         # Validate output source references existing node
         output = self.output
         if output:
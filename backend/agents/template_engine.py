@@ -0,0 +1,133 @@
+"""
+Template Engine
+Process-wide sandboxed Jinja2 environment for recipe templates
+
+Templates are addressed by the SHA-256 of their source, so identical strings
+from any recipe share one compiled Template. Set TEMPLATE_BYTECODE_CACHE_DIR
+to persist compiled bytecode on disk so new worker processes start warm.
+"""
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from typing import FrozenSet, Optional
+
+from jinja2 import (
+    BaseLoader, FileSystemBytecodeCache, Template, TemplateNotFound, TemplateSyntaxError, meta
+)
+from jinja2.sandbox import SandboxedEnvironment
+
+from components.processors.crawl_result import expand_crawl
+
+# Number of compiled templates kept in memory (Jinja2 LRU)
+TEMPLATE_CACHE_SIZE = 1024
+
+
+class SourceHashLoader(BaseLoader):
+    """
+    Loader that resolves template names (source hashes) to pending sources
+    
+    Sources are only held between registration and compilation; afterwards
+    the environment's LRU (and optional bytecode cache) owns the result.
+    """
+    
+    def __init__(self):
+        # Thread-local so concurrent compiles of the same source cannot race
+        self._local = threading.local()
+    
+    def register(self, name: str, source: str):
+        """Register source for an upcoming get_template(name) call"""
+        self._local.pending = (name, source)
+    
+    def release(self, name: str):
+        """Forget registered source once compiled"""
+        self._local.pending = None
+    
+    def get_source(self, environment, template):
+        pending = getattr(self._local, 'pending', None)
+        if not pending or pending[0] != template:
+            raise TemplateNotFound(template)
+        source = pending[1]
+        # Name is a content hash, so a cached template is always up to date
+        return source, None, lambda: True
+
+
+_loader = SourceHashLoader()
+
+template_env = SandboxedEnvironment(
+    loader=_loader,
+    cache_size=TEMPLATE_CACHE_SIZE,
+    auto_reload=False
+)
+
+# {% set crawl = fetch_pages | expand_crawl %}: page dicts from compact crawl output
+template_env.filters['expand_crawl'] = expand_crawl
+
+
+def configure_bytecode_cache(directory: Optional[str]) -> Optional[FileSystemBytecodeCache]:
+    """
+    Enable (or disable with None) the on-disk bytecode cache
+    
+    Args:
+        directory: Directory for compiled template bytecode
+    
+    Returns:
+        Configured bytecode cache or None
+    """
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        template_env.bytecode_cache = FileSystemBytecodeCache(directory)
+    else:
+        template_env.bytecode_cache = None
+    return template_env.bytecode_cache
+
+
+def template_key(source: str) -> str:
+    """Template name for source string (SHA-256 hex digest)"""
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def get_template(source: str) -> Template:
+    """
+    Get compiled template for source string
+    
+    Args:
+        source: Jinja2 template source
+    
+    Returns:
+        Compiled (and cached) sandboxed Template
+    
+    Raises:
+        TemplateSyntaxError: If source is not a valid template
+    """
+    name = template_key(source)
+    _loader.register(name, source)
+    try:
+        return template_env.get_template(name)
+    finally:
+        _loader.release(name)
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def template_variables(source: str) -> FrozenSet[str]:
+    """
+    Names a template source reads from its context
+    
+    Args:
+        source: Jinja2 template source
+    
+    Returns:
+        Undeclared variable names (empty if source does not parse)
+    """
+    try:
+        return frozenset(meta.find_undeclared_variables(template_env.parse(source)))
+    except TemplateSyntaxError:
+        return frozenset()
+
+
+def clear_template_cache():
+    """Drop all in-memory compiled templates"""
+    template_env.cache.clear()
+
+
+configure_bytecode_cache(os.getenv('TEMPLATE_BYTECODE_CACHE_DIR'))
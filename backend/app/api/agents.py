@@ -3,11 +3,13 @@ Agent API Routes
 Execute agent recipes via API + Agent Allocation Management
 """
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 from uuid import UUID
 from datetime import datetime, timezone
+import json
 import sys
 
 # Add backend to path
@@ -18,7 +20,7 @@ if str(backend_path) not in sys.path:
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from agents.recipe_evaluator import RecipeEvaluator
+from agents.recipe_evaluator import RecipeEvaluator, RecipeTimeoutError
 from agents.agent import Agent, create_agent
 from app.utils.security import get_current_user
 from app.utils.db import get_db
@@ -37,6 +39,19 @@ class ExecuteRecipeRequest(BaseModel):
     category: str = Field("seo", description="Recipe category (seo, social, leads)")
     inputs: Dict[str, Any] = Field(..., description="Input parameters for recipe")
     mock_mode: bool = Field(True, description="Use mock data instead of real API calls")
+    timeout_ms: Optional[int] = Field(None, ge=1, description="Recipe deadline (overrides recipe's workflow.timeout_ms)")
+    include_state: bool = Field(False, description="Include per-node execution state (large outputs as blob handles)")
+    output_node: Optional[str] = Field(None, description="Return this node's output; only its dependencies (and mandatory nodes) run")
+
+
+class ExecuteBatchRequest(BaseModel):
+    """Request to execute an agent recipe for many inputs"""
+    recipe_id: str = Field(..., description="Recipe ID (e.g., 'site-audit')")
+    category: str = Field("seo", description="Recipe category (seo, social, leads)")
+    inputs_list: List[Dict[str, Any]] = Field(..., min_length=1, max_length=1000, description="Input parameters, one set per item")
+    concurrency: int = Field(4, ge=1, le=32, description="Maximum items executing at once")
+    mock_mode: bool = Field(True, description="Use mock data instead of real API calls")
+    timeout_ms: Optional[int] = Field(None, ge=1, description="Per-item recipe deadline")
 
 
 class ExecuteRecipeResponse(BaseModel):
@@ -46,6 +61,7 @@ class ExecuteRecipeResponse(BaseModel):
     output: Dict[str, Any]
     metrics: Dict[str, Any]
     message: str = ""
+    execution_state: Optional[Dict[str, Any]] = None
 
 
 @router.post("/execute", response_model=ExecuteRecipeResponse)
@@ -69,27 +85,149 @@ async def execute_recipe(
             )
         
         # Initialize evaluator
-        evaluator = RecipeEvaluator(recipe_path=str(recipe_path), mock_mode=request.mock_mode)
+        evaluator = RecipeEvaluator(
+            recipe_path=str(recipe_path),
+            mock_mode=request.mock_mode,
+            timeout_ms=request.timeout_ms
+        )
         
         # Execute recipe
-        result = await evaluator.execute(request.inputs)
+        result = await evaluator.execute(request.inputs, request.output_node)
         
         return ExecuteRecipeResponse(
             success=result['success'],
             recipe_id=result['recipe_id'],
             output=result['output'],
             metrics=result['metrics'],
-            message=f"Recipe executed successfully in {result['metrics']['execution_time_ms']}ms"
+            message=f"Recipe executed successfully in {result['metrics']['execution_time_ms']}ms",
+            execution_state=RecipeEvaluator.serialize_state(result['execution_state']) if request.include_state else None
         )
         
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except RecipeTimeoutError as e:
+        raise HTTPException(status_code=504, detail=f"Execution timed out: {str(e)}")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Execution failed: {str(e)}")
 
 
+def _format_sse(event: Dict[str, Any]) -> str:
+    """Format execution event as a Server-Sent Events message"""
+    if event['event'] == 'execution_finished':
+        # Same payload as POST /execute (execution_state stays server-side)
+        result = event['result']
+        event = {
+            'event': 'execution_finished',
+            'success': result['success'],
+            'recipe_id': result['recipe_id'],
+            'output': result['output'],
+            'metrics': result['metrics']
+        }
+    return f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+@router.post("/execute/stream")
+async def execute_recipe_stream(
+    request: ExecuteRecipeRequest,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Execute an agent recipe, streaming progress as Server-Sent Events
+    
+    Emits node_started/node_finished (with timing), page_fetched and
+    llm_token events while the recipe runs, then a final
+    execution_finished (same fields as POST /execute) or execution_failed.
+    Disconnecting cancels the execution.
+    """
+    recipe_path = Path(__file__).parent.parent.parent.parent / "recipes" / request.category / f"{request.recipe_id}.yaml"
+    
+    if not recipe_path.exists():
+        raise HTTPException(
+            status_code=404,
+            detail=f"Recipe not found: {request.category}/{request.recipe_id}"
+        )
+    
+    try:
+        evaluator = RecipeEvaluator(
+            recipe_path=str(recipe_path),
+            mock_mode=request.mock_mode,
+            timeout_ms=request.timeout_ms
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def event_stream():
+        async for event in evaluator.execute_stream(request.inputs, request.output_node):
+            yield _format_sse(event)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Disable proxy buffering (nginx)
+        }
+    )
+
+
+@router.post("/execute/batch")
+async def execute_recipe_batch(
+    request: ExecuteBatchRequest,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Execute an agent recipe for many inputs, streaming results as Server-Sent Events
+    
+    Identical inputs run once; items share the compiled recipe and component
+    instances. Emits one item_finished event per unique input (with the
+    positions it had in inputs_list) as soon as it completes, then batch_finished.
+    """
+    recipe_path = Path(__file__).parent.parent.parent.parent / "recipes" / request.category / f"{request.recipe_id}.yaml"
+    
+    if not recipe_path.exists():
+        raise HTTPException(
+            status_code=404,
+            detail=f"Recipe not found: {request.category}/{request.recipe_id}"
+        )
+    
+    try:
+        evaluator = RecipeEvaluator(
+            recipe_path=str(recipe_path),
+            mock_mode=request.mock_mode,
+            timeout_ms=request.timeout_ms
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def event_stream():
+        summary = {'event': 'batch_finished', 'total': len(request.inputs_list), 'unique': 0, 'succeeded': 0, 'failed': 0}
+        async for item in evaluator.execute_many(request.inputs_list, concurrency=request.concurrency):
+            result = item['result'] or {}
+            summary['unique'] += 1
+            summary['succeeded' if item['success'] else 'failed'] += 1
+            yield _format_sse({
+                'event': 'item_finished',
+                'indices': item['indices'],
+                'inputs': item['inputs'],
+                'success': item['success'],
+                'output': result.get('output'),
+                'metrics': result.get('metrics'),
+                'error': item['error']
+            })
+        yield _format_sse(summary)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+
 @router.get("/recipes")
 async def list_recipes(
     current_user: UserResponse = Depends(get_current_user)
@@ -407,20 +545,24 @@ async def execute_agent_recipe(
     recipe_id: UUID,
     inputs: Dict[str, Any],
     mock_mode: bool = False,
+    include_state: bool = False,
+    output_node: Optional[str] = None,
     current_user: UserResponse = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Execute recipe using Agent runtime (with tracking + ownership validation)
     
-    Replaces legacy /agents/execute endpoint - uses Agent class for vertical integration
+    Replaces legacy /agents/execute endpoint - uses Agent class for vertical integration.
+    Pass include_state=true to also return per-node state (large outputs as blob handles).
+    Pass output_node to get a single node's output without running unrelated nodes.
     """
     try:
         # Initialize agent
         agent = await create_agent(agent_instance_id, db)
         
         # Execute recipe (validates ownership automatically)
-        result = await agent.execute_recipe(recipe_id, inputs, mock_mode)
+        result = await agent.execute_recipe(recipe_id, inputs, mock_mode, output_node=output_node)
         
         await db.commit()
         
@@ -429,7 +571,8 @@ async def execute_agent_recipe(
             recipe_id=result['recipe_id'],
             output=result['output'],
             metrics=result['metrics'],
-            message=f"Recipe executed by agent '{agent.agent_instance.custom_name}' in {result['metrics']['execution_time_ms']}ms"
+            message=f"Recipe executed by agent '{agent.agent_instance.custom_name}' in {result['metrics']['execution_time_ms']}ms",
+            execution_state=RecipeEvaluator.serialize_state(result['execution_state']) if include_state else None
         )
         
     except ValueError as e:
@@ -137,6 +137,39 @@ async def execute_task(
         raise HTTPException(status_code=500, detail=f"Execution failed: {str(e)}")
 
 
+@router.post("/{task_id}/retry", response_model=Dict[str, Any])
+async def retry_task(
+    task_id: UUID,
+    mock_mode: bool = False,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Retry failed task (synchronous)
+    
+    Resumes from the task's last checkpoint: nodes that already succeeded
+    are not re-executed. Task status will change: failed → running → completed/failed
+    """
+    try:
+        # Set RLS context
+        agency_id = get_agency_id_from_user(current_user)
+        await set_rls_context(db, agency_id)
+        
+        service = TaskQueueService(db)
+        result = await service.retry_task(task_id, mock_mode)
+        
+        await db.commit()
+        
+        return result
+        
+    except ValueError as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Retry failed: {str(e)}")
+
+
 @router.post("/{task_id}/execute-async")
 async def execute_task_async(
     task_id: UUID,
@@ -1,14 +1,31 @@
 """
 TeamAI Backend - FastAPI Application Entry Point
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 
 # Import routers
 from app.api import auth, invites, agents, tasks
+from components.component_pool import component_pool
+from components.connectors.website_connector import close_shared_clients
+from components.utils.parse_pool import parse_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifecycle - pooled components live until shutdown"""
+    yield
+    # Release HTTP clients held by pooled component instances
+    await component_pool.close()
+    await close_shared_clients()
+    parse_pool.shutdown()
+
 
 app = FastAPI(
+    lifespan=lifespan,
     title="TeamAI API",
     description="Virtual AI Workforce Platform for Digital Marketing Agencies",
     version="0.1.0",
@@ -128,6 +128,53 @@ class TaskQueueService:
         if task.status in ['completed', 'failed']:
             raise ValueError(f"Task {task_id} already {task.status}")
         
+        return await self._run_task(task, mock_mode)
+    
+    async def retry_task(
+        self,
+        task_id: UUID,
+        mock_mode: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Retry failed task, resuming from its last checkpoint
+        
+        Nodes that succeeded before the failure are restored from the
+        checkpoint instead of being re-executed (and re-billed).
+        
+        Args:
+            task_id: UUID of failed task
+            mock_mode: If True, run components in mock mode
+            
+        Returns:
+            Execution result dictionary
+            
+        Raises:
+            ValueError: If task not found or not failed
+        """
+        stmt = (
+            select(TaskQueue)
+            .options(selectinload(TaskQueue.agent_instance))
+            .where(TaskQueue.id == task_id)
+        )
+        result = await self.session.execute(stmt)
+        task = result.scalar_one_or_none()
+        
+        if not task:
+            raise ValueError(f"Task {task_id} not found")
+        
+        if task.status != 'failed':
+            raise ValueError(f"Task {task_id} is {task.status}, only failed tasks can be retried")
+        
+        task.completed_at = None
+        return await self._run_task(task, mock_mode, resume=True)
+    
+    async def _run_task(
+        self,
+        task: TaskQueue,
+        mock_mode: bool,
+        resume: bool = False
+    ) -> Dict[str, Any]:
+        """Run task's recipe, checkpointing under the task ID"""
         # Update status to running
         task.status = 'running'
         task.started_at = datetime.now(timezone.utc)
@@ -142,7 +189,13 @@ class TaskQueueService:
             inputs = task.input_params['inputs']
             
             # Execute recipe
-            result = await agent.execute_recipe(recipe_id, inputs, mock_mode)
+            result = await agent.execute_recipe(
+                recipe_id,
+                inputs,
+                mock_mode,
+                checkpoint_id=str(task.id),
+                resume=resume
+            )
             
             # Update task with results
             task.status = 'completed'
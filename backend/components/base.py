@@ -2,13 +2,110 @@
 Base Component Class
 All components inherit from this abstract base class
 """
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+EventSink = Callable[[Dict[str, Any]], None]
+
+# Receiver for progress events of the current execution (None = not streaming).
+# A ContextVar so concurrent executions sharing component instances stay separate.
+_event_sink: ContextVar[Optional[EventSink]] = ContextVar('component_event_sink', default=None)
+
+# Deadline (time.monotonic() value) of the current node, None = unbounded
+_deadline: ContextVar[Optional[float]] = ContextVar('component_deadline', default=None)
+
+# Tenant (agency ID) the current execution runs for, None = not tenant-scoped
+_tenant: ContextVar[Optional[str]] = ContextVar('component_tenant', default=None)
+
+
+def get_event_sink() -> Optional[EventSink]:
+    """Get event sink of the current execution context"""
+    return _event_sink.get()
+
+
+def set_event_sink(sink: Optional[EventSink]) -> Token:
+    """
+    Set event sink for the current execution context
+    
+    Args:
+        sink: Callable receiving event dicts (None disables events)
+    
+    Returns:
+        Token for reset_event_sink()
+    """
+    return _event_sink.set(sink)
+
+
+def reset_event_sink(token: Token):
+    """Restore event sink that was active before set_event_sink()"""
+    _event_sink.reset(token)
+
+
+def set_deadline(deadline: Optional[float]) -> Token:
+    """
+    Set deadline for the current execution context
+    
+    Args:
+        deadline: time.monotonic() value after which work is cancelled (None = unbounded)
+    
+    Returns:
+        Token for resetting the previous deadline
+    """
+    return _deadline.set(deadline)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline (None if unbounded, never negative)"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def set_tenant(tenant: Optional[str]) -> Token:
+    """
+    Set tenant for the current execution context
+    
+    Components holding per-tenant state (e.g. the HTTP cache) isolate it by
+    this value.
+    
+    Args:
+        tenant: Agency ID (None = not tenant-scoped)
+    
+    Returns:
+        Token for resetting the previous tenant
+    """
+    return _tenant.set(tenant)
+
+
+def get_tenant() -> Optional[str]:
+    """Get tenant (agency ID) of the current execution context"""
+    return _tenant.get()
+
+
+def emit_event(event: str, **data: Any):
+    """
+    Emit progress event to the current sink (no-op when nobody is listening)
+    
+    Args:
+        event: Event type (e.g. 'node_started', 'page_fetched', 'llm_token')
+        **data: Event payload
+    """
+    sink = _event_sink.get()
+    if sink is not None:
+        sink({'event': event, **data})
 
 
 class BaseComponent(ABC):
     """Abstract base class for all TeamAI components"""
     
+    # Config keys read per execution (passed by RecipeEvaluator), not in __init__.
+    # Pooled instances are shared across different values of these keys.
+    RUNTIME_CONFIG_KEYS: Tuple[str, ...] = ()
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None, mock_mode: bool = False):
         """
         Initialize component
@@ -36,5 +133,20 @@ class BaseComponent(ABC):
         """
         pass
     
+    async def aclose(self):
+        """
+        Release resources held by the component (HTTP clients, pools)
+        Override in subclasses that hold any
+        """
+        pass
+    
+    def remaining_time(self) -> Optional[float]:
+        """Seconds left in the current node's time budget (None if unbounded)"""
+        return remaining_time()
+    
+    def emit_event(self, event: str, **data: Any):
+        """Emit progress event tagged with this component's name"""
+        emit_event(event, component=self.__class__.__name__, **data)
+    
     def __str__(self) -> str:
         return f"{self.__class__.__name__}(mock_mode={self.mock_mode})"
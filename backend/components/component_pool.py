@@ -0,0 +1,208 @@
+"""
+Component Pool
+Long-lived component instances shared across nodes and executions
+
+Components are stateless between execute() calls, so one instance (with its
+HTTP clients and connection pools) can serve every node that uses the same
+configuration. Instances are keyed by component class, mock mode and the
+non-secret config (minus the class's RUNTIME_CONFIG_KEYS, which are passed
+per execution); secret-bearing configs are additionally keyed by tenant
+scope and a keyed digest of the secret values, so an instance holding one
+agency's credentials is never handed to another.
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Set, Tuple, Type
+
+from components.base import BaseComponent
+
+
+class ComponentPool:
+    """
+    Bounded LRU of component instances
+    
+    Callers check instances out with acquire() and hand them back with
+    release() once their execute() call is done. An instance evicted by the
+    LRU is closed (aclose()) when its last holder releases it, never while
+    a call may still be using its HTTP clients. Call close() on application
+    shutdown (FastAPI lifespan) to close everything still open.
+    """
+    
+    def __init__(self, max_size: int = 256):
+        """
+        Initialize component pool
+        
+        Args:
+            max_size: Maximum number of pooled instances
+        """
+        self.max_size = max_size
+        self._instances: "OrderedDict[Tuple, BaseComponent]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Per-process key so secret digests cannot be precomputed or compared across hosts
+        self._secret_key = os.urandom(32)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._holders: Dict[int, int] = {}  # id(instance) -> checkouts not yet released
+        self._retired: Dict[int, BaseComponent] = {}  # Evicted, closed on last release or shutdown
+        self._closing: Set[asyncio.Task] = set()
+    
+    def acquire(
+        self,
+        component_class: Type[BaseComponent],
+        config: Dict[str, Any],
+        secrets: Optional[Dict[str, Any]] = None,
+        mock_mode: bool = False,
+        scope: Optional[str] = None
+    ) -> BaseComponent:
+        """
+        Check out pooled component instance, creating it on first use
+        
+        Args:
+            component_class: Component class to instantiate
+            config: Resolved non-secret configuration
+            secrets: Injected secret values (merged into config)
+            mock_mode: Component mock mode
+            scope: Tenant scope (agency ID) for secret-bearing instances
+        
+        Returns:
+            Shared component instance (private instance if config is not
+            serializable); pass it to release() when done
+        """
+        secrets = secrets or {}
+        config = {
+            key: value for key, value in config.items()
+            if key not in component_class.RUNTIME_CONFIG_KEYS
+        }
+        merged_config = {**config, **secrets}
+        
+        try:
+            key = self._key(component_class, config, secrets, mock_mode, scope)
+        except (TypeError, ValueError):
+            return component_class(config=merged_config, mock_mode=mock_mode)
+        
+        with self._lock:
+            component = self._instances.get(key)
+            if component is not None:
+                self._instances.move_to_end(key)
+                self.hits += 1
+                return self._check_out(component)
+            self.misses += 1
+        
+        component = component_class(config=merged_config, mock_mode=mock_mode)
+        
+        idle = []
+        with self._lock:
+            # Another task may have built the same instance meanwhile - keep the first
+            existing = self._instances.get(key)
+            if existing is not None:
+                return self._check_out(existing)
+            self._instances[key] = component
+            self._check_out(component)
+            while len(self._instances) > self.max_size:
+                evicted = self._instances.popitem(last=False)[1]
+                self.evictions += 1
+                if self._holders.get(id(evicted)):
+                    self._retired[id(evicted)] = evicted
+                else:
+                    idle.append(evicted)
+        
+        if idle:
+            self._close_later(idle)
+        return component
+    
+    async def release(self, component: BaseComponent):
+        """
+        Hand back an instance checked out with acquire()
+        
+        Closes the instance if it was evicted and this was its last holder.
+        """
+        with self._lock:
+            holders = self._holders.get(id(component))
+            if holders is None:
+                return  # Private (unpooled) instance
+            if holders > 1:
+                self._holders[id(component)] = holders - 1
+                return
+            del self._holders[id(component)]
+            retired = self._retired.pop(id(component), None)
+        
+        if retired is not None:
+            await self._close_instances([retired])
+    
+    def _check_out(self, component: BaseComponent) -> BaseComponent:
+        """Count a holder of component (caller holds the lock)"""
+        self._holders[id(component)] = self._holders.get(id(component), 0) + 1
+        return component
+    
+    def _close_later(self, instances: List[BaseComponent]):
+        """Close evicted idle instances in the background (at shutdown without a running loop)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            with self._lock:
+                self._retired.update((id(component), component) for component in instances)
+            return
+        task = loop.create_task(self._close_instances(instances))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+    
+    @staticmethod
+    async def _close_instances(instances: List[BaseComponent]):
+        """aclose() each instance, logging failures"""
+        for component in instances:
+            try:
+                await component.aclose()
+            except Exception as e:
+                print(f"[ComponentPool] Failed to close {component}: {e}")
+    
+    def _key(
+        self,
+        component_class: Type[BaseComponent],
+        config: Dict[str, Any],
+        secrets: Dict[str, Any],
+        mock_mode: bool,
+        scope: Optional[str]
+    ) -> Tuple:
+        """Pool key - never contains secret values"""
+        public = json.dumps(config, sort_keys=True)
+        if not secrets:
+            return (component_class.__name__, mock_mode, public, None, None)
+        
+        digest = hmac.new(
+            self._secret_key,
+            json.dumps(secrets, sort_keys=True).encode(),
+            hashlib.sha256
+        ).hexdigest()
+        return (component_class.__name__, mock_mode, public, scope, digest)
+    
+    async def close(self):
+        """Close all pooled and evicted instances (application shutdown)"""
+        with self._lock:
+            instances = list(self._instances.values()) + list(self._retired.values())
+            self._instances.clear()
+            self._retired.clear()
+            self._holders.clear()
+        
+        await self._close_instances(instances)
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        return {
+            'size': len(self._instances),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+
+# Process-wide pool used by RecipeEvaluator (closed by the FastAPI lifespan)
+component_pool = ComponentPool()
@@ -2,6 +2,10 @@
 Connectors Package
 Data source adapters for external systems
 """
-from .website_connector import WebsiteConnector
+from .website_connector import WebsiteConnector, get_shared_client, close_shared_clients
+from .http_cache import HTTPCache, get_http_cache, set_http_cache
 
-__all__ = ['WebsiteConnector']
+__all__ = [
+    'WebsiteConnector', 'get_shared_client', 'close_shared_clients',
+    'HTTPCache', 'get_http_cache', 'set_http_cache'
+]
@@ -0,0 +1,251 @@
+"""
+HTTP Cache
+On-disk conditional-request cache for WebsiteConnector
+
+Responses carrying an ETag or Last-Modified validator are stored with their
+body gzip-compressed, keyed by the exact request URL (equivalent spellings
+such as /x and /x/ may be different resources, and a Last-Modified-only 304
+must not serve another URL's body). Repeat crawls send
+If-None-Match / If-Modified-Since and serve 304 responses from disk. Entries
+are evicted least-recently-used once the cache exceeds max_bytes. Entries
+can be isolated per namespace (agency), so one tenant's crawl never
+reveals cached content to another.
+"""
+import gzip
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+from components.utils.url_canonicalizer import fetch_url
+
+# Namespace directory for entries shared by all tenants
+SHARED_NAMESPACE = 'shared'
+
+# Response headers never written to disk: connection-level (RFC 9110 7.6.1)
+# and per-client cookies
+UNSTORED_HEADERS = frozenset({
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization', 'proxy-connection',
+    'te', 'trailer', 'transfer-encoding', 'upgrade', 'set-cookie', 'set-cookie2'
+})
+
+_HEADER_LENGTH = struct.Struct('>I')
+
+
+class HTTPCache:
+    """
+    Size-bounded LRU of HTTP responses on local disk
+    
+    Each entry is one file: a length-prefixed JSON header (validators,
+    status, encoding) followed by the gzip-compressed body, so validators
+    can be read without decompressing the body. Methods do blocking file
+    IO; call them from a thread (asyncio.to_thread) in async code.
+    """
+    
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024, compresslevel: int = 6):
+        """
+        Initialize HTTP cache
+        
+        Args:
+            directory: Root directory for cache files
+            max_bytes: Maximum total size of cache files on disk
+            compresslevel: gzip level for stored bodies (1 fastest - 9 smallest)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.compresslevel = compresslevel
+        self._lock = threading.Lock()
+        self._index: Optional["OrderedDict[Path, int]"] = None  # path -> size, oldest first
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def _path(self, url: str, namespace: Optional[str]) -> Path:
+        # The fragment is never sent, so it does not make a different request
+        key = hashlib.sha256(fetch_url(url).encode()).hexdigest()
+        if namespace:
+            directory = hashlib.sha256(namespace.encode()).hexdigest()[:32]
+        else:
+            directory = SHARED_NAMESPACE
+        return self.directory / directory / key[:2] / key
+    
+    def _load_index(self):
+        """Build LRU index from disk on first use (file mtime = last use)"""
+        if self._index is not None:
+            return
+        entries = []
+        for path in self.directory.glob('*/*/*'):
+            if path.suffix == '.tmp':
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+        entries.sort()
+        self._index = OrderedDict((path, size) for _, path, size in entries)
+        self._total_bytes = sum(size for _, _, size in entries)
+    
+    def _touch(self, path: Path):
+        with self._lock:
+            self._load_index()
+            if path in self._index:
+                self._index.move_to_end(path)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+    
+    def _read(self, path: Path, with_body: bool) -> Optional[Tuple[Dict[str, Any], Optional[bytes]]]:
+        try:
+            with open(path, 'rb') as f:
+                (length,) = _HEADER_LENGTH.unpack(f.read(_HEADER_LENGTH.size))
+                header = json.loads(f.read(length))
+                body = gzip.decompress(f.read()) if with_body else None
+            return header, body
+        except (FileNotFoundError, ValueError, OSError, struct.error):
+            return None
+    
+    def lookup(self, url: str, namespace: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get stored validators for URL (body not loaded)
+        
+        Returns:
+            Header dict with etag, last_modified, url, status_code, encoding, headers
+            or None if not cached
+        """
+        entry = self._read(self._path(url, namespace), with_body=False)
+        if entry is None:
+            self.misses += 1
+            return None
+        return entry[0]
+    
+    def load(self, url: str, namespace: Optional[str] = None) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """
+        Load cached response (after a 304) and mark it recently used
+        
+        Returns:
+            (header, body) or None if the entry disappeared (evicted, corrupt)
+        """
+        path = self._path(url, namespace)
+        entry = self._read(path, with_body=True)
+        if entry is None:
+            return None
+        self.hits += 1
+        self._touch(path)
+        return entry
+    
+    def store(self, url: str, header: Dict[str, Any], body: bytes, namespace: Optional[str] = None):
+        """
+        Store response (atomically replaces an existing entry)
+        
+        Args:
+            url: Requested URL
+            header: JSON-serializable response metadata (validators, status,
+                    encoding, response headers minus UNSTORED_HEADERS)
+            body: Raw response body
+            namespace: Isolation namespace (agency ID), None for the shared cache
+        """
+        if 'headers' in header:
+            header = {**header, 'headers': storable_headers(header['headers'])}
+        path = self._path(url, namespace)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header_bytes = json.dumps(header).encode()
+        data = (
+            _HEADER_LENGTH.pack(len(header_bytes))
+            + header_bytes
+            + gzip.compress(body, compresslevel=self.compresslevel)
+        )
+        if len(data) > self.max_bytes:
+            return
+        
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        
+        with self._lock:
+            self._load_index()
+            self._total_bytes += len(data) - self._index.pop(path, 0)
+            self._index[path] = len(data)
+            self._evict()
+    
+    def _evict(self):
+        """Delete least recently used entries until under max_bytes (lock held)"""
+        while self._total_bytes > self.max_bytes and self._index:
+            path, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+    
+    def clear(self, namespace: Optional[str] = None):
+        """Delete every entry of one namespace (all namespaces if None)"""
+        with self._lock:
+            self._load_index()
+            if namespace is None:
+                prefix = self.directory
+            else:
+                prefix = self._path('http://x/', namespace).parent.parent
+            for path in [p for p in self._index if prefix in p.parents]:
+                self._total_bytes -= self._index.pop(path)
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            self._load_index()
+            return {
+                'entries': len(self._index),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+def storable_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """Response headers minus hop-by-hop headers (including those named in Connection) and cookies"""
+    connection = next((value for name, value in headers.items() if name.lower() == 'connection'), '')
+    dropped = UNSTORED_HEADERS | {name.strip().lower() for name in connection.split(',')}
+    return {name: value for name, value in headers.items() if name.lower() not in dropped}
+
+
+_http_cache: Optional[HTTPCache] = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HTTPCache:
+    """
+    Get process-wide HTTP cache
+    
+    Stored in HTTP_CACHE_DIR (default: <tmp>/teamai-http-cache), bounded by
+    HTTP_CACHE_MAX_BYTES (default: 512 MB)
+    """
+    global _http_cache
+    with _http_cache_lock:
+        if _http_cache is None:
+            directory = os.getenv('HTTP_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'teamai-http-cache')
+            max_bytes = int(os.getenv('HTTP_CACHE_MAX_BYTES') or 512 * 1024 * 1024)
+            _http_cache = HTTPCache(directory, max_bytes=max_bytes)
+        return _http_cache
+
+
+def set_http_cache(cache: Optional[HTTPCache]):
+    """Replace process-wide HTTP cache (None restores the default)"""
+    global _http_cache
+    with _http_cache_lock:
+        _http_cache = cache
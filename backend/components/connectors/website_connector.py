@@ -1,9 +1,25 @@
 """
 WebsiteConnector - Data Source Layer
 Handles raw HTTP requests to websites (Data Source in architecture)
+
+Connectors share one long-lived httpx.AsyncClient per event loop by default,
+so repeat requests to a host reuse keep-alive connections instead of paying
+DNS, TCP and TLS setup for every page. Call close_shared_clients() on
+application shutdown.
+
+With http_cache enabled, responses carrying validators are kept in the
+on-disk HTTPCache and revalidated with conditional requests on later crawls.
 """
+import asyncio
+import codecs
+import importlib.util
+import random
+import re
+import time
 import httpx
-from typing import Dict, Any, Optional
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Any, Iterable, Optional, Tuple
 from pathlib import Path
 import sys
 
@@ -12,21 +28,255 @@ backend_path = Path(__file__).parent.parent.parent
 if str(backend_path) not in sys.path:
     sys.path.insert(0, str(backend_path))
 
-from components.base import BaseComponent
+from components.base import BaseComponent, get_tenant
+from components.connectors.http_cache import HTTPCache, get_http_cache
+
+
+# Connection pool tuning for crawler clients
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+# Body limits: pages larger than this are cut (or rejected, see truncate_oversized)
+DEFAULT_MAX_BODY_BYTES = 5 * 1024 * 1024
+DEFAULT_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# Retry policy: statuses worth retrying, backoff base and cap (seconds)
+DEFAULT_RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_RETRY_MAX_DELAY = 30.0
+
+# Bytes inspected for a BOM / <meta charset> before decoding starts
+SNIFF_BYTES = 1024
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16')
+)
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_:.-]+)', re.IGNORECASE)
+
+# HTTP/2 needs the optional 'h2' package (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+_shared_clients: Dict[Tuple[int, bool], Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+
+
+def _codec(name: Optional[str]) -> Optional[str]:
+    """Python codec name for a charset label (None if unknown)"""
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def detect_encoding(charset: Optional[str], head: bytes) -> str:
+    """
+    Pick the body encoding without statistical detection
+    
+    Args:
+        charset: charset parameter of the Content-Type header
+        head: First bytes of the body
+    
+    Returns:
+        BOM encoding, else header charset, else <meta charset>, else utf-8
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    header_codec = _codec(charset)
+    if header_codec:
+        return header_codec
+    match = _META_CHARSET.search(head[:SNIFF_BYTES])
+    meta_codec = _codec(match.group(1).decode('ascii')) if match else None
+    return meta_codec or 'utf-8'
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header
+    
+    Args:
+        value: Delay in seconds or an HTTP date
+    
+    Returns:
+        Seconds to wait (None if missing or invalid)
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _resolve_http2(http2: bool) -> bool:
+    """Fall back to HTTP/1.1 when HTTP/2 is requested but h2 is not installed"""
+    if http2 and not HTTP2_AVAILABLE:
+        print("[WebsiteConnector] HTTP/2 requested but 'h2' is not installed, using HTTP/1.1")
+        return False
+    return http2
+
+
+def build_client(
+    http2: bool = False,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY
+) -> httpx.AsyncClient:
+    """
+    Create an AsyncClient tuned for crawling
+    
+    Timeout, User-Agent and redirect policy are set per request, so one
+    client can serve connectors with different settings.
+    """
+    return httpx.AsyncClient(
+        http2=_resolve_http2(http2),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+    )
+
+
+def get_shared_client(http2: bool = False) -> httpx.AsyncClient:
+    """
+    Get the process-wide client for the running event loop
+    
+    Connection pools cannot move between event loops, so clients are kept
+    per loop; clients of closed loops are dropped on access.
+    """
+    loop = asyncio.get_running_loop()
+    http2 = _resolve_http2(http2)
+    
+    for key, (owner, _) in list(_shared_clients.items()):
+        if owner.is_closed():
+            del _shared_clients[key]
+    
+    key = (id(loop), http2)
+    entry = _shared_clients.get(key)
+    if entry is None or entry[1].is_closed:
+        entry = (loop, build_client(http2=http2))
+        _shared_clients[key] = entry
+    return entry[1]
+
+
+async def close_shared_clients():
+    """Close shared clients owned by the running event loop (application shutdown)"""
+    loop = asyncio.get_running_loop()
+    for key, (owner, client) in list(_shared_clients.items()):
+        if owner is loop:
+            del _shared_clients[key]
+            await client.aclose()
 
 
 class WebsiteConnector(BaseComponent):
     """
     Connector for fetching raw HTML from websites
     This is a Data Source - it only fetches, doesn't process
+    
+    Config:
+        shared_client: Use the process-wide keep-alive client (default True);
+                       False gives the connector a private client closed by aclose()
+        http2: Negotiate HTTP/2 where servers support it (requires 'h2')
+        max_connections / max_keepalive_connections: Limits of a private client
+        http_cache: Revalidate against the on-disk HTTP cache (default False)
+        http_cache_scope: 'agency' isolates cache entries per agency (default),
+                          'shared' shares them across agencies
+        allowed_content_types: Media types read (default: HTML); other responses
+                               are abandoned after the headers
+        max_body_bytes: Body bytes read per page (default 5 MB)
+        truncate_oversized: Keep the first max_body_bytes of larger pages (default
+                            True); False rejects them
+        max_retries: Retries of timeouts, network errors and retry_statuses (default 3)
+        retry_backoff: Base delay; retry n waits up to retry_backoff * 2^(n-1) (full jitter)
+        retry_max_delay: Longest wait; a longer Retry-After gives up instead
+        retry_statuses: HTTP statuses retried (default 429, 500, 502, 503, 504)
     """
     
-    def __init__(self, config: Optional[Dict[str, Any]] = None, mock_mode: bool = False):
+    CACHE_SCOPES = ('agency', 'shared')
+    
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        mock_mode: bool = False,
+        client: Optional[httpx.AsyncClient] = None,
+        http_cache: Optional[HTTPCache] = None
+    ):
+        """
+        Args:
+            config: Connector configuration
+            mock_mode: Return mock HTML instead of fetching
+            client: Externally owned client to use (not closed by aclose())
+            http_cache: Cache to use when http_cache is enabled (default: process-wide cache)
+        """
         super().__init__(config, mock_mode)
         self.timeout = self.config.get('timeout', 30)
         self.user_agent = self.config.get('user_agent', 'TeamAI-Bot/1.0')
         self.follow_redirects = self.config.get('follow_redirects', True)
         self.max_retries = self.config.get('max_retries', 3)
+        self.retry_backoff = self.config.get('retry_backoff', DEFAULT_RETRY_BACKOFF)
+        self.retry_max_delay = self.config.get('retry_max_delay', DEFAULT_RETRY_MAX_DELAY)
+        self.retry_statuses = frozenset(self.config.get('retry_statuses', DEFAULT_RETRY_STATUSES))
+        self.http2 = self.config.get('http2', False)
+        self.shared_client = self.config.get('shared_client', True)
+        self.http_cache_enabled = self.config.get('http_cache', False)
+        self.http_cache_scope = self.config.get('http_cache_scope', 'agency')
+        self.allowed_content_types = frozenset(
+            media_type.lower() for media_type in self.config.get('allowed_content_types', DEFAULT_CONTENT_TYPES)
+        )
+        self.max_body_bytes = self.config.get('max_body_bytes', DEFAULT_MAX_BODY_BYTES)
+        self.truncate_oversized = self.config.get('truncate_oversized', True)
+        self._client = client
+        self._owns_client = False
+        self._http_cache = http_cache
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client (created on first use)"""
+        if self._client is None or (self._owns_client and self._client.is_closed):
+            if self.shared_client:
+                return get_shared_client(self.http2)
+            self._client = build_client(
+                http2=self.http2,
+                max_connections=self.config.get('max_connections', DEFAULT_MAX_CONNECTIONS),
+                max_keepalive_connections=self.config.get(
+                    'max_keepalive_connections', DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+                )
+            )
+            self._owns_client = True
+        return self._client
+    
+    @property
+    def http_cache(self) -> Optional[HTTPCache]:
+        """HTTP cache (None when disabled)"""
+        if not self.http_cache_enabled:
+            return None
+        if self._http_cache is None:
+            self._http_cache = get_http_cache()
+        return self._http_cache
+    
+    def _cache_namespace(self) -> Optional[str]:
+        """Cache namespace of the current execution (agency ID, None = shared)"""
+        if self.http_cache_scope == 'shared':
+            return None
+        return get_tenant()
+    
+    async def aclose(self):
+        """Close the connector's private client (shared and injected clients are left open)"""
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._owns_client = False
     
     def validate_config(self) -> bool:
         """Validate connector configuration"""
@@ -34,17 +284,29 @@ class WebsiteConnector(BaseComponent):
             return False
         if self.max_retries < 0:
             return False
+        if self.retry_backoff < 0 or self.retry_max_delay < 0:
+            return False
+        if self.http_cache_scope not in self.CACHE_SCOPES:
+            return False
+        if self.max_body_bytes < 1:
+            return False
         return True
     
-    async def execute(self, url: str) -> Dict[str, Any]:
+    async def execute(self, url: str, content_types: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """
         Fetch raw HTML content from URL
         
+        The body is streamed: responses whose Content-Type is not allowed are
+        abandoned after the headers, and at most max_body_bytes are read.
+        
         Args:
             url: Target URL to fetch
+            content_types: Accepted media types, overriding allowed_content_types
+                           (empty = accept any, e.g. robots.txt)
             
         Returns:
-            Dict with raw HTML and metadata
+            Dict with raw HTML and metadata ('truncated' when the body was cut at
+            max_body_bytes)
         """
         if self.mock_mode:
             return self._mock_fetch(url)
@@ -52,37 +314,242 @@ class WebsiteConnector(BaseComponent):
         if not self.validate_config():
             raise ValueError("Invalid connector configuration")
         
-        async with httpx.AsyncClient(
-            timeout=self.timeout,
-            headers={'User-Agent': self.user_agent},
-            follow_redirects=self.follow_redirects
-        ) as client:
+        cache = self.http_cache
+        namespace = self._cache_namespace()
+        headers = {'User-Agent': self.user_agent}
+        cached = None
+        if cache is not None:
+            cached = await asyncio.to_thread(cache.lookup, url, namespace)
+            if cached:
+                if cached.get('etag'):
+                    headers['If-None-Match'] = cached['etag']
+                if cached.get('last_modified'):
+                    headers['If-Modified-Since'] = cached['last_modified']
+        
+        allowed = self.allowed_content_types if content_types is None else frozenset(content_types)
+        attempt = 0
+        while True:
+            attempt += 1
+            retry_after = None
             try:
-                response = await client.get(url)
-                response.raise_for_status()
-                
-                return {
-                    'url': str(response.url),  # Final URL after redirects
-                    'status_code': response.status_code,
-                    'html': response.text,
-                    'headers': dict(response.headers),
-                    'encoding': response.encoding,
-                    'elapsed_ms': int(response.elapsed.total_seconds() * 1000)
-                }
+                started = time.perf_counter()
+                result = await self._fetch(url, headers, allowed, cached, namespace, started)
+                if result is None:
+                    # Cache entry evicted since lookup: fetch unconditionally
+                    headers.pop('If-None-Match', None)
+                    headers.pop('If-Modified-Since', None)
+                    result = await self._fetch(url, headers, allowed, None, namespace, started)
+                result['attempts'] = attempt
+                return result
             except httpx.HTTPStatusError as e:
-                return {
-                    'url': url,
-                    'status_code': e.response.status_code,
-                    'error': f'HTTP {e.response.status_code}',
-                    'html': None
-                }
+                status = e.response.status_code
+                result = {'url': url, 'status_code': status, 'error': f'HTTP {status}', 'html': None}
+                retryable = status in self.retry_statuses
+                retry_after = parse_retry_after(e.response.headers.get('retry-after'))
+            except (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError) as e:
+                result = {'url': url, 'status_code': 0, 'error': str(e) or type(e).__name__, 'html': None}
+                retryable = True
             except Exception as e:
-                return {
-                    'url': url,
-                    'status_code': 0,
-                    'error': str(e),
-                    'html': None
-                }
+                result = {'url': url, 'status_code': 0, 'error': str(e), 'html': None}
+                retryable = False
+            
+            result['attempts'] = attempt
+            delay = self._retry_delay(attempt, retry_after) if retryable and attempt <= self.max_retries else None
+            if delay is None:
+                return result
+            self.emit_event('fetch_retry', url=url, attempt=attempt, error=result['error'], delay=round(delay, 3))
+            await asyncio.sleep(delay)
+    
+    def _retry_delay(self, attempt: int, retry_after: Optional[float]) -> Optional[float]:
+        """
+        Seconds to wait before retrying after failed attempt number `attempt`
+        
+        Returns:
+            Delay, or None to give up (Retry-After beyond retry_max_delay, or
+            not enough node budget left to wait)
+        """
+        delay = random.uniform(0, self.retry_backoff * 2 ** (attempt - 1))
+        if retry_after is not None:
+            if retry_after > self.retry_max_delay:
+                return None
+            delay = max(delay, retry_after)
+        delay = min(delay, self.retry_max_delay)
+        remaining = self.remaining_time()
+        if remaining is not None and delay >= remaining:
+            return None
+        return delay
+    
+    async def _fetch(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        allowed: frozenset,
+        cached: Optional[Dict[str, Any]],
+        namespace: Optional[str],
+        started: float
+    ) -> Optional[Dict[str, Any]]:
+        """
+        One streamed request
+        
+        Returns:
+            Fetch result, or None if a 304 arrived but the cache entry is gone
+        
+        Raises:
+            httpx.HTTPStatusError: On 4xx/5xx responses
+        """
+        async with self.client.stream(
+            'GET',
+            url,
+            headers=headers,
+            timeout=self.timeout,
+            follow_redirects=self.follow_redirects
+        ) as response:
+            if response.status_code == 304 and cached:
+                entry = await asyncio.to_thread(self.http_cache.load, url, namespace)
+                return None if entry is None else self._cached_result(entry, response, started)
+            
+            response.raise_for_status()
+            
+            # Gate on headers before reading any of the body
+            media_type = response.headers.get('content-type', '').split(';', 1)[0].strip().lower()
+            if allowed and media_type and media_type not in allowed:
+                return self._rejected(response, f'Unsupported content type: {media_type}')
+            declared = response.headers.get('content-length', '')
+            if not self.truncate_oversized and declared.isdigit() and int(declared) > self.max_body_bytes:
+                return self._rejected(response, f'Body exceeds {self.max_body_bytes} bytes')
+            
+            content, html, encoding, truncated = await self._read_body(response)
+            if truncated and not self.truncate_oversized:
+                return self._rejected(response, f'Body exceeds {self.max_body_bytes} bytes')
+        
+        cache = self.http_cache
+        if cache is not None and not truncated and response.status_code == 200 and self._cacheable(response):
+            await asyncio.to_thread(cache.store, url, {
+                'url': str(response.url),
+                'status_code': response.status_code,
+                'etag': response.headers.get('etag'),
+                'last_modified': response.headers.get('last-modified'),
+                'encoding': encoding,
+                'headers': dict(response.headers)
+            }, content, namespace)
+        
+        return {
+            'url': str(response.url),  # Final URL after redirects
+            'status_code': response.status_code,
+            'html': html,
+            'content': content,
+            'headers': dict(response.headers),
+            'encoding': encoding,
+            'elapsed_ms': int((time.perf_counter() - started) * 1000),
+            'http_version': response.http_version,
+            'from_cache': False,
+            'truncated': truncated
+        }
+    
+    async def _read_body(self, response: httpx.Response) -> Tuple[bytes, str, str, bool]:
+        """
+        Read at most max_body_bytes, decoding while chunks arrive
+        
+        The charset is picked once from the Content-Type header, a BOM or a
+        <meta charset> in the first SNIFF_BYTES, falling back to UTF-8 (no
+        statistical charset detection).
+        
+        Returns:
+            (raw bytes, decoded text, encoding, truncated)
+        """
+        chunks = []
+        parts = []
+        size = 0
+        truncated = False
+        decoder = None
+        encoding = None
+        
+        async for chunk in response.aiter_bytes():
+            if size + len(chunk) > self.max_body_bytes:
+                chunk = chunk[:self.max_body_bytes - size]
+                truncated = True
+            chunks.append(chunk)
+            size += len(chunk)
+            if decoder is not None:
+                parts.append(decoder.decode(chunk))
+            elif size >= SNIFF_BYTES or truncated:
+                head = b''.join(chunks)
+                encoding = detect_encoding(response.charset_encoding, head)
+                decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+                parts.append(decoder.decode(head))
+            if truncated:
+                break
+        
+        content = b''.join(chunks)
+        if decoder is None:
+            encoding = detect_encoding(response.charset_encoding, content)
+            decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            parts.append(decoder.decode(content))
+        parts.append(decoder.decode(b'', final=True))
+        return content, ''.join(parts), encoding, truncated
+    
+    @staticmethod
+    def _rejected(response: httpx.Response, error: str) -> Dict[str, Any]:
+        """Result for a response abandoned without reading its body"""
+        return {
+            'url': str(response.url),
+            'status_code': response.status_code,
+            'error': error,
+            'html': None,
+            'headers': dict(response.headers)
+        }
+    
+    async def stream(self, url: str) -> AsyncIterator[bytes]:
+        """
+        Stream response body in chunks (content-encoding decoded)
+        
+        Wrap in contextlib.aclosing() when the body may not be read to the end,
+        so the connection is released.
+        
+        Args:
+            url: Target URL
+        
+        Raises:
+            httpx.HTTPError: On connection errors and non-2xx responses
+        """
+        async with self.client.stream(
+            'GET',
+            url,
+            headers={'User-Agent': self.user_agent},
+            timeout=self.timeout,
+            follow_redirects=self.follow_redirects
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                yield chunk
+    
+    @staticmethod
+    def _cacheable(response: httpx.Response) -> bool:
+        """Response has a validator and may be stored"""
+        if 'no-store' in response.headers.get('cache-control', '').lower():
+            return False
+        return 'etag' in response.headers or 'last-modified' in response.headers
+    
+    def _cached_result(
+        self,
+        entry: Tuple[Dict[str, Any], bytes],
+        response: httpx.Response,
+        started: float
+    ) -> Dict[str, Any]:
+        """Build fetch result from a cache entry revalidated by a 304 response"""
+        header, content = entry
+        encoding = header.get('encoding') or 'utf-8'
+        return {
+            'url': header['url'],
+            'status_code': header['status_code'],
+            'html': content.decode(encoding, errors='replace'),
+            'content': content,
+            'headers': header.get('headers', {}),
+            'encoding': encoding,
+            'elapsed_ms': int((time.perf_counter() - started) * 1000),
+            'http_version': response.http_version,
+            'from_cache': True
+        }
     
     def _mock_fetch(self, url: str) -> Dict[str, Any]:
         """Return mock HTML for testing"""
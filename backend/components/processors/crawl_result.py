@@ -0,0 +1,184 @@
+"""
+Compact Crawl Results
+Space-efficient WebCrawler output for large crawls
+
+Every crawled page links to mostly the same URLs (navigation, footer), so
+the standard output repeats each absolute URL string once per page, and
+every page dict repeats the same keys. The compact form stores each URL
+once in a site-level table and pages as rows of field values with integer
+link indices:
+
+    {
+        'format': 'compact',
+        'urls': ['https://example.com/', 'https://example.com/about', ...],
+        'page_fields': ['url', 'status_code', 'title', ..., 'links', ...],
+        'pages': [[0, 200, 'Home', ..., [1, 2, 5], ...], ...],
+        'total_pages': 2,
+        ...
+    }
+
+The result is plain JSON (it goes through execution_state, caches and task
+storage unchanged). expand_crawl() restores the standard output exactly.
+"""
+from array import array
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional
+
+COMPACT_FORMAT = 'compact'
+
+
+class URLTable:
+    """Interned URL strings addressed by integer index"""
+    
+    __slots__ = ('urls', '_index')
+    
+    def __init__(self, urls: Optional[List[str]] = None):
+        self.urls: List[str] = []
+        self._index: Dict[str, int] = {}
+        for url in urls or []:
+            self.intern(url)
+    
+    def intern(self, url: str) -> int:
+        """Index of url (added on first use)"""
+        index = self._index.get(url)
+        if index is None:
+            index = self._index[url] = len(self.urls)
+            self.urls.append(url)
+        return index
+    
+    def __getitem__(self, index: int) -> str:
+        return self.urls[index]
+    
+    def __len__(self) -> int:
+        return len(self.urls)
+
+
+@dataclass(slots=True)
+class PageRecord:
+    """One crawled page with URLs replaced by URLTable indices"""
+    
+    url: int
+    status_code: int
+    title: Optional[str] = ''
+    meta_description: str = ''
+    meta_keywords: str = ''
+    h1_tags: List[str] = field(default_factory=list)
+    h2_tags: List[str] = field(default_factory=list)
+    word_count: int = 0
+    links: array = field(default_factory=lambda: array('I'))
+    images: int = 0
+    fingerprint: Optional[str] = ''
+    depth: int = 0
+    elapsed_ms: int = 0
+    from_cache: bool = False
+    # url/title/meta_description of near-duplicate pages collapsed into this one
+    duplicates: List[Dict[str, Any]] = field(default_factory=list)
+    
+    @classmethod
+    def from_page(cls, page: Dict[str, Any], urls: URLTable) -> 'PageRecord':
+        """Build record from a standard page dict, interning its URLs"""
+        values = {name: page[name] for name in PAGE_FIELDS if name in page}
+        values['url'] = urls.intern(page['url'])
+        values['links'] = array('I', (urls.intern(link) for link in page.get('links', ())))
+        return cls(**values)
+    
+    def to_row(self) -> List[Any]:
+        """Field values in PAGE_FIELDS order (JSON-serializable)"""
+        return [
+            list(value) if isinstance(value, array) else value
+            for value in (getattr(self, name) for name in PAGE_FIELDS)
+        ]
+    
+    def to_page(self, urls: URLTable) -> Dict[str, Any]:
+        """Standard page dict with URLs resolved"""
+        page = {name: getattr(self, name) for name in PAGE_FIELDS}
+        page['url'] = urls[self.url]
+        page['links'] = [urls[index] for index in self.links]
+        return page
+
+
+PAGE_FIELDS = tuple(f.name for f in fields(PageRecord))
+
+
+class CompactCrawlBuilder:
+    """Converts pages of one crawl to PageRecords over a shared URLTable"""
+    
+    def __init__(self):
+        self.urls = URLTable()
+    
+    def record(self, page: Dict[str, Any]) -> PageRecord:
+        """Convert a standard page dict (as soon as it is crawled)"""
+        return PageRecord.from_page(page, self.urls)
+    
+    def build(self, records: List[PageRecord], **summary: Any) -> Dict[str, Any]:
+        """
+        Compact crawl output
+        
+        Args:
+            records: Page records in output order
+            **summary: Other crawl output fields (total_pages, base_url, ...);
+                       visited_urls is dropped (it repeats the page URLs)
+        
+        Returns:
+            Compact output dict
+        """
+        summary.pop('visited_urls', None)
+        return {
+            'format': COMPACT_FORMAT,
+            'urls': self.urls.urls,
+            'page_fields': list(PAGE_FIELDS),
+            'pages': [record.to_row() for record in records],
+            **summary
+        }
+
+
+def compact_crawl(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert standard WebCrawler output to the compact form
+    
+    Args:
+        result: Standard crawl output (compact input is returned unchanged)
+    
+    Returns:
+        Compact output
+    """
+    if is_compact(result):
+        return result
+    builder = CompactCrawlBuilder()
+    records = [builder.record(page) for page in result.get('pages', [])]
+    return builder.build(records, **{key: value for key, value in result.items() if key != 'pages'})
+
+
+def expand_crawl(result: Any) -> Any:
+    """
+    Restore standard WebCrawler output from the compact form
+    
+    Args:
+        result: Crawl output (anything that is not compact is returned unchanged)
+    
+    Returns:
+        Output with page dicts, absolute link lists and visited_urls
+    """
+    if not is_compact(result):
+        return result
+    urls = result['urls']
+    names = result['page_fields']
+    pages = []
+    for row in result['pages']:
+        page = dict(zip(names, row))
+        page['url'] = urls[page['url']]
+        page['links'] = [urls[index] for index in page.get('links', ())]
+        pages.append(page)
+    
+    expanded = {
+        key: value for key, value in result.items()
+        if key not in ('format', 'urls', 'page_fields', 'pages')
+    }
+    expanded['pages'] = pages
+    expanded['visited_urls'] = [page['url'] for page in pages]
+    return expanded
+
+
+def is_compact(result: Any) -> bool:
+    """Check whether result is compact crawl output"""
+    return isinstance(result, dict) and result.get('format') == COMPACT_FORMAT
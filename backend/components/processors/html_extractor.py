@@ -0,0 +1,310 @@
+"""
+HTML Extractors
+Pluggable SEO field extraction for WebCrawler
+
+Both extractors return the same fields (title, meta description/keywords,
+h1/h2 text, absolute links, image count, word count, SimHash fingerprint
+of the main content text when enabled, '' otherwise):
+- BeautifulSoupExtractor builds a full tree and queries it (reference implementation)
+- LxmlExtractor collects everything in one pass over lxml parser events,
+  without building a tree (default; several times faster on large pages)
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional, Type
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+from components.processors.near_duplicates import simhash
+
+# Site chrome repeated on every page: left out of fingerprints, so pages are
+# compared by their main content only
+BOILERPLATE_TAGS = ('nav', 'header', 'footer', 'aside')
+
+
+class HTMLExtractor(ABC):
+    """Extracts SEO fields from an HTML document"""
+    
+    def __init__(self, fingerprint: bool = False):
+        """
+        Args:
+            fingerprint: Compute the SimHash fingerprint of the main content text
+                         (for near-duplicate detection; costs more than parsing)
+        """
+        self.fingerprint = fingerprint
+    
+    @abstractmethod
+    def extract(self, html: str, base_url: str) -> Dict[str, Any]:
+        """
+        Extract page fields
+        
+        Args:
+            html: Page HTML
+            base_url: Page URL (relative links are resolved against it)
+        
+        Returns:
+            Dict with title, meta_description, meta_keywords, h1_tags,
+            h2_tags, word_count, links, images and fingerprint
+        """
+        pass
+
+
+class BeautifulSoupExtractor(HTMLExtractor):
+    """Tree-based extraction with BeautifulSoup (lxml tree builder)"""
+    
+    def extract(self, html: str, base_url: str) -> Dict[str, Any]:
+        soup = BeautifulSoup(html, 'lxml')
+        fields = {
+            'title': soup.title.string if soup.title else '',
+            'meta_description': self._extract_meta(soup, 'description'),
+            'meta_keywords': self._extract_meta(soup, 'keywords'),
+            'h1_tags': [h1.get_text(strip=True) for h1 in soup.find_all('h1')],
+            'h2_tags': [h2.get_text(strip=True) for h2 in soup.find_all('h2')],
+            'word_count': len(soup.get_text().split()),
+            'links': self._extract_links(soup, base_url),
+            'images': len(soup.find_all('img')),
+            'fingerprint': ''
+        }
+        if self.fingerprint:
+            # Main content only: drop the site chrome (the tree is not used afterwards)
+            for tag in soup.find_all(BOILERPLATE_TAGS):
+                tag.decompose()
+            fields['fingerprint'] = simhash(soup.get_text().split())
+        return fields
+    
+    def _extract_meta(self, soup: BeautifulSoup, name: str) -> str:
+        """Extract meta tag content"""
+        tag = soup.find('meta', attrs={'name': name}) or soup.find('meta', attrs={'property': f'og:{name}'})
+        return tag.get('content', '') if tag else ''
+    
+    def _extract_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
+        """Extract all links from page"""
+        links = []
+        for a in soup.find_all('a', href=True):
+            href = a['href']
+            # Convert relative URLs to absolute
+            absolute_url = urljoin(base_url, href)
+            if absolute_url.startswith('http'):
+                links.append(absolute_url)
+        return links
+
+
+class _SinglePassTarget:
+    """
+    lxml parser target collecting all fields while the document streams by
+    
+    Adjacent data() chunks are merged into one text node before use, since
+    libxml2 may split a text node (e.g. around entities) and per-node
+    stripping must match BeautifulSoup's get_text(strip=True).
+    """
+    
+    # Text inside these elements is not page text (BeautifulSoup stores it
+    # as Script/Stylesheet/TemplateString/Ruby* strings, which get_text() skips)
+    SKIP_TEXT = frozenset({'script', 'style', 'template', 'rt', 'rp'})
+    
+    def __init__(self, base_url: str, fingerprint: bool = False):
+        self.base_url = base_url
+        self.fingerprint = fingerprint
+        # First <title> as a small tree of strings/child lists, to reproduce Tag.string
+        self.title_root: Optional[List[Any]] = None
+        self.title_stack: List[List[Any]] = []
+        self.meta: Dict[str, str] = {}
+        self.headings: Dict[str, List[str]] = {'h1': [], 'h2': []}
+        self.open_headings: List[List[Any]] = []  # [tag, text parts, result index]
+        self.links: List[str] = []
+        self.images = 0
+        self.words: List[str] = []
+        self.skip_depth = 0
+        self.pending: List[str] = []
+        self.mid_word = False
+        # Words outside BOILERPLATE_TAGS (fingerprinted text)
+        self.content_words: List[str] = []
+        self.boilerplate_depth = 0
+        self.content_mid_word = False
+    
+    def _flush(self):
+        """Process the text node accumulated since the last element event"""
+        if not self.pending:
+            return
+        text = ''.join(self.pending)
+        self.pending = []
+        if self.title_stack:
+            self.title_stack[-1].append(text)
+        if self.skip_depth:
+            return
+        
+        self.mid_word = self._add_words(self.words, text, self.mid_word)
+        if self.fingerprint and not self.boilerplate_depth:
+            self.content_mid_word = self._add_words(self.content_words, text, self.content_mid_word)
+        
+        stripped = text.strip()
+        if stripped:
+            for heading in self.open_headings:
+                heading[1].append(stripped)
+    
+    @staticmethod
+    def _add_words(words: List[str], text: str, mid_word: bool) -> bool:
+        """
+        Append the words of a text node to the concatenated text's words
+        
+        A word may span nodes: mid_word tells whether the text so far ends
+        inside a word. Returns the updated mid_word.
+        """
+        new_words = text.split()
+        if new_words and mid_word and not text[0].isspace():
+            words[-1] += new_words.pop(0)  # continues the previous node's last word
+        words.extend(new_words)
+        return not text[-1].isspace() if text.strip() else mid_word and not text
+    
+    def start(self, tag, attrib):
+        self._flush()
+        if self.title_stack:
+            child: List[Any] = []
+            self.title_stack[-1].append(child)
+            self.title_stack.append(child)
+        elif tag == 'title' and self.title_root is None:
+            self.title_root = []
+            self.title_stack = [self.title_root]
+        
+        if tag in BOILERPLATE_TAGS:
+            self.boilerplate_depth += 1
+        
+        if tag in self.SKIP_TEXT:
+            self.skip_depth += 1
+        elif tag == 'meta':
+            content = attrib.get('content', '')
+            name = attrib.get('name')
+            if name in ('description', 'keywords'):
+                self.meta.setdefault(name, content)
+            prop = attrib.get('property')
+            if prop in ('og:description', 'og:keywords'):
+                self.meta.setdefault(prop, content)
+        elif tag in ('h1', 'h2'):
+            # Reserve the slot now so headings keep start-tag (document) order
+            self.headings[tag].append('')
+            self.open_headings.append([tag, [], len(self.headings[tag]) - 1])
+        elif tag == 'a':
+            href = attrib.get('href')
+            if href is not None:
+                absolute_url = urljoin(self.base_url, href)
+                if absolute_url.startswith('http'):
+                    self.links.append(absolute_url)
+        elif tag == 'img':
+            self.images += 1
+    
+    def end(self, tag):
+        self._flush()
+        if self.title_stack:
+            self.title_stack.pop()
+        
+        if tag in BOILERPLATE_TAGS:
+            self.boilerplate_depth = max(0, self.boilerplate_depth - 1)
+        
+        if tag in self.SKIP_TEXT:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag in ('h1', 'h2'):
+            # Close the innermost open heading of this kind
+            for index in range(len(self.open_headings) - 1, -1, -1):
+                if self.open_headings[index][0] == tag:
+                    _, parts, slot = self.open_headings.pop(index)
+                    self.headings[tag][slot] = ''.join(parts)
+                    break
+    
+    def data(self, data):
+        self.pending.append(data)
+    
+    def comment(self, text):
+        self._flush()
+        if self.title_stack:
+            self.title_stack[-1].append(text)  # Comments are strings to Tag.string
+    
+    def pi(self, target, data=None):
+        self._flush()
+    
+    @classmethod
+    def _string(cls, children: List[Any]) -> Optional[str]:
+        """BeautifulSoup Tag.string: the only child string, recursing through single children"""
+        if len(children) != 1:
+            return None
+        child = children[0]
+        return child if isinstance(child, str) else cls._string(child)
+    
+    def close(self) -> Dict[str, Any]:
+        self._flush()
+        # Headings still open at EOF
+        for tag, parts, slot in self.open_headings:
+            self.headings[tag][slot] = ''.join(parts)
+        self.open_headings = []
+        
+        return {
+            'title': self._string(self.title_root) if self.title_root is not None else '',
+            'meta_description': self.meta.get('description', self.meta.get('og:description', '')),
+            'meta_keywords': self.meta.get('keywords', self.meta.get('og:keywords', '')),
+            'h1_tags': self.headings['h1'],
+            'h2_tags': self.headings['h2'],
+            'word_count': len(self.words),
+            'links': self.links,
+            'images': self.images,
+            'fingerprint': simhash(self.content_words) if self.fingerprint else ''
+        }
+
+
+class LxmlExtractor(HTMLExtractor):
+    """Single-pass extraction driven by lxml's HTML parser events (no tree)"""
+    
+    def extract(self, html: str, base_url: str) -> Dict[str, Any]:
+        target = _SinglePassTarget(base_url, self.fingerprint)
+        if not html or not html.strip():
+            return target.close()
+        parser = etree.HTMLParser(target=target)
+        parser.feed(html)
+        return parser.close()
+
+
+# Extractors selectable with the WebCrawler 'extractor' config key
+EXTRACTORS: Dict[str, Type[HTMLExtractor]] = {
+    'lxml': LxmlExtractor,
+    'beautifulsoup': BeautifulSoupExtractor
+}
+
+
+def extract_html(
+    extractor_name: str,
+    content: bytes,
+    encoding: Optional[str],
+    base_url: str,
+    fingerprint: bool = False
+) -> Dict[str, Any]:
+    """
+    Decode and extract a page (module-level so ParsePool workers can run it)
+    
+    Args:
+        extractor_name: Key in EXTRACTORS
+        content: Raw response body
+        encoding: Response charset (default: utf-8)
+        base_url: Page URL
+        fingerprint: Compute the text fingerprint
+    
+    Returns:
+        Extracted page fields
+    """
+    html = content.decode(encoding or 'utf-8', errors='replace')
+    return get_extractor(extractor_name, fingerprint).extract(html, base_url)
+
+
+def get_extractor(name: str = 'lxml', fingerprint: bool = False) -> HTMLExtractor:
+    """
+    Get extractor by name
+    
+    Args:
+        name: Key in EXTRACTORS
+        fingerprint: Compute text fingerprints (see HTMLExtractor)
+    
+    Raises:
+        ValueError: If name is not registered in EXTRACTORS
+    """
+    try:
+        return EXTRACTORS[name](fingerprint)
+    except KeyError:
+        raise ValueError(f"Unknown extractor: {name}. Valid: {list(EXTRACTORS)}")
@@ -13,12 +13,14 @@ backend_path = Path(__file__).parent.parent.parent
 if str(backend_path) not in sys.path:
     sys.path.insert(0, str(backend_path))
 
-from components.base import BaseComponent
+from components.base import BaseComponent, get_event_sink
 
 
 class LLMProcessor(BaseComponent):
     """Process text with LLM (Groq API)"""
     
+    RUNTIME_CONFIG_KEYS = ('prompt_template', 'system_message')
+    
     # Model pricing (per 1M tokens)
     PRICING = {
         'llama-3.1-8b-instant': {'input': 0.05, 'output': 0.08},
@@ -31,6 +33,8 @@ class LLMProcessor(BaseComponent):
         self.fallback_model = self.config.get('fallback_model', 'llama-3.3-70b-versatile')
         self.temperature = self.config.get('temperature', 0.2)
         self.max_tokens = self.config.get('max_tokens', 2048)
+        # Expected generation speed, used to fit max_tokens into the node's time budget
+        self.tokens_per_second = self.config.get('tokens_per_second', 250)
         self.api_key = self.config.get('api_key') or os.getenv('GROQ_API_KEY')
         
         if not self.mock_mode and self.api_key:
@@ -38,6 +42,11 @@ class LLMProcessor(BaseComponent):
         else:
             self.client = None
     
+    async def aclose(self):
+        """Close the Groq client's connection pool"""
+        if self.client is not None:
+            self.client.close()
+    
     def validate_config(self) -> bool:
         """Validate LLM configuration"""
         if not self.mock_mode and not self.api_key:
@@ -60,7 +69,9 @@ class LLMProcessor(BaseComponent):
             Dict with response and metadata
         """
         if self.mock_mode:
-            return self._mock_process(prompt)
+            response = self._mock_process(prompt)
+            self.emit_event('llm_token', model=self.model, delta=response['content'])
+            return response
         
         if not self.validate_config():
             raise ValueError("Invalid LLM configuration - missing API key")
@@ -87,9 +98,16 @@ class LLMProcessor(BaseComponent):
                 raise Exception(f"Both models failed. Primary: {str(e)}, Fallback: {str(fallback_error)}")
     
     async def _call_groq(self, messages: List[Dict], model: str) -> Dict[str, Any]:
-        """Call Groq API"""
+        """Call Groq API (streams token deltas when a caller is listening)"""
         import asyncio
         
+        sink = get_event_sink()
+        if sink is not None:
+            return await self._call_groq_stream(messages, model, sink)
+        
+        # Read the time budget here - executor threads don't see the caller's context
+        max_tokens = self._budget_max_tokens()
+        
         # Groq client is sync, so we run it in executor
         loop = asyncio.get_event_loop()
         response = await loop.run_in_executor(
@@ -98,7 +116,7 @@ class LLMProcessor(BaseComponent):
                 model=model,
                 messages=messages,
                 temperature=self.temperature,
-                max_tokens=self.max_tokens
+                max_tokens=max_tokens
             )
         )
         
@@ -119,6 +137,63 @@ class LLMProcessor(BaseComponent):
             'fallback_used': False
         }
     
+    async def _call_groq_stream(self, messages: List[Dict], model: str, sink) -> Dict[str, Any]:
+        """Call Groq API with stream=True, forwarding content deltas to sink"""
+        import asyncio
+        
+        loop = asyncio.get_event_loop()
+        component = self.__class__.__name__
+        max_tokens = self._budget_max_tokens()
+        
+        def consume():
+            stream = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=self.temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            parts = []
+            usage = None
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    # Sink lives on the event loop, not in this worker thread
+                    loop.call_soon_threadsafe(sink, {
+                        'event': 'llm_token', 'component': component, 'model': model, 'delta': delta
+                    })
+                # Groq reports usage on the final chunk
+                x_groq = getattr(chunk, 'x_groq', None)
+                if x_groq is not None and getattr(x_groq, 'usage', None):
+                    usage = x_groq.usage
+            return ''.join(parts), usage
+        
+        content, usage = await loop.run_in_executor(None, consume)
+        
+        input_tokens = usage.prompt_tokens if usage else 0
+        output_tokens = usage.completion_tokens if usage else 0
+        cost = self._calculate_cost(model, input_tokens, output_tokens)
+        
+        return {
+            'content': content,
+            'model': model,
+            'usage': {
+                'input_tokens': input_tokens,
+                'output_tokens': output_tokens,
+                'total_tokens': usage.total_tokens if usage else 0
+            },
+            'cost': cost,
+            'fallback_used': False
+        }
+    
+    def _budget_max_tokens(self) -> int:
+        """max_tokens shrunk to what can be generated before the node deadline"""
+        remaining = self.remaining_time()
+        if remaining is None:
+            return self.max_tokens
+        return max(1, min(self.max_tokens, int(remaining * self.tokens_per_second)))
+    
     def _calculate_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
         """Calculate API cost in USD"""
         pricing = self.PRICING.get(model, self.PRICING['llama-3.1-8b-instant'])
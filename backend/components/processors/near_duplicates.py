@@ -0,0 +1,157 @@
+"""
+Near-Duplicate Pages
+SimHash fingerprints of page text and clustering of near-identical pages
+
+Template-driven sites (product variants, tag archives, paginated listings)
+produce many pages whose main content differs in a few words. Each page gets
+a 64-bit SimHash over the word shingles of its main content (site chrome
+excluded, see html_extractor) during extraction; pages whose fingerprints
+differ in at most max_distance bits are clustered, and a crawl keeps one
+representative page per cluster:
+
+    kept, clusters = collapse_near_duplicates(pages, fingerprints)
+    # clusters: {index of representative: [indices of collapsed pages]}
+"""
+import hashlib
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple, TypeVar
+
+FINGERPRINT_BITS = 64
+DEFAULT_SHINGLE_SIZE = 3
+# Unrelated pages differ in ~32 bits, but distinct short pages can share a
+# large fraction of their shingles, so the default stays tight: variants
+# differing in a word or two per thousand are mostly within 3 bits
+DEFAULT_MAX_DISTANCE = 3
+
+T = TypeVar('T')
+
+# Per-bit feature counts are summed as one big integer with a 32-bit lane per
+# fingerprint bit; _SPREAD[position][byte] holds a digest byte's bits as lanes
+_LANE = 32
+_BYTE_LANES = [
+    sum(1 << (bit * _LANE) for bit in range(8) if byte >> bit & 1)
+    for byte in range(256)
+]
+_SPREAD = [
+    [lanes << (position * 8 * _LANE) for lanes in _BYTE_LANES]
+    for position in range(FINGERPRINT_BITS // 8)
+]
+_LANE_MASK = (1 << _LANE) - 1
+
+
+def simhash(words: Sequence[str], shingle_size: int = DEFAULT_SHINGLE_SIZE) -> str:
+    """
+    SimHash of a text
+    
+    Args:
+        words: Text split into words
+        shingle_size: Words per feature (consecutive word n-grams)
+    
+    Returns:
+        16-digit hex fingerprint ('' for empty text)
+    """
+    if not words:
+        return ''
+    words = [word.lower() for word in words]
+    features = {
+        ' '.join(words[index:index + shingle_size])
+        for index in range(max(1, len(words) - shingle_size + 1))
+    }
+    
+    digests = b''.join(hashlib.blake2b(feature.encode(), digest_size=8).digest() for feature in features)
+    # Histogram each digest byte position instead of visiting every feature's bits
+    counts = 0
+    for position, spread in enumerate(_SPREAD):
+        for byte, occurrences in Counter(digests[position::8]).items():
+            counts += spread[byte] * occurrences
+    
+    # Bit is set where most features have it set
+    half = len(features) / 2
+    fingerprint = 0
+    for bit in range(FINGERPRINT_BITS):
+        if (counts >> (bit * _LANE) & _LANE_MASK) > half:
+            fingerprint |= 1 << bit
+    return f'{fingerprint:016x}'
+
+
+def hamming_distance(a: str, b: str) -> int:
+    """Number of differing bits between two fingerprints"""
+    return (int(a, 16) ^ int(b, 16)).bit_count()
+
+
+def cluster_fingerprints(
+    fingerprints: Sequence[Optional[str]],
+    max_distance: int = DEFAULT_MAX_DISTANCE
+) -> List[List[int]]:
+    """
+    Group near-identical fingerprints
+    
+    Leader clustering in input order: a fingerprint joins the first earlier
+    representative within max_distance bits, otherwise it starts a cluster.
+    Candidates are found through max_distance + 1 bit blocks (two fingerprints
+    within max_distance bits agree exactly on at least one block).
+    
+    Args:
+        fingerprints: SimHash per item (empty/None = never clustered)
+        max_distance: Maximum differing bits within a cluster
+    
+    Returns:
+        Clusters as lists of item indices, each starting with its representative
+    """
+    blocks = max_distance + 1
+    bounds = [(FINGERPRINT_BITS * i // blocks, FINGERPRINT_BITS * (i + 1) // blocks) for i in range(blocks)]
+    buckets: Dict[Tuple[int, int], List[int]] = {}  # (block, block value) -> leader values
+    leader_of: Dict[int, int] = {}  # fingerprint value -> leader value
+    clusters: Dict[int, List[int]] = {}  # leader value -> item indices
+    singles: List[List[int]] = []
+    
+    for index, fingerprint in enumerate(fingerprints):
+        if not fingerprint:
+            singles.append([index])
+            continue
+        value = int(fingerprint, 16)
+        leader = leader_of.get(value)
+        if leader is None:
+            keys = [(block, (value >> low) & ((1 << (high - low)) - 1)) for block, (low, high) in enumerate(bounds)]
+            for key in keys:
+                leader = next(
+                    (candidate for candidate in buckets.get(key, ())
+                     if (candidate ^ value).bit_count() <= max_distance),
+                    None
+                )
+                if leader is not None:
+                    break
+            if leader is None:
+                leader = value
+                clusters[leader] = []
+                for key in keys:
+                    buckets.setdefault(key, []).append(leader)
+            leader_of[value] = leader
+        clusters[leader].append(index)
+    
+    return sorted(list(clusters.values()) + singles, key=lambda members: members[0])
+
+
+def collapse_near_duplicates(
+    items: Sequence[T],
+    fingerprints: Sequence[Optional[str]],
+    max_distance: int = DEFAULT_MAX_DISTANCE
+) -> Tuple[List[T], Dict[int, List[int]]]:
+    """
+    Keep one item per near-duplicate cluster
+    
+    Args:
+        items: Pages in output order
+        fingerprints: SimHash per item
+        max_distance: Maximum differing bits within a cluster
+    
+    Returns:
+        (kept items in order, {representative index: collapsed indices})
+    """
+    kept = []
+    collapsed = {}
+    for members in cluster_fingerprints(fingerprints, max_distance):
+        kept.append(items[members[0]])
+        if len(members) > 1:
+            collapsed[members[0]] = members[1:]
+    return kept, collapsed
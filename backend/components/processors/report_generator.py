@@ -19,6 +19,8 @@ from components.base import BaseComponent
 class ReportGenerator(BaseComponent):
     """Generate formatted reports from agent data"""
     
+    RUNTIME_CONFIG_KEYS = ('title',)
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None, mock_mode: bool = False):
         super().__init__(config, mock_mode)
         self.format = self.config.get('format', 'markdown')  # markdown, json, html
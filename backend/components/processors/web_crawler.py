@@ -3,10 +3,14 @@ WebCrawler Processor
 Orchestrates web crawling using WebsiteConnector and parses HTML
 Separation of concerns: WebsiteConnector (Data Source) → WebCrawler (Processor)
 """
+import asyncio
+import heapq
 import sys
-from bs4 import BeautifulSoup
-from typing import Dict, List, Any, Optional
-from urllib.parse import urljoin, urlparse
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
+from functools import partial
+from typing import Dict, Any, List, Optional, Tuple, Union
+from urllib.parse import urlparse
 from pathlib import Path
 
 # Add backend to path
@@ -14,32 +18,128 @@ backend_path = Path(__file__).parent.parent.parent
 if str(backend_path) not in sys.path:
     sys.path.insert(0, str(backend_path))
 
-from components.base import BaseComponent
-from components.connectors.website_connector import WebsiteConnector
+from components.base import BaseComponent, get_tenant
+from components.connectors.website_connector import WebsiteConnector, DEFAULT_RETRY_STATUSES
+from components.processors.crawl_result import CompactCrawlBuilder, PageRecord, compact_crawl
+from components.processors.html_extractor import EXTRACTORS, get_extractor, extract_html
+from components.processors.near_duplicates import DEFAULT_MAX_DISTANCE, collapse_near_duplicates
+from components.utils.parse_pool import parse_pool
+from components.utils.circuit_breaker import HostCircuitBreaker
+from components.utils.crawl_index import IncrementalCrawl, content_hash, crawl_index_store
+from components.utils.host_throttle import HostThrottle
+from components.utils.robots import RobotsRules, robots_cache
+from components.utils.sitemap import SITEMAP_CONTENT_TYPES, SitemapParser
+from components.utils.url_canonicalizer import URLCanonicalizer, fetch_url, make_seen_set
 
 
 class WebCrawler(BaseComponent):
     """Crawls websites and extracts SEO data (Processor layer)"""
     
+    RUNTIME_CONFIG_KEYS = ('max_depth',)
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None, mock_mode: bool = False):
         super().__init__(config, mock_mode)
         self.max_pages = self.config.get('max_pages', 10)
         self.respect_robots = self.config.get('respect_robots', True)
+        self.user_agent = self.config.get('user_agent', 'TeamAI-Bot/1.0')
+        # Seed the frontier from sitemap.xml (robots.txt Sitemap: lines first),
+        # highest <priority> first, before link-following (opt-in: extra requests
+        # and a different frontier order)
+        self.sitemaps = self.config.get('sitemaps', False)
+        self.sitemap_max_urls = self.config.get('sitemap_max_urls', 10_000)
+        self.sitemap_max_files = self.config.get('sitemap_max_files', 20)
         self.rate_limit_delay = self.config.get('rate_limit_delay', 0.5)
+        # Worker pool size and per-host politeness: request starts to one host
+        # stay rate_limit_delay apart (speed-up comes from crawling hosts in
+        # parallel); a shorter per_host_delay must be configured explicitly
+        self.concurrency = self.config.get('concurrency', 8)
+        self.per_host_concurrency = self.config.get('per_host_concurrency', 4)
+        self.per_host_delay = self.config.get('per_host_delay', self.rate_limit_delay)
+        # Frontier deduplication: equivalent URLs (fragments, default ports,
+        # tracking params, trailing slashes) are enqueued once. The canonical
+        # form is only the seen-set key; pages are fetched as linked
+        self.canonicalizer = URLCanonicalizer(
+            strip_params=self.config.get('strip_query_params'),
+            keep_trailing_slash=self.config.get('keep_trailing_slash', False)
+        )
+        # 'exact' or 'bloom' (fixed memory, rare false positives skip a URL)
+        self.seen_set = self.config.get('seen_set', 'exact')
+        self.bloom_capacity = self.config.get('bloom_capacity', max(100_000, self.max_pages * 100))
+        self.bloom_error_rate = self.config.get('bloom_error_rate', 0.001)
+        # HTML field extraction: 'lxml' (single pass) or 'beautifulsoup' (tree)
+        self.extractor_name = self.config.get('extractor', 'lxml')
+        # Keep one representative per cluster of near-identical pages (SimHash of
+        # the main content within near_duplicate_distance bits); the collapsed
+        # pages are listed in the representative's duplicates
+        self.collapse_duplicates = self.config.get('collapse_near_duplicates', False)
+        self.near_duplicate_distance = self.config.get('near_duplicate_distance', DEFAULT_MAX_DISTANCE)
+        self.extractor = (
+            get_extractor(self.extractor_name, fingerprint=self.collapse_duplicates)
+            if self.extractor_name in EXTRACTORS else None
+        )
+        # Parse pages of at least parse_inline_max_bytes in the shared process pool
+        # (keeps the event loop responsive); smaller pages are parsed inline
+        self.parse_pool = self.config.get('parse_pool', False)
+        self.parse_inline_max_bytes = self.config.get('parse_inline_max_bytes', 64 * 1024)
+        # Stop fetching from a host after this many consecutive failed pages
+        # (each already retried by the connector); probe again after the timeout
+        self.breaker_threshold = self.config.get('breaker_threshold', 5)
+        self.breaker_reset_timeout = self.config.get('breaker_reset_timeout', 30.0)
+        self.retry_statuses = frozenset(self.config.get('retry_statuses', DEFAULT_RETRY_STATUSES))
+        # 'full' (page dicts with absolute link lists) or 'compact' (interned URL
+        # table + page rows, see crawl_result; expand_crawl() restores 'full')
+        self.output_format = self.config.get('output_format', 'full')
+        # Recurring crawls: keep a per-agency, per-site index of page hashes and
+        # extracted fields, reparse only new/changed pages, report a change set
+        self.incremental = self.config.get('incremental', False)
+        self.index_max_entries = self.config.get('index_max_entries', 2_000)
+        self.index_store = crawl_index_store
+        # Stop crawling when less than this many seconds of the node budget remain
+        self.deadline_reserve = self.config.get('deadline_reserve', 1.0)
         
         # Initialize WebsiteConnector (Data Source)
         connector_config = {
             'timeout': self.config.get('timeout', 30),
-            'user_agent': self.config.get('user_agent', 'TeamAI-Bot/1.0'),
+            'user_agent': self.user_agent,
             'follow_redirects': True
         }
+        # Keep-alive client settings (default: process-wide shared client),
+        # conditional-request cache for recurring crawls, body limits and retries
+        for key in ('http2', 'shared_client', 'max_connections', 'max_keepalive_connections',
+                    'http_cache', 'http_cache_scope',
+                    'allowed_content_types', 'max_body_bytes', 'truncate_oversized',
+                    'max_retries', 'retry_backoff', 'retry_max_delay', 'retry_statuses'):
+            if key in self.config:
+                connector_config[key] = self.config[key]
         self.connector = WebsiteConnector(connector_config, mock_mode=mock_mode)
     
+    async def aclose(self):
+        """Close the underlying connector"""
+        await self.connector.aclose()
+    
     def validate_config(self) -> bool:
         """Validate crawler configuration"""
         if self.max_pages < 1:
             return False
-        if self.rate_limit_delay < 0:
+        if self.rate_limit_delay < 0 or self.per_host_delay < 0:
+            return False
+        if self.concurrency < 1 or self.per_host_concurrency < 1:
+            return False
+        if self.output_format not in ('full', 'compact'):
+            return False
+        if self.index_max_entries < 1:
+            return False
+        if not 0 <= self.near_duplicate_distance <= 16:
+            return False
+        if self.breaker_threshold < 1 or self.breaker_reset_timeout < 0:
+            return False
+        if self.sitemap_max_urls < 0 or self.sitemap_max_files < 0:
+            return False
+        if self.seen_set not in ('exact', 'bloom'):
+            return False
+        if self.extractor is None:
+            return False
+        if self.config.get('http_cache_scope', 'agency') not in WebsiteConnector.CACHE_SCOPES:
             return False
         return True
     
@@ -47,102 +147,446 @@ class WebCrawler(BaseComponent):
         """
         Crawl website starting from URL
         
+        A discovery stage first reads robots.txt (cached per host) and, with
+        `sitemaps`, the site's sitemaps: the frontier is seeded with the start
+        URL followed by sitemap URLs in priority order, URLs disallowed by
+        robots.txt are never fetched, and Crawl-delay raises the host's
+        request spacing.
+        
+        Pages are fetched by a pool of `concurrency` workers over a FIFO
+        frontier, with at most `per_host_concurrency` requests in flight per
+        host and request starts spaced `per_host_delay` seconds apart.
+        Links are deduplicated by canonical form when enqueued, so each
+        canonical URL is fetched at most once (as first linked, resolving
+        relative links against the final URL after redirects). Results are
+        returned in discovery (breadth-first) order.
+        
+        With `incremental`, pages whose body hash matches the site's crawl
+        index (or that were revalidated with a 304) reuse the stored fields
+        instead of being reparsed; repeat crawls of a site also get a
+        `changes` set.
+        
+        With `collapse_near_duplicates`, each cluster of near-identical pages
+        is reduced to its first page, whose `duplicates` lists the url, title
+        and meta_description of the collapsed pages (`total_pages` still
+        counts every crawled page).
+        
         Args:
             url: Starting URL
             max_depth: Maximum crawl depth
-            
+        
         Returns:
             Dict with pages data
         """
         if self.mock_mode:
-            return self._mock_crawl(url)
+            result = self._mock_crawl(url)
+            return compact_crawl(result) if self.output_format == 'compact' else result
         
         if not self.validate_config():
             raise ValueError("Invalid crawler configuration")
         
-        visited = set()
+        start_url = fetch_url(url)
+        throttle = HostThrottle(self.per_host_concurrency, self.per_host_delay)
+        breaker = HostCircuitBreaker(self.breaker_threshold, self.breaker_reset_timeout)
+        state = {
+            'in_flight': 0, 'discovered': 0, 'stop': False, 'deadline_reached': False,
+            'robots_disallowed': 0, 'retries': 0, 'failed_pages': 0, 'cache_hits': 0,
+            'reused': 0
+        }
+        robots, sitemap_urls = await self._discover(start_url, max_depth, throttle, breaker, state)
+        
+        incremental = None
+        if self.incremental:
+            site = self._site(self.canonicalizer(start_url))
+            incremental = IncrementalCrawl(
+                await self.index_store.load(get_tenant(), site),
+                max_entries=self.index_max_entries
+            )
+        
+        frontier = deque()  # (url to fetch, depth, discovery order)
+        scheduled = make_seen_set(self.seen_set, self.bloom_capacity, self.bloom_error_rate)
+        visited = []
         pages = []
-        to_visit = [(url, 0)]  # (url, depth)
+        # Compact output: pages are converted to records as they arrive
+        compact = CompactCrawlBuilder() if self.output_format == 'compact' else None
+        changed = asyncio.Condition()
         
-        while to_visit and len(pages) < self.max_pages:
-            current_url, depth = to_visit.pop(0)
-            
-            if current_url in visited or depth > max_depth:
+        def enqueue(link: str, depth: int):
+            key = self.canonicalizer(link)
+            if key in scheduled:
+                return
+            scheduled.add(key)
+            if robots is not None and not robots.can_fetch(self.user_agent, link):
+                state['robots_disallowed'] += 1
+                return
+            frontier.append((link, depth, state['discovered']))
+            state['discovered'] += 1
+        
+        enqueue(start_url, 0)
+        for link in sitemap_urls:
+            enqueue(link, 1)
+        
+        def done() -> bool:
+            if state['stop']:
+                return True
+            # Return what we have rather than be cancelled mid-fetch
+            remaining = self.remaining_time()
+            if remaining is not None and remaining < self.deadline_reserve:
+                print(f"Crawl budget exhausted after {len(pages)} pages")
+                state['deadline_reached'] = True
+                state['stop'] = True
+                return True
+            return False
+        
+        async def worker():
+            while True:
+                async with changed:
+                    while True:
+                        if done():
+                            changed.notify_all()
+                            return
+                        # Only start fetches that can still fit under max_pages
+                        if frontier and len(pages) + state['in_flight'] < self.max_pages:
+                            break
+                        if state['in_flight'] == 0:
+                            # Frontier exhausted (or page budget reached) and nothing pending
+                            state['stop'] = True
+                            changed.notify_all()
+                            return
+                        await changed.wait()
+                    current_url, depth, order = frontier.popleft()
+                    state['in_flight'] += 1
+                
+                page_data = None
+                host = urlparse(self.canonicalizer(current_url)).netloc
+                try:
+                    # Hosts with an open circuit are skipped without a request
+                    if breaker.allow(host):
+                        try:
+                            async with throttle.slot(host):
+                                page_data = await self._crawl_page(
+                                    current_url, depth, breaker, state, incremental
+                                )
+                        finally:
+                            breaker.release(host)
+                finally:
+                    async with changed:
+                        state['in_flight'] -= 1
+                        if page_data is not None and len(pages) < self.max_pages:
+                            visited.append((order, current_url))
+                            pages.append((order, compact.record(page_data) if compact else page_data))
+                            state['cache_hits'] += bool(page_data.get('from_cache'))
+                            self.emit_event(
+                                'page_fetched',
+                                url=current_url,
+                                status_code=page_data['status_code'],
+                                depth=depth,
+                                elapsed_ms=page_data['elapsed_ms'],
+                                pages_crawled=len(pages)
+                            )
+                            
+                            # Add internal links to frontier (only if we haven't reached max depth)
+                            if depth < max_depth:
+                                base_domain = urlparse(self.canonicalizer(current_url)).netloc
+                                for link in page_data['links']:
+                                    link = fetch_url(link)
+                                    if urlparse(self.canonicalizer(link)).netloc == base_domain:
+                                        enqueue(link, depth + 1)
+                        changed.notify_all()
+        
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+        
+        pages.sort(key=lambda item: item[0])
+        visited.sort(key=lambda item: item[0])
+        crawled_urls = [visited_url for _, visited_url in visited]
+        total_pages = len(pages)
+        
+        near_duplicate_pages = None
+        if self.collapse_duplicates:
+            fingerprints = [
+                record.fingerprint if compact else record.get('fingerprint')
+                for _, record in pages
+            ]
+            kept, clusters = collapse_near_duplicates(
+                list(zip(pages, visited)), fingerprints, self.near_duplicate_distance
+            )
+            for index, members in clusters.items():
+                duplicates = [self._duplicate_entry(pages[member][1], crawled_urls[member]) for member in members]
+                if compact:
+                    pages[index][1].duplicates = duplicates
+                else:
+                    pages[index][1]['duplicates'] = duplicates
+            pages = [page for page, _ in kept]
+            visited = [visited_item for _, visited_item in kept]
+            near_duplicate_pages = sum(len(members) for members in clusters.values())
+        
+        summary = {
+            'total_pages': total_pages,
+            'visited_urls': [visited_url for _, visited_url in visited],
+            'base_url': url,
+            'deadline_reached': state['deadline_reached'],
+            'cache_hits': state['cache_hits'],
+            'sitemap_urls': len(sitemap_urls),
+            'robots_disallowed': state['robots_disallowed'],
+            'retries': state['retries'],
+            'failed_pages': state['failed_pages'],
+            'breaker_trips': breaker.trips,
+            'breaker_skipped': breaker.rejected,
+            'breaker_open_hosts': breaker.open_hosts()
+        }
+        if near_duplicate_pages is not None:
+            summary['near_duplicate_pages'] = near_duplicate_pages
+        if incremental is not None:
+            summary['reused_pages'] = state['reused']
+            if incremental.previous:
+                # Only repeat crawls have a change set (a first crawl is all new)
+                summary['changes'] = incremental.change_set(crawled_urls, key=self.canonicalizer)
+            try:
+                await self.index_store.save(get_tenant(), site, incremental.updated_index())
+            except Exception as e:
+                print(f"Error saving crawl index for {site}: {str(e)}")
+        if compact is not None:
+            return compact.build([record for _, record in pages], **summary)
+        return {'pages': [page for _, page in pages], **summary}
+    
+    async def _discover(
+        self,
+        start_url: str,
+        max_depth: int,
+        throttle: HostThrottle,
+        breaker: HostCircuitBreaker,
+        stats: Dict[str, Any]
+    ) -> Tuple[Optional[RobotsRules], List[str]]:
+        """
+        Discovery stage: robots.txt rules and sitemap seeds for the start host
+        
+        Returns:
+            (robots rules, or None when robots.txt is not respected;
+             same-host sitemap URLs, best first)
+        """
+        parts = urlparse(self.canonicalizer(start_url))
+        host = parts.netloc
+        origin = f'{parts.scheme}://{host}'
+        read_sitemaps = self.sitemaps and max_depth >= 1 and self.max_pages > 1
+        
+        remaining = self.remaining_time()
+        if remaining is not None and remaining < self.deadline_reserve:
+            return None, []  # No budget left: the crawl loop stops right away
+        
+        robots = None
+        if self.respect_robots or read_sitemaps:
+            async with throttle.slot(host):
+                # robots.txt is text/plain: bypass the HTML content-type gate
+                robots = await robots_cache.get(origin, partial(self.connector.execute, content_types=()))
+            if self.respect_robots:
+                delay = robots.crawl_delay(self.user_agent)
+                if delay is not None:
+                    throttle.set_delay(host, max(self.per_host_delay, delay))
+        
+        sitemap_urls = []
+        if read_sitemaps:
+            sitemap_urls = await self._read_sitemaps(
+                robots.sitemaps or [f'{origin}/sitemap.xml'], host, throttle, breaker, stats
+            )
+        return (robots if self.respect_robots else None), sitemap_urls
+    
+    async def _read_sitemaps(
+        self,
+        sitemap_files: List[str],
+        host: str,
+        throttle: HostThrottle,
+        breaker: HostCircuitBreaker,
+        stats: Dict[str, Any]
+    ) -> List[str]:
+        """
+        Fetch sitemap files (following sitemap indexes) and rank their URLs
+        
+        Sitemaps are fetched like pages (retries, circuit breaker), accepting
+        only XML or gzip responses, so HTML soft-404s are skipped unparsed.
+        Keeps the sitemap_max_urls best URLs of host by <priority>, then
+        <lastmod> (newest first), then document order.
+        
+        Returns:
+            Same-host URLs, best first
+        """
+        queue = deque(sitemap_files)
+        fetched = set()
+        best = []  # min-heap of (priority, lastmod, -document order, url)
+        order = 0
+        
+        def rank(entries: List[Dict[str, Any]]):
+            nonlocal order
+            for entry in entries:
+                if entry['sitemap']:
+                    queue.append(entry['loc'])  # Sitemap index: read the child sitemap
+                    continue
+                link = fetch_url(entry['loc'])
+                if urlparse(self.canonicalizer(link)).netloc != host or self.sitemap_max_urls == 0:
+                    continue
+                item = (entry['priority'], entry['lastmod'], -order, link)
+                order += 1
+                if len(best) < self.sitemap_max_urls:
+                    heapq.heappush(best, item)
+                else:
+                    heapq.heappushpop(best, item)
+        
+        while queue and len(fetched) < self.sitemap_max_files:
+            remaining = self.remaining_time()
+            if remaining is not None and remaining < self.deadline_reserve:
+                break
+            sitemap_url = queue.popleft()
+            if sitemap_url in fetched:
                 continue
+            fetched.add(sitemap_url)
             
+            sitemap_host = urlparse(self.canonicalizer(sitemap_url)).netloc
+            if not breaker.allow(sitemap_host):
+                continue
             try:
-                # Use WebsiteConnector to fetch HTML (Data Source layer)
-                fetch_result = await self.connector.execute(current_url)
-                
-                # Check for errors
-                if fetch_result.get('error') or not fetch_result.get('html'):
-                    print(f"Error fetching {current_url}: {fetch_result.get('error', 'No HTML')}")
-                    continue
-                
-                visited.add(current_url)
-                
-                # Parse HTML (Processor layer responsibility)
-                soup = BeautifulSoup(fetch_result['html'], 'lxml')
-                
-                # Extract structured data
-                page_data = {
-                    'url': current_url,
-                    'status_code': fetch_result['status_code'],
-                    'title': soup.title.string if soup.title else '',
-                    'meta_description': self._extract_meta(soup, 'description'),
-                    'meta_keywords': self._extract_meta(soup, 'keywords'),
-                    'h1_tags': [h1.get_text(strip=True) for h1 in soup.find_all('h1')],
-                    'h2_tags': [h2.get_text(strip=True) for h2 in soup.find_all('h2')],
-                    'word_count': len(soup.get_text().split()),
-                    'links': self._extract_links(soup, current_url),
-                    'images': len(soup.find_all('img')),
-                    'depth': depth,
-                    'elapsed_ms': fetch_result.get('elapsed_ms', 0)
-                }
-                
-                pages.append(page_data)
-                
-                # Add internal links to queue (only if we haven't reached max depth)
-                if depth < max_depth:
-                    base_domain = urlparse(current_url).netloc
-                    for link in page_data['links']:
-                        if urlparse(link).netloc == base_domain:
-                            to_visit.append((link, depth + 1))
-                
-                # Rate limiting
-                await self._async_sleep(self.rate_limit_delay)
+                async with throttle.slot(sitemap_host):
+                    fetch_result = await self._fetch(sitemap_url, breaker, stats, SITEMAP_CONTENT_TYPES)
+            finally:
+                breaker.release(sitemap_host)
+            if fetch_result.get('error'):
+                print(f"Skipping sitemap {sitemap_url}: {fetch_result['error']}")
+                continue
             
+            parser = SitemapParser()
+            try:
+                rank(parser.feed(fetch_result.get('content') or (fetch_result.get('html') or '').encode('utf-8')))
+                rank(parser.close())
             except Exception as e:
-                print(f"Error processing {current_url}: {str(e)}")
-                continue
+                # Keep URLs ranked before the error
+                print(f"Error reading sitemap {sitemap_url}: {str(e)}")
         
-        return {
-            'pages': pages,
-            'total_pages': len(pages),
-            'visited_urls': list(visited),
-            'base_url': url
-        }
+        return [url for *_, url in sorted(best, reverse=True)]
     
-    def _extract_meta(self, soup: BeautifulSoup, name: str) -> str:
-        """Extract meta tag content"""
-        tag = soup.find('meta', attrs={'name': name}) or soup.find('meta', attrs={'property': f'og:{name}'})
-        return tag.get('content', '') if tag else ''
+    async def _crawl_page(
+        self,
+        url: str,
+        depth: int,
+        breaker: HostCircuitBreaker,
+        stats: Dict[str, Any],
+        incremental: Optional[IncrementalCrawl] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fetch and parse one page
+        
+        Args:
+            url: Page URL
+            depth: Crawl depth of the page
+            breaker: Crawl's circuit breaker (the fetch outcome is recorded)
+            stats: Crawl counters (retries, failed_pages, reused are updated)
+            incremental: Crawl index view (unchanged pages reuse stored fields)
+        
+        Returns:
+            Page data, or None if the page could not be fetched or parsed
+        """
+        try:
+            fetch_result = await self._fetch(url, breaker, stats)
+            key = self.canonicalizer(url)
+            
+            # Check for errors
+            if fetch_result.get('error') or not fetch_result.get('html'):
+                print(f"Error fetching {url}: {fetch_result.get('error', 'No HTML')}")
+                stats['failed_pages'] += 1
+                return None
+            
+            fields = None
+            if incremental is not None:
+                fingerprint = content_hash(
+                    fetch_result.get('content') or fetch_result['html'].encode('utf-8')
+                )
+                fields = incremental.reusable_fields(
+                    key, fingerprint, revalidated=fetch_result.get('from_cache', False)
+                )
+                if fields is not None and self.collapse_duplicates and not fields.get('fingerprint'):
+                    fields = None  # Indexed before fingerprints were enabled
+                stats['reused'] += fields is not None
+            
+            reused = fields is not None
+            if not reused:
+                # Parse HTML and extract structured data (Processor layer responsibility);
+                # relative links resolve against the final URL after redirects
+                fields = await self._extract(fetch_result, fetch_result.get('url') or url)
+            if incremental is not None:
+                incremental.record(key, fingerprint, fields, reused)
+            
+            return {
+                'url': url,
+                'status_code': fetch_result['status_code'],
+                **fields,
+                'depth': depth,
+                'elapsed_ms': fetch_result.get('elapsed_ms', 0),
+                'from_cache': fetch_result.get('from_cache', False),
+                'duplicates': []
+            }
+        
+        except Exception as e:
+            print(f"Error processing {url}: {str(e)}")
+            return None
+    
+    async def _fetch(
+        self,
+        url: str,
+        breaker: HostCircuitBreaker,
+        stats: Dict[str, Any],
+        content_types: Optional[Tuple[str, ...]] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch a URL through the connector (with retries) and record the outcome
+        
+        Args:
+            url: URL to fetch
+            breaker: Crawl's circuit breaker (only unreachable hosts and
+                     retryable statuses count against the host)
+            stats: Crawl counters (retries is updated)
+            content_types: Accepted media types (default: the connector's, HTML)
+        
+        Returns:
+            Connector fetch result
+        """
+        # Use WebsiteConnector to fetch (Data Source layer)
+        fetch_result = await self.connector.execute(url, content_types=content_types)
+        stats['retries'] += max(0, fetch_result.get('attempts', 1) - 1)
+        status = fetch_result.get('status_code', 0)
+        host_failed = bool(fetch_result.get('error')) and (
+            status == 0 or status in self.retry_statuses
+        )
+        breaker.record(urlparse(self.canonicalizer(url)).netloc, success=not host_failed)
+        return fetch_result
     
-    def _extract_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
-        """Extract all links from page"""
-        links = []
-        for a in soup.find_all('a', href=True):
-            href = a['href']
-            # Convert relative URLs to absolute
-            absolute_url = urljoin(base_url, href)
-            if absolute_url.startswith('http'):
-                links.append(absolute_url)
-        return links
+    @staticmethod
+    def _duplicate_entry(record: Union[PageRecord, Dict[str, Any]], url: str) -> Dict[str, Any]:
+        """Fields of a collapsed page kept on its representative"""
+        if isinstance(record, PageRecord):
+            return {'url': url, 'title': record.title, 'meta_description': record.meta_description}
+        return {'url': url, 'title': record.get('title'), 'meta_description': record.get('meta_description')}
     
-    async def _async_sleep(self, seconds: float):
-        """Async sleep helper"""
-        import asyncio
-        await asyncio.sleep(seconds)
+    @staticmethod
+    def _site(url: str) -> str:
+        """Crawl index key of a site (scheme://host)"""
+        parts = urlparse(url)
+        return f"{parts.scheme}://{parts.netloc}"
+    
+    async def _extract(self, fetch_result: Dict[str, Any], url: str) -> Dict[str, Any]:
+        """Extract page fields, in the parse pool for large pages"""
+        html = fetch_result['html']
+        if self.parse_pool and len(html) >= self.parse_inline_max_bytes:
+            content = fetch_result.get('content') or html.encode('utf-8')
+            encoding = fetch_result.get('encoding') if fetch_result.get('content') else 'utf-8'
+            try:
+                return await parse_pool.run(
+                    extract_html, self.extractor_name, content, encoding, url, self.collapse_duplicates
+                )
+            except BrokenProcessPool as e:
+                print(f"Parse pool unavailable ({e}), parsing {url} inline")
+        return self.extractor.extract(html, url)
     
     def _mock_crawl(self, url: str) -> Dict[str, Any]:
         """Return mock data for testing"""
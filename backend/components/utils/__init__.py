@@ -4,5 +4,15 @@ Reusable utility components
 """
 from .rate_limiter import RateLimiter
 from .cache_manager import CacheManager
+from .host_throttle import HostThrottle
+from .circuit_breaker import HostCircuitBreaker
+from .url_canonicalizer import URLCanonicalizer, BloomFilter, canonicalize_url, fetch_url
+from .robots import RobotsRules, RobotsCache, robots_cache
+from .sitemap import SitemapParser
+from .crawl_index import CrawlIndexStore, IncrementalCrawl, crawl_index_store
 
-__all__ = ['RateLimiter', 'CacheManager']
+__all__ = [
+    'RateLimiter', 'CacheManager', 'HostThrottle', 'HostCircuitBreaker', 'URLCanonicalizer', 'BloomFilter', 'canonicalize_url', 'fetch_url',
+    'RobotsRules', 'RobotsCache', 'robots_cache', 'SitemapParser',
+    'CrawlIndexStore', 'IncrementalCrawl', 'crawl_index_store'
+]
@@ -4,27 +4,97 @@ Redis-backed caching for intermediate results to reduce costs
 """
 import json
 import hashlib
+from collections import OrderedDict
 from typing import Any, Optional
 from datetime import timedelta
 
 
+# Shared Redis client for caches created by create_cache_manager()
+_redis_client = None
+
+
+def get_redis_client():
+    """
+    Process-wide Redis client for REDIS_URL (settings / environment)
+    
+    Returns:
+        redis.asyncio client, or None if REDIS_URL is not configured
+        (the settings default alone does not count) or redis is unavailable
+    """
+    global _redis_client
+    if _redis_client is not None:
+        return _redis_client
+    try:
+        from app.config import settings
+        import redis.asyncio as redis
+    except ImportError:
+        return None
+    if 'REDIS_URL' not in settings.model_fields_set:
+        return None
+    
+    options = {
+        'decode_responses': True,
+        'socket_connect_timeout': 5,
+        'socket_keepalive': True,
+        'health_check_interval': 30
+    }
+    if settings.REDIS_URL.startswith('rediss://'):
+        import ssl
+        options['ssl_cert_reqs'] = ssl.CERT_NONE  # Azure Redis uses self-signed certs
+    # Connections are opened on first use, not here
+    _redis_client = redis.from_url(settings.REDIS_URL, **options)
+    return _redis_client
+
+
+def create_cache_manager(
+    purpose: str,
+    default_ttl: int = 3600,
+    max_entries: Optional[int] = None
+) -> 'CacheManager':
+    """
+    CacheManager on the configured Redis, in-memory only without REDIS_URL
+    
+    Args:
+        purpose: What the cache holds (for the fallback warning)
+        default_ttl: Default time-to-live in seconds
+        max_entries: Entry limit of the in-memory fallback (None = unbounded)
+    
+    Returns:
+        Redis-backed CacheManager, or in-memory fallback (logged)
+    """
+    client = get_redis_client()
+    if client is None:
+        print(f"[CacheManager] REDIS_URL not configured: {purpose} kept in process memory "
+              f"(lost on restart, not shared between workers)")
+    return CacheManager(redis_client=client, default_ttl=default_ttl, max_entries=max_entries)
+
+
 class CacheManager:
     """
     Redis-backed cache with TTL support
     Stores intermediate results to reduce redundant API calls and LLM usage
     """
     
-    def __init__(self, redis_client=None, default_ttl: int = 3600):
+    # In-memory fallback: expired entries are swept every SWEEP_INTERVAL sets
+    # (entries that are never read again would otherwise stay forever)
+    SWEEP_INTERVAL = 256
+    
+    def __init__(self, redis_client=None, default_ttl: int = 3600, max_entries: Optional[int] = None):
         """
         Initialize cache manager
         
         Args:
             redis_client: Redis client instance (optional, falls back to in-memory)
             default_ttl: Default time-to-live in seconds (default: 1 hour)
+            max_entries: In-memory fallback limit; least recently used entries
+                         are evicted beyond it (None = unbounded)
         """
         self.redis = redis_client
         self.default_ttl = default_ttl
-        self._local_cache = {}  # In-memory fallback
+        self.max_entries = max_entries
+        self._local_cache = OrderedDict()  # In-memory fallback, least recently used first
+        self._sets_since_sweep = 0
+        self.evictions = 0
     
     def _generate_key(self, namespace: str, identifier: str) -> str:
         """
@@ -69,6 +139,7 @@ class CacheManager:
                 entry = self._local_cache[key]
                 import time
                 if time.time() < entry['expires_at']:
+                    self._local_cache.move_to_end(key)
                     return entry['value']
                 else:
                     del self._local_cache[key]
@@ -106,6 +177,22 @@ class CacheManager:
                 'value': value,
                 'expires_at': time.time() + ttl
             }
+            self._local_cache.move_to_end(key)
+            self._sets_since_sweep += 1
+            if self._sets_since_sweep >= self.SWEEP_INTERVAL:
+                self._sweep_expired()
+            if self.max_entries is not None:
+                while len(self._local_cache) > self.max_entries:
+                    self._local_cache.popitem(last=False)
+                    self.evictions += 1
+    
+    def _sweep_expired(self):
+        """Drop expired in-memory entries"""
+        import time
+        now = time.time()
+        for key in [key for key, entry in self._local_cache.items() if entry['expires_at'] <= now]:
+            del self._local_cache[key]
+        self._sets_since_sweep = 0
     
     async def delete(self, namespace: str, identifier: str):
         """
@@ -187,7 +274,9 @@ class CacheManager:
         else:
             return {
                 'backend': 'in-memory',
-                'keys': len(self._local_cache)
+                'keys': len(self._local_cache),
+                'max_entries': self.max_entries,
+                'evictions': self.evictions
             }
     
     def create_cache_key_from_dict(self, data: dict) -> str:
@@ -0,0 +1,101 @@
+"""
+CircuitBreaker Utility
+Per-host circuit breaker: stops fetching from hosts that keep failing
+"""
+import time
+from typing import Dict, List
+
+
+class _HostCircuit:
+    """Failure state for one host"""
+    
+    def __init__(self):
+        self.failures = 0
+        self.opened_at = None  # time.monotonic() when tripped, None = closed
+        self.probing = False
+
+
+class HostCircuitBreaker:
+    """
+    Opens a host's circuit after failure_threshold consecutive failures
+    
+    While open, allow() refuses requests to the host. After reset_timeout one
+    probe request is let through (half-open): success closes the circuit,
+    failure re-opens it for another reset_timeout.
+    
+    Usage:
+        if breaker.allow(host):
+            try:
+                result = await fetch(url)
+                breaker.record(host, success=...)
+            finally:
+                breaker.release(host)
+    """
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize circuit breaker
+        
+        Args:
+            failure_threshold: Consecutive failures that open a host's circuit
+            reset_timeout: Seconds before an open circuit lets a probe through
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._hosts: Dict[str, _HostCircuit] = {}
+        self.trips = 0
+        self.rejected = 0
+    
+    def _circuit(self, host: str) -> _HostCircuit:
+        circuit = self._hosts.get(host)
+        if circuit is None:
+            circuit = self._hosts[host] = _HostCircuit()
+        return circuit
+    
+    def allow(self, host: str) -> bool:
+        """Check whether a request to host may proceed (counts refusals)"""
+        circuit = self._circuit(host)
+        if circuit.opened_at is None:
+            return True
+        if not circuit.probing and time.monotonic() - circuit.opened_at >= self.reset_timeout:
+            circuit.probing = True
+            return True
+        self.rejected += 1
+        return False
+    
+    def record(self, host: str, success: bool):
+        """Record outcome of a request allowed by allow()"""
+        circuit = self._circuit(host)
+        if success:
+            circuit.failures = 0
+            circuit.opened_at = None
+            circuit.probing = False
+            return
+        
+        circuit.failures += 1
+        if circuit.probing or (circuit.opened_at is None and circuit.failures >= self.failure_threshold):
+            if circuit.opened_at is None:
+                self.trips += 1
+                print(f"Circuit opened for {host} after {circuit.failures} consecutive failures")
+            circuit.opened_at = time.monotonic()
+            circuit.probing = False
+    
+    def release(self, host: str):
+        """
+        End a request allowed by allow()
+        
+        A half-open probe that ends without record() (cancelled or raised)
+        frees the probe slot, so the next request after it may probe again.
+        """
+        circuit = self._hosts.get(host)
+        if circuit is not None and circuit.opened_at is not None:
+            circuit.probing = False
+    
+    def is_open(self, host: str) -> bool:
+        """Check whether host's circuit is open (or half-open)"""
+        circuit = self._hosts.get(host)
+        return circuit is not None and circuit.opened_at is not None
+    
+    def open_hosts(self) -> List[str]:
+        """Hosts whose circuit is currently open"""
+        return [host for host, circuit in self._hosts.items() if circuit.opened_at is not None]
@@ -0,0 +1,208 @@
+"""
+Crawl Index Utility
+Persists per-site crawl results (content hash and extracted fields per URL)
+so repeat crawls only reparse pages that changed
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from components.utils.cache_manager import CacheManager, create_cache_manager
+
+
+# Page fields produced by extraction (reused for unchanged pages)
+EXTRACTED_FIELDS = (
+    'title', 'meta_description', 'meta_keywords', 'h1_tags', 'h2_tags',
+    'word_count', 'links', 'images', 'fingerprint'
+)
+
+
+def content_hash(content: bytes) -> str:
+    """Fingerprint of a response body"""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+class CrawlIndexStore:
+    """
+    Redis-backed crawl index storage (in-memory fallback via CacheManager)
+    
+    One index per (agency, site): canonical URL -> {hash, fields, fetched_at}.
+    Agencies never see each other's indexes.
+    
+    Total size is bounded: at most max_sites indexes are kept across all
+    agencies (least recently saved are deleted), each with at most the
+    crawler's index_max_entries pages.
+    """
+    
+    NAMESPACE = 'crawl_index'
+    
+    def __init__(
+        self,
+        cache_manager: Optional[CacheManager] = None,
+        ttl: int = 90 * 86400,
+        max_sites: int = 500
+    ):
+        """
+        Initialize crawl index store
+        
+        Args:
+            cache_manager: Backing cache (Redis-backed in production)
+            ttl: Index lifetime in seconds after the last crawl (default: 90 days)
+            max_sites: Site indexes kept across all agencies
+        """
+        self.cache = cache_manager or CacheManager(default_ttl=ttl)
+        self.ttl = ttl
+        self.max_sites = max_sites
+        self._sites: "OrderedDict[str, None]" = OrderedDict()  # In-memory LRU of saved keys
+        # Redis sorted set of saved keys by save time (shared by all workers)
+        self._registry = f'cache:{self.NAMESPACE}:_sites'
+    
+    @staticmethod
+    def _key(agency_id: Optional[str], site: str) -> str:
+        return f"{agency_id or '_shared'}:{site}"
+    
+    async def load(self, agency_id: Optional[str], site: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Load site index
+        
+        Args:
+            agency_id: Owning agency (None = not tenant-scoped)
+            site: Site origin (scheme://host)
+        
+        Returns:
+            URL -> entry mapping (empty if the site was never crawled)
+        """
+        return await self.cache.get(self.NAMESPACE, self._key(agency_id, site)) or {}
+    
+    async def save(self, agency_id: Optional[str], site: str, index: Dict[str, Dict[str, Any]]):
+        """
+        Save (overwrite) site index
+        
+        Args:
+            agency_id: Owning agency
+            site: Site origin
+            index: URL -> entry mapping
+        """
+        key = self._key(agency_id, site)
+        await self.cache.set(self.NAMESPACE, key, index, ttl=self.ttl)
+        await self._track(key)
+    
+    async def delete(self, agency_id: Optional[str], site: str):
+        """Forget site index (next crawl reparses everything)"""
+        key = self._key(agency_id, site)
+        await self.cache.delete(self.NAMESPACE, key)
+        self._sites.pop(key, None)
+        if self.cache.redis:
+            try:
+                await self.cache.redis.zrem(self._registry, key)
+            except Exception as e:
+                print(f"[CrawlIndexStore] Redis registry error: {e}")
+    
+    async def _track(self, key: str):
+        """Record a save and delete the least recently saved indexes beyond max_sites"""
+        if self.cache.redis:
+            try:
+                redis = self.cache.redis
+                await redis.zadd(self._registry, {key: time.time()})
+                excess = await redis.zcard(self._registry) - self.max_sites
+                evicted = [member for member, _ in await redis.zpopmin(self._registry, excess)] if excess > 0 else []
+            except Exception as e:
+                print(f"[CrawlIndexStore] Redis registry error: {e}")
+                return
+        else:
+            self._sites[key] = None
+            self._sites.move_to_end(key)
+            evicted = []
+            while len(self._sites) > self.max_sites:
+                evicted.append(self._sites.popitem(last=False)[0])
+        
+        for old_key in evicted:
+            await self.cache.delete(self.NAMESPACE, old_key)
+
+
+class IncrementalCrawl:
+    """
+    One crawl's view of a site index
+    
+    Decides per page whether stored fields can be reused (same content
+    hash, or a 304 revalidation) and collects the change set.
+    """
+    
+    def __init__(self, previous: Dict[str, Dict[str, Any]], max_entries: int = 2_000):
+        """
+        Args:
+            previous: Index loaded from CrawlIndexStore
+            max_entries: URLs kept when saving (most recently fetched win)
+        """
+        self.previous = previous
+        self.max_entries = max_entries
+        self.current: Dict[str, Dict[str, Any]] = {}
+        self.status: Dict[str, str] = {}  # url -> new / changed / unchanged
+    
+    def reusable_fields(self, url: str, fingerprint: str, revalidated: bool) -> Optional[Dict[str, Any]]:
+        """
+        Stored fields for url if the page is unchanged
+        
+        Args:
+            url: Canonical page URL
+            fingerprint: content_hash() of the fetched body
+            revalidated: Body was confirmed by a 304 response
+        """
+        entry = self.previous.get(url)
+        if entry and (revalidated or entry.get('hash') == fingerprint):
+            return entry['fields']
+        return None
+    
+    def record(self, url: str, fingerprint: str, fields: Dict[str, Any], reused: bool):
+        """Record a crawled page and classify it"""
+        self.current[url] = {
+            'hash': fingerprint,
+            'fields': {name: fields.get(name) for name in EXTRACTED_FIELDS},
+            'fetched_at': datetime.now(timezone.utc).isoformat()
+        }
+        if reused:
+            self.status[url] = 'unchanged'
+        else:
+            self.status[url] = 'changed' if url in self.previous else 'new'
+    
+    def change_set(
+        self,
+        crawled_urls: List[str],
+        key: Optional[Callable[[str], str]] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Change set of this crawl
+        
+        Args:
+            crawled_urls: URLs of the returned pages, in output order
+            key: Maps a page URL to its index key (default: URL as is)
+        
+        Returns:
+            Dict with new, changed and unchanged URLs, plus missing: indexed URLs
+            not reached this time (removed, unlinked or beyond max_pages)
+        """
+        changes = {'new': [], 'changed': [], 'unchanged': [], 'missing': []}
+        key = key or (lambda url: url)
+        crawled = set()
+        for url in crawled_urls:
+            crawled.add(key(url))
+            status = self.status.get(key(url))
+            if status:
+                changes[status].append(url)
+        changes['missing'] = [url for url in self.previous if url not in crawled]
+        return changes
+    
+    def updated_index(self) -> Dict[str, Dict[str, Any]]:
+        """Previous index updated with this crawl's pages (bounded by max_entries)"""
+        index = {**self.previous, **self.current}
+        if len(index) > self.max_entries:
+            newest = sorted(index.items(), key=lambda item: item[1].get('fetched_at', ''), reverse=True)
+            index = dict(newest[:self.max_entries])
+        return index
+
+
+# Process-wide default store: Redis (REDIS_URL), so every worker and restart
+# sees the same indexes; in-memory fallback only without Redis
+crawl_index_store = CrawlIndexStore(create_cache_manager('crawl indexes', default_ttl=90 * 86400))
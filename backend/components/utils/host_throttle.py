@@ -0,0 +1,84 @@
+"""
+HostThrottle Utility
+Per-host politeness for concurrent crawls (concurrency cap + request spacing)
+"""
+import asyncio
+import time
+from typing import Dict, Optional
+
+
+class _HostSlot:
+    """Concurrency and spacing state for one host"""
+    
+    def __init__(self, concurrency: int, delay: float):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.delay = delay
+        self.next_start = 0.0
+
+
+class HostThrottle:
+    """
+    Limits concurrent requests to each host and spaces request starts
+    
+    Usage:
+        async with throttle.slot(host):
+            response = await client.get(url)
+    
+    Create one per crawl (asyncio primitives are bound to the running loop).
+    """
+    
+    def __init__(self, concurrency: int = 2, delay: float = 0.0):
+        """
+        Initialize host throttle
+        
+        Args:
+            concurrency: Maximum in-flight requests per host
+            delay: Minimum seconds between request starts to the same host
+        """
+        self.concurrency = max(1, concurrency)
+        self.delay = max(0.0, delay)
+        self._hosts: Dict[str, _HostSlot] = {}
+    
+    def _slot(self, host: str) -> _HostSlot:
+        slot = self._hosts.get(host)
+        if slot is None:
+            slot = self._hosts[host] = _HostSlot(self.concurrency, self.delay)
+        return slot
+    
+    def set_delay(self, host: str, delay: float):
+        """Override spacing for one host (e.g. robots.txt Crawl-delay)"""
+        self._slot(host).delay = max(0.0, delay)
+    
+    def slot(self, host: str) -> '_HostLease':
+        """Async context manager holding one of the host's request slots"""
+        return _HostLease(self._slot(host))
+    
+    def get_delay(self, host: str) -> Optional[float]:
+        """Current spacing for host (None if host not seen yet)"""
+        slot = self._hosts.get(host)
+        return slot.delay if slot else None
+
+
+class _HostLease:
+    """Acquires a host slot and waits for the host's next start time"""
+    
+    def __init__(self, slot: _HostSlot):
+        self._slot = slot
+    
+    async def __aenter__(self):
+        await self._slot.semaphore.acquire()
+        try:
+            # Reserve the next start time before sleeping so waiters queue up in order
+            now = time.monotonic()
+            start = max(now, self._slot.next_start)
+            self._slot.next_start = start + self._slot.delay
+            if start > now:
+                await asyncio.sleep(start - now)
+        except BaseException:
+            self._slot.semaphore.release()
+            raise
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self._slot.semaphore.release()
+        return False
@@ -0,0 +1,104 @@
+"""
+ParsePool Utility
+Process pool for CPU-bound HTML parsing, shared by every crawl in the app
+
+Parsing a multi-megabyte page inline blocks the event loop (and every other
+request on the worker) for tens of milliseconds. Crawlers with parse_pool
+enabled send large pages here instead; small pages stay inline, where the
+round trip to a worker process would cost more than the parse.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+
+class ParsePool:
+    """
+    Lazily started, bounded ProcessPoolExecutor
+    
+    At most max_pending jobs are queued or running per event loop; further
+    callers wait, so a burst of large pages cannot queue unbounded HTML in
+    memory. Workers are spawned (not forked) so they never inherit the
+    parent's event loop, threads or open sockets.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        """
+        Initialize parse pool
+        
+        Args:
+            max_workers: Worker processes (default: min(4, CPU count))
+            max_pending: Jobs in flight per event loop (default: 2 x max_workers)
+        """
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.configure(max_workers, max_pending)
+    
+    def configure(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        """Resize the pool (running workers are shut down and restarted on next use)"""
+        self.shutdown(wait=False)
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_pending = max_pending or self.max_workers * 2
+        self._semaphores = weakref.WeakKeyDictionary()
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_pending)
+        return semaphore
+    
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run fn(*args) in a worker process
+        
+        fn and args must be picklable (fn defined at module level).
+        
+        Raises:
+            BrokenProcessPool: If a worker died (the pool restarts on next use)
+        """
+        async with self._get_semaphore():
+            executor = self._get_executor()
+            try:
+                return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+            except BrokenProcessPool:
+                with self._lock:
+                    if self._executor is executor:
+                        self._executor = None
+                raise
+    
+    def shutdown(self, wait: bool = True):
+        """Stop worker processes (application shutdown)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+    
+    def get_stats(self) -> dict:
+        """Get pool statistics"""
+        return {
+            'max_workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'started': self._executor is not None
+        }
+
+
+# Process-wide pool (HTML_PARSE_WORKERS sets the size; shut down by the FastAPI lifespan)
+parse_pool = ParsePool(max_workers=int(os.getenv('HTML_PARSE_WORKERS', 0)) or None)
@@ -0,0 +1,184 @@
+"""
+Robots.txt Utility
+Parses robots.txt (RFC 9309: longest-match rules, * and $ wildcards) and
+caches the rules per host across crawls
+"""
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class RobotsRules:
+    """Parsed robots.txt of one host"""
+    
+    def __init__(self, text: str = '', disallow_all: bool = False):
+        """
+        Parse robots.txt
+        
+        Args:
+            text: robots.txt content (empty = everything allowed)
+            disallow_all: Block every URL (robots.txt unreachable)
+        """
+        self.disallow_all = disallow_all
+        self.sitemaps: List[str] = []
+        # [(user agents, [(rule length, is_allow, compiled pattern)], crawl delay)]
+        self._groups: List[Tuple[List[str], List[Tuple[int, bool, re.Pattern]], Optional[float]]] = []
+        self._parse(text)
+    
+    def _parse(self, text: str):
+        agents: List[str] = []
+        rules: List[Tuple[int, bool, re.Pattern]] = []
+        delay: Optional[float] = None
+        in_rules = False
+        
+        for line in text.splitlines():
+            line = line.split('#', 1)[0].strip()
+            if ':' not in line:
+                continue
+            field, value = (part.strip() for part in line.split(':', 1))
+            field = field.lower()
+            
+            if field == 'user-agent':
+                if in_rules:
+                    # A user-agent line after rules starts a new group
+                    self._groups.append((agents, rules, delay))
+                    agents, rules, delay, in_rules = [], [], None, False
+                agents.append(value.lower())
+            elif field in ('allow', 'disallow') and agents:
+                in_rules = True
+                if value:
+                    rules.append((len(value), field == 'allow', self._compile(value)))
+            elif field == 'crawl-delay' and agents:
+                in_rules = True
+                try:
+                    delay = max(0.0, float(value))
+                except ValueError:
+                    pass
+            elif field == 'sitemap' and value:
+                self.sitemaps.append(value)
+        
+        if agents:
+            self._groups.append((agents, rules, delay))
+    
+    @staticmethod
+    def _compile(pattern: str) -> re.Pattern:
+        """Rule path pattern as a regex anchored at the path start"""
+        anchored = pattern.endswith('$')
+        body = re.escape(pattern.rstrip('$')).replace(r'\*', '.*')
+        return re.compile(body + ('$' if anchored else ''))
+    
+    def _group(self, user_agent: str) -> Tuple[List[Tuple[int, bool, re.Pattern]], Optional[float]]:
+        """Rules and crawl delay for user agent (most specific matching group, else *)"""
+        token = user_agent.split('/', 1)[0].strip().lower()
+        best, rules, delay = -1, [], None
+        for agents, group_rules, group_delay in self._groups:
+            for agent in agents:
+                if agent == '*':
+                    length = 0
+                elif agent and token.startswith(agent):
+                    length = len(agent)
+                else:
+                    continue
+                if length > best:
+                    best, rules, delay = length, list(group_rules), group_delay
+                elif length == best:
+                    # Groups for the same agent are combined
+                    rules.extend(group_rules)
+                    delay = delay if delay is not None else group_delay
+        return rules, delay
+    
+    def can_fetch(self, user_agent: str, url: str) -> bool:
+        """
+        Check whether user agent may fetch URL
+        
+        The longest matching rule decides; Allow wins ties.
+        """
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if path == '/robots.txt':
+            return True
+        if self.disallow_all:
+            return False
+        if parts.query:
+            path = f'{path}?{parts.query}'
+        
+        rules, _ = self._group(user_agent)
+        verdict, longest = True, -1
+        for length, allow, pattern in rules:
+            if pattern.match(path) and (length > longest or (length == longest and allow)):
+                verdict, longest = allow, length
+        return verdict
+    
+    def crawl_delay(self, user_agent: str) -> Optional[float]:
+        """Crawl-delay seconds for user agent (None if not set)"""
+        return self._group(user_agent)[1]
+
+
+class RobotsCache:
+    """
+    Per-host robots.txt rules with expiry
+    
+    Missing robots.txt (4xx) allows everything; a server error or
+    unreachable host disallows everything (RFC 9309) and is retried
+    after error_ttl.
+    """
+    
+    def __init__(self, ttl: float = 3600, error_ttl: float = 300, max_hosts: int = 10_000):
+        """
+        Initialize robots cache
+        
+        Args:
+            ttl: Seconds to keep fetched rules
+            error_ttl: Seconds to keep the disallow-all fallback after errors
+            max_hosts: Hosts kept (least recently used are dropped)
+        """
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.max_hosts = max_hosts
+        self._entries: "OrderedDict[str, Tuple[float, RobotsRules]]" = OrderedDict()
+    
+    async def get(self, origin: str, fetch: Callable[[str], Awaitable[Dict[str, Any]]]) -> RobotsRules:
+        """
+        Get rules for origin, fetching robots.txt on a miss
+        
+        Args:
+            origin: scheme://host[:port]
+            fetch: Coroutine function returning a WebsiteConnector result for a URL
+        
+        Returns:
+            Parsed rules
+        """
+        entry = self._entries.get(origin)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(origin)
+            return entry[1]
+        
+        try:
+            result = await fetch(f'{origin}/robots.txt')
+            status = result.get('status_code', 0)
+        except Exception as e:
+            print(f"Error fetching robots.txt for {origin}: {str(e)}")
+            result, status = {}, 0
+        
+        if status == 200:
+            rules, ttl = RobotsRules(result.get('html') or ''), self.ttl
+        elif 400 <= status < 500:
+            rules, ttl = RobotsRules(), self.ttl
+        else:
+            rules, ttl = RobotsRules(disallow_all=True), self.error_ttl
+        
+        self._entries[origin] = (time.monotonic() + ttl, rules)
+        self._entries.move_to_end(origin)
+        while len(self._entries) > self.max_hosts:
+            self._entries.popitem(last=False)
+        return rules
+    
+    def clear(self):
+        """Forget all cached rules"""
+        self._entries.clear()
+
+
+# Process-wide cache shared by all crawls
+robots_cache = RobotsCache()
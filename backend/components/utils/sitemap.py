@@ -0,0 +1,137 @@
+"""
+Sitemap Utility
+Incremental parser for sitemap.xml and sitemap index files
+
+Bytes are fed as they arrive, so multi-megabyte (optionally gzipped)
+sitemaps are parsed while streaming, without holding the document or its
+tree in memory.
+"""
+import zlib
+from typing import Any, Dict, List, Optional
+
+from lxml import etree
+
+
+# Protocol limit for one (uncompressed) sitemap file
+DEFAULT_MAX_SITEMAP_BYTES = 50 * 1024 * 1024
+
+DEFAULT_PRIORITY = 0.5
+
+# Media types of sitemap responses (anything else, e.g. an HTML soft-404, is skipped)
+SITEMAP_CONTENT_TYPES = ('application/xml', 'text/xml', 'application/gzip', 'application/x-gzip')
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+class SitemapTooLarge(ValueError):
+    """Decompressed sitemap exceeds max_bytes"""
+    pass
+
+
+class SitemapParser:
+    """
+    Streaming sitemap parser
+    
+    Usage:
+        parser = SitemapParser()
+        async for chunk in response.aiter_bytes():
+            entries.extend(parser.feed(chunk))
+        entries.extend(parser.close())
+    
+    Entries are dicts with loc, priority, lastmod and sitemap (True for
+    entries of a sitemap index, which point at further sitemap files).
+    Gzip input is detected and decompressed on the fly.
+    """
+    
+    def __init__(self, max_bytes: int = DEFAULT_MAX_SITEMAP_BYTES):
+        """
+        Initialize parser
+        
+        Args:
+            max_bytes: Maximum decompressed size (raises SitemapTooLarge beyond it)
+        """
+        self.max_bytes = max_bytes
+        self.bytes_parsed = 0
+        self._decompressor = None
+        self._sniffed = b''
+        # No entity expansion or network access (untrusted XML)
+        self._parser = etree.XMLPullParser(
+            events=('end',),
+            resolve_entities=False,
+            no_network=True,
+            huge_tree=False
+        )
+    
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        """Feed raw (possibly gzipped) bytes, return entries completed so far"""
+        if self._decompressor is None and self._sniffed is not None:
+            # Decide on gzip once the first two bytes are known
+            self._sniffed += chunk
+            if len(self._sniffed) < len(_GZIP_MAGIC):
+                return []
+            chunk, self._sniffed = self._sniffed, None
+            if chunk.startswith(_GZIP_MAGIC):
+                self._decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        
+        if self._decompressor is not None:
+            # Bound output per call so a gzip bomb cannot expand in one step
+            data = self._decompressor.decompress(chunk, self.max_bytes - self.bytes_parsed + 1)
+        else:
+            data = chunk
+        
+        self.bytes_parsed += len(data)
+        if self.bytes_parsed > self.max_bytes:
+            raise SitemapTooLarge(f"Sitemap exceeds {self.max_bytes} bytes")
+        self._parser.feed(data)
+        return self._collect()
+    
+    def close(self) -> List[Dict[str, Any]]:
+        """Finish parsing, return remaining entries"""
+        if self._sniffed:
+            # Fewer bytes than the gzip magic arrived
+            self._parser.feed(self._sniffed)
+            self._sniffed = None
+        try:
+            self._parser.close()
+        except etree.XMLSyntaxError:
+            pass  # Truncated document: keep the entries parsed so far
+        return self._collect()
+    
+    def _collect(self) -> List[Dict[str, Any]]:
+        entries = []
+        try:
+            for _, element in self._parser.read_events():
+                tag = etree.QName(element).localname if isinstance(element.tag, str) else ''
+                if tag not in ('url', 'sitemap'):
+                    continue
+                entry = self._entry(element, tag == 'sitemap')
+                if entry is not None:
+                    entries.append(entry)
+                # Free the finished entry and siblings already processed
+                element.clear()
+                parent = element.getparent()
+                while parent is not None and element.getprevious() is not None:
+                    del parent[0]
+        except etree.XMLSyntaxError:
+            pass  # Malformed tail: entries read before the error are returned
+        return entries
+    
+    @staticmethod
+    def _entry(element, is_index: bool) -> Optional[Dict[str, Any]]:
+        fields = {}
+        for child in element:
+            if isinstance(child.tag, str):
+                fields[etree.QName(child).localname] = (child.text or '').strip()
+        loc = fields.get('loc')
+        if not loc:
+            return None
+        try:
+            priority = min(1.0, max(0.0, float(fields.get('priority', DEFAULT_PRIORITY))))
+        except ValueError:
+            priority = DEFAULT_PRIORITY
+        return {
+            'loc': loc,
+            'priority': priority,
+            'lastmod': fields.get('lastmod', ''),
+            'sitemap': is_index
+        }
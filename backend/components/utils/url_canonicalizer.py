@@ -0,0 +1,201 @@
+"""
+URL Canonicalization Utility
+Normalizes crawl URLs so equivalent links are fetched once, and provides
+seen-sets for frontier deduplication (exact set or bounded Bloom filter)
+"""
+import fnmatch
+import hashlib
+import math
+import re
+from typing import Iterable, Optional, Set
+from urllib.parse import urlsplit, urlunsplit, urldefrag, parse_qsl, urlencode, quote
+
+
+# Query parameters that only carry tracking data (fnmatch patterns)
+DEFAULT_STRIP_PARAMS = (
+    'utm_*', 'gclid', 'fbclid', 'msclkid', 'dclid', 'yclid', 'mc_cid', 'mc_eid',
+    '_ga', '_gl', 'ref_src', 'igshid', 'sessionid', 'phpsessid', 'jsessionid'
+)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# RFC 3986 unreserved characters: the only escapes that are safe to decode
+_UNRESERVED = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+_ESCAPE = re.compile(r'%([0-9A-Fa-f]{2})')
+
+
+def _normalize_escape(match: re.Match) -> str:
+    char = chr(int(match.group(1), 16))
+    return char if char in _UNRESERVED else f'%{match.group(1).upper()}'
+
+
+class URLCanonicalizer:
+    """
+    Maps equivalent URLs to one canonical form
+    
+    - lowercases scheme and host, drops default ports and fragments
+    - drops query parameters matching strip_params (case-insensitive)
+    - sorts remaining query parameters
+    - removes trailing slashes from non-root paths (unless keep_trailing_slash)
+    - normalizes percent-encoding of the path (RFC 3986: escaped unreserved
+      characters are decoded, reserved escapes such as %2F stay encoded)
+    
+    The canonical form is a deduplication key, not a URL to fetch: it may
+    name a different resource than the original (e.g. /blog vs /blog/).
+    """
+    
+    def __init__(
+        self,
+        strip_params: Optional[Iterable[str]] = None,
+        keep_trailing_slash: bool = False,
+        sort_query: bool = True
+    ):
+        """
+        Initialize canonicalizer
+        
+        Args:
+            strip_params: Query parameter patterns to drop (default: DEFAULT_STRIP_PARAMS)
+            keep_trailing_slash: Treat /path and /path/ as different URLs
+            sort_query: Sort query parameters by name
+        """
+        patterns = DEFAULT_STRIP_PARAMS if strip_params is None else strip_params
+        self._exact = {p.lower() for p in patterns if not any(c in p for c in '*?[')}
+        self._wildcards = [p.lower() for p in patterns if any(c in p for c in '*?[')]
+        self.keep_trailing_slash = keep_trailing_slash
+        self.sort_query = sort_query
+    
+    def _strip(self, name: str) -> bool:
+        name = name.lower()
+        return name in self._exact or any(fnmatch.fnmatchcase(name, p) for p in self._wildcards)
+    
+    def __call__(self, url: str) -> str:
+        """
+        Canonicalize URL
+        
+        Args:
+            url: Absolute URL
+        
+        Returns:
+            Canonical URL (input unchanged if it cannot be parsed)
+        """
+        try:
+            parts = urlsplit(url.strip())
+            port = parts.port
+        except ValueError:
+            return url
+        
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or '').rstrip('.')
+        netloc = host
+        if parts.username:
+            userinfo = parts.username + (f':{parts.password}' if parts.password else '')
+            netloc = f'{userinfo}@{host}'
+        if port is not None and port != DEFAULT_PORTS.get(scheme):
+            netloc = f'{netloc}:{port}'
+        
+        path = quote(_ESCAPE.sub(_normalize_escape, parts.path), safe="/:@!$&'()*+,;=-._~%") or '/'
+        if not self.keep_trailing_slash and len(path) > 1:
+            path = path.rstrip('/') or '/'
+        
+        query = [
+            (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not self._strip(name)
+        ]
+        if self.sort_query:
+            query.sort()
+        
+        return urlunsplit((scheme, netloc, path, urlencode(query), ''))
+
+
+# Canonicalizer with default settings
+canonicalize_url = URLCanonicalizer()
+
+
+def fetch_url(url: str) -> str:
+    """
+    URL as it should be requested: fragment dropped, empty path as /
+    
+    Unlike the canonical form, path, trailing slash and query are kept as
+    the page wrote them (relative links resolve against this URL).
+    """
+    url = urldefrag(url.strip())[0]
+    parts = urlsplit(url)
+    if not parts.path and parts.netloc:
+        url = urlunsplit((parts.scheme, parts.netloc, '/', parts.query, ''))
+    return url
+
+
+class BloomFilter:
+    """
+    Fixed-size probabilistic set for very large crawls
+    
+    Memory is fixed by capacity and error_rate (about 1.2 MB for one
+    million URLs at 0.1%). Membership may return false positives (a URL
+    is skipped as already seen), never false negatives.
+    """
+    
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Initialize Bloom filter
+        
+        Args:
+            capacity: Expected number of items
+            error_rate: Target false-positive rate at capacity
+        """
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be >= 1 and 0 < error_rate < 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+    
+    def _positions(self, item: str):
+        # Double hashing (Kirsch-Mitzenmacher) from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+    
+    def add(self, item: str):
+        """Add item"""
+        added = False
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self._bits[byte] & (1 << bit):
+                self._bits[byte] |= 1 << bit
+                added = True
+        if added:
+            self._count += 1
+    
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position // 8] & (1 << (position % 8))
+            for position in self._positions(item)
+        )
+    
+    def __len__(self) -> int:
+        """Approximate number of distinct items added"""
+        return self._count
+
+
+def make_seen_set(kind: str = 'exact', capacity: int = 100_000, error_rate: float = 0.001):
+    """
+    Build a frontier seen-set
+    
+    Args:
+        kind: 'exact' (Python set) or 'bloom' (bounded BloomFilter)
+        capacity: Expected distinct URLs (bloom only)
+        error_rate: False-positive rate at capacity (bloom only)
+    
+    Returns:
+        Object supporting add() and `in`
+    """
+    if kind == 'exact':
+        seen: Set[str] = set()
+        return seen
+    if kind == 'bloom':
+        return BloomFilter(capacity, error_rate)
+    raise ValueError(f"Unknown seen_set: {kind} (expected 'exact' or 'bloom')")
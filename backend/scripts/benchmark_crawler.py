@@ -0,0 +1,123 @@
+"""
+Crawler Throughput Benchmark
+Compares a new httpx.AsyncClient per page (previous WebsiteConnector
+behaviour) with the shared keep-alive client, crawling a synthetic site
+served by a local HTTP/1.1 server
+
+Usage: python scripts/benchmark_crawler.py [--pages 200] [--concurrency 8] [--runs 3]
+"""
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from components.connectors.website_connector import WebsiteConnector, close_shared_clients
+from components.processors.web_crawler import WebCrawler
+
+# Links per synthetic page
+FANOUT = 10
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    """Serves /<n> pages linking to /<n * FANOUT + 1> .. /<n * FANOUT + FANOUT>"""
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    
+    def do_GET(self):
+        try:
+            page = int(self.path.strip('/') or 0)
+        except ValueError:
+            page = 0
+        links = ''.join(
+            f'<a href="/{page * FANOUT + i}">Page {page * FANOUT + i}</a>'
+            for i in range(1, FANOUT + 1)
+        )
+        body = (
+            f'<html><head><title>Page {page}</title>'
+            f'<meta name="description" content="Synthetic page {page}"></head>'
+            f'<body><h1>Page {page}</h1><h2>Section</h2><p>{"lorem ipsum " * 200}</p>{links}</body></html>'
+        ).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class PerRequestClientConnector(WebsiteConnector):
+    """Previous behaviour: open (and tear down) a client for every URL"""
+    
+    async def execute(self, url: str, content_types=None):
+        async with httpx.AsyncClient(
+            timeout=self.timeout,
+            headers={'User-Agent': self.user_agent},
+            follow_redirects=self.follow_redirects
+        ) as client:
+            response = await client.get(url)
+            return {
+                'url': str(response.url),
+                'status_code': response.status_code,
+                'html': response.text,
+                'headers': dict(response.headers),
+                'elapsed_ms': 0
+            }
+
+
+async def crawl(base_url: str, pages: int, concurrency: int, per_request_client: bool) -> float:
+    """Crawl base_url and return pages/sec"""
+    crawler = WebCrawler(config={
+        'max_pages': pages,
+        'concurrency': concurrency,
+        'per_host_concurrency': concurrency,
+        'rate_limit_delay': 0
+    })
+    if per_request_client:
+        crawler.connector = PerRequestClientConnector(crawler.connector.config)
+    
+    start = time.perf_counter()
+    result = await crawler.execute(base_url, max_depth=5)
+    elapsed = time.perf_counter() - start
+    
+    assert result['total_pages'] == pages, result['total_pages']
+    await close_shared_clients()
+    return pages / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=200, help='Pages per crawl')
+    parser.add_argument('--concurrency', type=int, default=8, help='Crawler workers (and per-host slots)')
+    parser.add_argument('--runs', type=int, default=3, help='Crawls per scenario (best is reported)')
+    args = parser.parse_args()
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SiteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}/'
+    
+    print(f"Local site at {base_url}: {args.pages} pages, concurrency {args.concurrency}, {args.runs} runs\n")
+    results = {}
+    for name, per_request_client in (('client per page', True), ('shared keep-alive client', False)):
+        results[name] = max(
+            asyncio.run(crawl(base_url, args.pages, args.concurrency, per_request_client))
+            for _ in range(args.runs)
+        )
+        print(f"  {name:<28} {results[name]:>8.1f} pages/sec")
+    
+    server.shutdown()
+    speedup = results['shared keep-alive client'] / results['client per page']
+    print(f"\nThroughput speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
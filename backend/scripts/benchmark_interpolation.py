@@ -0,0 +1,76 @@
+"""
+Config Interpolation Scaling Benchmark
+Compares the live template context in RecipeEvaluator with the previous
+per-call rebuild (scan every execution_state key at every nesting level)
+on synthetic chain recipes of increasing size
+
+Usage: python scripts/benchmark_interpolation.py [--nodes 50 100 200] [--depth 3]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from agents.recipe_evaluator import RecipeEvaluator
+
+
+class RebuildingEvaluator(RecipeEvaluator):
+    """Previous behaviour: rebuild the template context on every (nested) call"""
+    
+    def _interpolate_config(self, config, context=None):
+        self._context_state = None
+        return super()._interpolate_config(config)
+    
+    def _set_node_output(self, node_id, value):
+        self.execution_state[f"{node_id}.output"] = value
+
+
+def build_recipe(node_count: int, depth: int) -> dict:
+    """Chain recipe: each node reads the previous node's output in a nested config"""
+    nodes = []
+    for i in range(node_count):
+        source = f'{{{{ node_{i - 1}.output.count }}}}' if i else '{{ inputs.seed }}'
+        config = {'limit': source, 'url': '{{ inputs.website_url }}'}
+        for level in range(depth):
+            config = {'level': level, 'nested': config, 'max_pages': '{{ inputs.seed * 2 }}'}
+        nodes.append({'id': f'node_{i}', 'component': 'WebCrawler', 'config': config})
+    edges = [{'from': f'node_{i}', 'to': f'node_{i + 1}'} for i in range(node_count - 1)]
+    return {'id': 'bench', 'name': 'Interpolation Benchmark', 'workflow': {'nodes': nodes, 'edges': edges}}
+
+
+def run(evaluator_class, recipe: dict) -> float:
+    """Interpolate every node config in order, recording outputs as they complete"""
+    evaluator = evaluator_class(recipe_definition=recipe, mock_mode=True)
+    evaluator.execution_state = {'inputs': {'seed': 1, 'website_url': 'https://example.com'}}
+    
+    start = time.perf_counter()
+    for i, node in enumerate(recipe['workflow']['nodes']):
+        evaluator._interpolate_config(node['config'])
+        evaluator._set_node_output(node['id'], {'count': i, 'pages': [f'page-{i}']})
+        evaluator.execution_state[f"{node['id']}.status"] = 'success'
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--nodes', type=int, nargs='+', default=[50, 100, 200], help='Recipe sizes')
+    parser.add_argument('--depth', type=int, default=3, help='Config nesting depth')
+    args = parser.parse_args()
+    
+    print(f"{'nodes':>6} {'rebuild (ms)':>14} {'live (ms)':>11} {'speedup':>9}")
+    for node_count in args.nodes:
+        recipe = build_recipe(node_count, args.depth)
+        # Warm the compiled plan (templates) so only interpolation is timed
+        run(RecipeEvaluator, recipe)
+        
+        rebuild = min(run(RebuildingEvaluator, recipe) for _ in range(3))
+        live = min(run(RecipeEvaluator, recipe) for _ in range(3))
+        print(f"{node_count:>6} {rebuild * 1000:>14.1f} {live * 1000:>11.1f} {rebuild / live:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Template Rendering Micro-Benchmark
+Compares per-run template compilation (template_env.from_string, same
+sandbox and filters, no caching) with the shared template engine using the
+prompt from recipes/seo/site-audit.yaml
+
+Usage: python scripts/benchmark_templates.py [--pages 100] [--runs 200]
+"""
+import argparse
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+import yaml
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from agents.template_engine import get_template, clear_template_cache, configure_bytecode_cache, template_env
+
+
+def load_prompt_template() -> str:
+    """Load analyze_structure prompt from the shipped site-audit recipe"""
+    recipe_path = backend_path.parent / "recipes" / "seo" / "site-audit.yaml"
+    with open(recipe_path, 'r') as f:
+        recipe = yaml.safe_load(f)['recipe']
+    
+    for node in recipe['workflow']['nodes']:
+        if node['id'] == 'analyze_structure':
+            return node['config']['prompt_template']
+    raise ValueError("analyze_structure node not found in site-audit recipe")
+
+
+def build_context(page_count: int) -> dict:
+    """Synthetic crawl output shaped like WebCrawler results"""
+    pages = [
+        {
+            'url': f'https://example.com/page-{i}',
+            'title': f'Page {i} - Example Domain',
+            'meta_description': f'Description for page {i}' if i % 3 else '',
+            'h1_tags': [f'Heading {i}'],
+            'h2_tags': ['About', 'Services', 'Contact'],
+            'word_count': 300 + i,
+            'images': i % 7,
+            'links': [f'https://example.com/page-{j}' for j in range(20)]
+        }
+        for i in range(page_count)
+    ]
+    return {
+        'inputs': {'website_url': 'https://example.com'},
+        'fetch_pages': {'pages': pages, 'total_pages': page_count}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=100, help='Synthetic pages in crawl output')
+    parser.add_argument('--runs', type=int, default=200, help='Timed iterations per scenario')
+    args = parser.parse_args()
+    
+    source = load_prompt_template()
+    context = build_context(args.pages)
+    
+    # Sanity check: both paths render identical prompts
+    assert template_env.from_string(source).render(**context) == get_template(source).render(**context)
+    
+    scenarios = {
+        'compile only (Template per run)': lambda: template_env.from_string(source),
+        'compile only (shared engine)': lambda: get_template(source),
+        'render (Template per run)': lambda: template_env.from_string(source).render(**context),
+        'render (shared engine)': lambda: get_template(source).render(**context),
+    }
+    
+    print(f"site-audit prompt: {len(source)} chars, {args.pages} pages, {args.runs} runs\n")
+    results = {}
+    for name, fn in scenarios.items():
+        seconds = min(timeit.repeat(fn, number=args.runs, repeat=3))
+        results[name] = seconds / args.runs * 1_000_000
+        print(f"  {name:<36} {results[name]:>10.1f} µs/run")
+    
+    # Cold start: new process with an empty in-memory cache, warm bytecode cache on disk
+    with tempfile.TemporaryDirectory() as cache_dir:
+        configure_bytecode_cache(cache_dir)
+        clear_template_cache()
+        get_template(source)  # populate bytecode cache
+        
+        def cold_start():
+            clear_template_cache()
+            get_template(source)
+        
+        seconds = min(timeit.repeat(cold_start, number=args.runs, repeat=3))
+        print(f"  {'cold start (bytecode cache on disk)':<36} {seconds / args.runs * 1_000_000:>10.1f} µs/run")
+        configure_bytecode_cache(None)
+    
+    speedup = results['render (Template per run)'] / results['render (shared engine)']
+    print(f"\nRender speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Test blob stores
+"""
+import os
+import threading
+import time
+import pytest
+from agents.blob_store import BlobRef, LocalBlobStore, InMemoryBlobStore
+
+
+@pytest.fixture(params=['local', 'memory'])
+def store(request, tmp_path):
+    """Each blob store implementation"""
+    if request.param == 'local':
+        return LocalBlobStore(str(tmp_path))
+    return InMemoryBlobStore()
+
+
+class TestBlobStore:
+    """Test BlobStore contract"""
+    
+    def test_roundtrip_json(self, store):
+        """Should return the stored value"""
+        value = {'pages': [{'url': 'https://example.com', 'links': ['a', 'b']}]}
+        ref = store.put_json(value)
+        
+        assert store.get_json(ref) == value
+        assert ref.size > 0
+    
+    def test_content_addressed(self, store):
+        """Should store identical data once under one key"""
+        first = store.put(b'same bytes')
+        second = store.put(b'same bytes')
+        
+        assert first == second
+        assert store.put(b'other bytes') != first
+    
+    def test_missing_blob(self, store):
+        """Should raise KeyError for unknown blobs"""
+        with pytest.raises(KeyError):
+            store.get('0' * 64)
+        assert store.exists('0' * 64) is False
+    
+    def test_delete(self, store):
+        """Should delete blobs"""
+        key = store.put(b'data')
+        store.delete(key)
+        
+        assert store.exists(key) is False
+        store.delete(key)  # no-op
+
+
+class TestLocalBlobStore:
+    """Test local disk specifics"""
+    
+    def test_rejects_path_traversal(self, tmp_path):
+        """Should only accept SHA-256 keys"""
+        store = LocalBlobStore(str(tmp_path))
+        
+        with pytest.raises(KeyError):
+            store.get('../../etc/passwd')
+    
+    def test_prune_expired(self, tmp_path):
+        """Should delete blobs older than max_age"""
+        store = LocalBlobStore(str(tmp_path), max_age=60)
+        old = store.put(b'old')
+        fresh = store.put(b'fresh')
+        past = time.time() - 120
+        os.utime(store._path(old), (past, past))
+        
+        assert store.prune() == 1
+        assert store.exists(old) is False
+        assert store.exists(fresh) is True
+    
+    def test_prune_runs_in_background(self, tmp_path, monkeypatch):
+        """Should prune periodically off the calling thread"""
+        store = LocalBlobStore(str(tmp_path))
+        pruned_on = []
+        monkeypatch.setattr(store, 'prune', lambda: pruned_on.append(threading.current_thread()))
+        
+        for index in range(store.PRUNE_INTERVAL):
+            store.put(str(index).encode())
+        store._pruner.join(timeout=5)
+        
+        assert len(pruned_on) == 1
+        assert pruned_on[0] is not threading.current_thread()
+
+
+class TestBlobRef:
+    """Test handle serialization"""
+    
+    def test_dict_roundtrip(self):
+        """Should survive to_dict/from_dict"""
+        ref = BlobRef(key='a' * 64, size=10)
+        
+        assert BlobRef.is_ref_dict(ref.to_dict())
+        assert BlobRef.from_dict(ref.to_dict()) == ref
+        assert not BlobRef.is_ref_dict({'pages': []})
@@ -0,0 +1,180 @@
+"""
+Test Recipe Compiler - CompiledRecipe plans and the shared LRU plan cache
+"""
+import pytest
+from unittest.mock import patch
+from agents.recipe_compiler import CompiledRecipe, RecipePlanCache, recipe_plan_cache
+from agents.recipe_evaluator import RecipeEvaluator
+
+
+COMPONENTS = RecipeEvaluator.COMPONENTS.keys()
+
+
+@pytest.fixture
+def recipe():
+    """Minimal two-node recipe"""
+    return {
+        'id': 'compiled-recipe',
+        'name': 'Compiled Recipe',
+        'version': '1.0.0',
+        'workflow': {
+            'nodes': [
+                {'id': 'crawl', 'component': 'WebCrawler', 'config': {'max_depth': '{{ inputs.depth }}'}},
+                {
+                    'id': 'analyze',
+                    'component': 'LLMProcessor',
+                    'config': {'prompt_template': 'Pages: {{ crawl.total_pages }}'},
+                    'depends_on': ['crawl']
+                }
+            ],
+            'edges': [{'from': 'crawl', 'to': 'analyze'}]
+        }
+    }
+
+
+class TestCompiledRecipe:
+    """Test plan compilation"""
+    
+    def test_compiles_plan(self, recipe):
+        """Should precompute order, dependencies and templates"""
+        plan = CompiledRecipe(recipe, COMPONENTS)
+        
+        assert plan.is_valid
+        assert plan.execution_order == ['crawl', 'analyze']
+        assert plan.dependencies == {'crawl': set(), 'analyze': {'crawl'}}
+        assert '{{ inputs.depth }}' in plan.templates
+        assert 'Pages: {{ crawl.total_pages }}' in plan.templates
+    
+    def test_schema_error_recorded(self, recipe):
+        """Should keep structural plan even when Pydantic schema fails"""
+        plan = CompiledRecipe(recipe, COMPONENTS)
+        
+        assert plan.schema is None
+        assert plan.schema_error
+    
+    def test_invalid_recipe(self):
+        """Should record validation errors instead of raising"""
+        plan = CompiledRecipe({'id': 'x', 'name': 'X'}, COMPONENTS)
+        
+        assert not plan.is_valid
+        assert plan.validation_errors == ['Missing required key: workflow']
+        assert plan.execution_order == []
+    
+    def test_get_template_reuses_precompiled(self, recipe):
+        """Should hand out the same Template object for known sources"""
+        plan = CompiledRecipe(recipe, COMPONENTS)
+        
+        assert plan.get_template('{{ inputs.depth }}') is plan.templates['{{ inputs.depth }}']
+        assert plan.get_template('{{ other }}').render(other=1) == '1'
+        assert '{{ other }}' not in plan.templates
+
+
+class TestExecutionPlan:
+    """Test dead-node elimination planning"""
+    
+    @pytest.fixture
+    def branching(self, recipe):
+        recipe['workflow']['nodes'].append(
+            {'id': 'extra', 'component': 'LLMProcessor', 'config': {'prompt_template': 'x'}, 'depends_on': ['crawl']}
+        )
+        recipe['workflow']['nodes'].append(
+            {'id': 'meter', 'component': 'SubscriptionTracker', 'config': {}, 'depends_on': ['extra']}
+        )
+        recipe['workflow']['output'] = {'source': 'analyze.output'}
+        return recipe
+    
+    def test_drops_unused_nodes(self, branching):
+        """Should keep output ancestors and reroute mandatory nodes to run last"""
+        plan = CompiledRecipe(branching, COMPONENTS)
+        order, dependencies = plan.execution_plan()
+        
+        assert order == ['crawl', 'analyze', 'meter']
+        assert dependencies['meter'] == {'crawl', 'analyze'}
+    
+    def test_target_node(self, branching):
+        """Should plan only the target's ancestors plus mandatory nodes"""
+        plan = CompiledRecipe(branching, COMPONENTS)
+        order, _ = plan.execution_plan('extra')
+        
+        assert order == ['crawl', 'extra', 'meter']
+        assert plan.execution_plan('extra') is plan.execution_plan('extra')
+    
+    def test_unknown_target(self, branching):
+        """Should reject targets that are not nodes"""
+        plan = CompiledRecipe(branching, COMPONENTS)
+        
+        with pytest.raises(ValueError):
+            plan.execution_plan('missing')
+    
+    def test_without_output_node(self, recipe):
+        """Should plan every node when the output source is not a node"""
+        plan = CompiledRecipe(recipe, COMPONENTS)
+        
+        assert plan.execution_plan()[0] == ['crawl', 'analyze']
+
+
+class TestRecipePlanCache:
+    """Test shared LRU cache"""
+    
+    def test_cache_hit(self, recipe):
+        """Should compile once per recipe content"""
+        cache = RecipePlanCache()
+        
+        first = cache.get_or_compile(recipe, COMPONENTS)
+        second = cache.get_or_compile({'recipe': recipe}, COMPONENTS)
+        
+        assert first is second
+        assert cache.get_stats()['hits'] == 1
+        assert cache.get_stats()['misses'] == 1
+    
+    def test_content_change_recompiles(self, recipe):
+        """Should key plans by version and content hash"""
+        cache = RecipePlanCache()
+        
+        first = cache.get_or_compile(recipe, COMPONENTS)
+        recipe['workflow']['nodes'][0]['config']['max_depth'] = 2
+        second = cache.get_or_compile(recipe, COMPONENTS)
+        recipe['version'] = '1.1.0'
+        third = cache.get_or_compile(recipe, COMPONENTS)
+        
+        assert first is not second
+        assert second is not third
+        # Mutating the caller's dict must not leak into the cached plan
+        assert first.nodes['crawl']['config']['max_depth'] == '{{ inputs.depth }}'
+    
+    def test_lru_eviction(self, recipe):
+        """Should evict least recently used plans beyond max_size"""
+        cache = RecipePlanCache(max_size=2)
+        
+        plans = []
+        for version in ['1.0.0', '1.1.0', '1.2.0']:
+            plans.append(cache.get_or_compile(dict(recipe, version=version), COMPONENTS))
+        
+        assert cache.get_stats()['size'] == 2
+        assert cache.get_or_compile(dict(recipe, version='1.0.0'), COMPONENTS) is not plans[0]
+
+
+class TestEvaluatorIntegration:
+    """Test RecipeEvaluator uses the shared plan"""
+    
+    @pytest.mark.asyncio
+    async def test_evaluators_share_plan(self, recipe):
+        """Should not recompile across executions of the same recipe"""
+        recipe_plan_cache.clear()
+        
+        with patch('agents.recipe_compiler.build_execution_order', wraps=__import__(
+                'agents.recipe_compiler', fromlist=['build_execution_order']).build_execution_order) as build:
+            for _ in range(3):
+                evaluator = RecipeEvaluator(recipe_definition=recipe, mock_mode=True)
+                await evaluator.execute({'website_url': 'https://example.com', 'depth': 1})
+        
+        assert build.call_count == 1
+        assert recipe_plan_cache.get_stats()['hits'] == 2
+    
+    def test_evaluator_from_compiled_recipe(self, recipe):
+        """Should accept a prebuilt plan instead of a definition"""
+        plan = CompiledRecipe(recipe, COMPONENTS)
+        evaluator = RecipeEvaluator(compiled_recipe=plan, mock_mode=True)
+        
+        assert evaluator.compiled_recipe is plan
+        assert evaluator.recipe['id'] == 'compiled-recipe'
@@ -584,3 +584,1034 @@ class TestMetricsTracking:
             await evaluator.execute(inputs)
             
             assert evaluator.metrics['nodes_executed'] == 2
+
+
+@pytest.fixture
+def mock_recipe_fan_in():
+    """Recipe with two independent branches feeding one node"""
+    return {
+        'id': 'fan-in-recipe',
+        'name': 'Fan-in Recipe',
+        'workflow': {
+            'nodes': [
+                {'id': 'crawl', 'component': 'WebCrawler', 'config': {}},
+                {'id': 'keywords', 'component': 'WebCrawler', 'config': {}},
+                {
+                    'id': 'analyze',
+                    'component': 'LLMProcessor',
+                    'config': {'prompt_template': 'Analyze'},
+                    'depends_on': ['crawl', 'keywords']
+                }
+            ],
+            'edges': [
+                {'from': 'crawl', 'to': 'analyze'},
+                {'from': 'keywords', 'to': 'analyze'}
+            ]
+        }
+    }
+
+
+class TestConcurrentScheduling:
+    """Test ready-queue DAG scheduler"""
+    
+    @staticmethod
+    def _slow_component(delay: float, log: list):
+        """Build a fake _execute_component that records start/finish order"""
+        import asyncio
+        
+        async def run(component, component_name, config, node_inputs):
+            log.append(('start', tuple(sorted(node_inputs))))
+            await asyncio.sleep(delay)
+            log.append(('end', tuple(sorted(node_inputs))))
+            return {'data': 'ok'}
+        return run
+    
+    @pytest.mark.asyncio
+    async def test_independent_branches_run_concurrently(self, mock_recipe_fan_in):
+        """Should overlap independent nodes instead of serializing them"""
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_fan_in, mock_mode=True)
+        log = []
+        
+        with patch.object(evaluator, '_execute_component', side_effect=self._slow_component(0.05, log)):
+            await evaluator.execute({'website_url': 'https://example.com'})
+        
+        # Both branches start before either finishes
+        assert [event for event, _ in log[:2]] == ['start', 'start']
+        # Fan-in node waits for both predecessors
+        assert log[-2] == ('start', ('crawl', 'keywords'))
+        assert evaluator.metrics['nodes_executed'] == 3
+    
+    @pytest.mark.asyncio
+    async def test_max_parallelism_serializes(self, mock_recipe_fan_in):
+        """Should respect workflow.max_parallelism"""
+        mock_recipe_fan_in['workflow']['max_parallelism'] = 1
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_fan_in, mock_mode=True)
+        log = []
+        
+        with patch.object(evaluator, '_execute_component', side_effect=self._slow_component(0.01, log)):
+            await evaluator.execute({'website_url': 'https://example.com'})
+        
+        assert [event for event, _ in log] == ['start', 'end'] * 3
+    
+    @pytest.mark.asyncio
+    async def test_depends_on_without_edges(self, mock_recipe_fan_in):
+        """Should honour depends_on even when edges are missing"""
+        mock_recipe_fan_in['workflow']['edges'] = []
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_fan_in, mock_mode=True)
+        log = []
+        
+        with patch.object(evaluator, '_execute_component', side_effect=self._slow_component(0.01, log)):
+            await evaluator.execute({'website_url': 'https://example.com'})
+        
+        assert log[-2] == ('start', ('crawl', 'keywords'))
+    
+    @pytest.mark.asyncio
+    async def test_critical_failure_cancels_siblings(self, mock_recipe_fan_in):
+        """Should cancel in-flight branches when a critical node fails"""
+        import asyncio
+        mock_recipe_fan_in['workflow']['nodes'][0]['config'] = {'slow': True}
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_fan_in, mock_mode=True)
+        cancelled = []
+        
+        async def run(component, component_name, config, node_inputs):
+            if config.get('slow'):
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    cancelled.append('crawl')
+                    raise
+            raise Exception("Keyword fetch failed")
+        
+        with patch.object(evaluator, '_execute_component', side_effect=run):
+            with pytest.raises(Exception, match="Keyword fetch failed"):
+                await evaluator.execute({'website_url': 'https://example.com'})
+        
+        assert cancelled == ['crawl']
+        assert 'analyze.output' not in evaluator.execution_state
+    
+    @pytest.mark.asyncio
+    async def test_dependency_cycle_detected(self):
+        """Should refuse to run a cyclic workflow"""
+        recipe = {
+            'id': 'cycle', 'name': 'Cycle',
+            'workflow': {
+                'nodes': [
+                    {'id': 'a', 'component': 'WebCrawler', 'depends_on': ['b']},
+                    {'id': 'b', 'component': 'WebCrawler', 'depends_on': ['a']}
+                ],
+                'edges': []
+            }
+        }
+        evaluator = RecipeEvaluator(recipe_definition=recipe, mock_mode=True)
+        
+        with pytest.raises(ValueError, match="unresolvable dependencies"):
+            await evaluator.execute({})
+
+
+class TestNodeMemoization:
+    """Test opt-in node result memoization (cache_ttl)"""
+    
+    @pytest.fixture
+    def memo_recipe(self, mock_recipe_simple):
+        """Simple recipe with memoized crawler node"""
+        mock_recipe_simple['workflow']['nodes'][0]['cache_ttl'] = 300
+        return mock_recipe_simple
+    
+    @staticmethod
+    def _evaluator(recipe, cache):
+        return RecipeEvaluator(recipe_definition=recipe, mock_mode=True, cache_manager=cache)
+    
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_component(self, memo_recipe):
+        """Should serve repeated node executions from CacheManager"""
+        from components.utils.cache_manager import CacheManager
+        cache = CacheManager()
+        inputs = {'website_url': 'https://example.com', 'max_depth': 2}
+        
+        first = self._evaluator(memo_recipe, cache)
+        with patch.object(first, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.side_effect = [{'pages': ['page1']}, {'content': 'Analysis'}]
+            await first.execute(inputs)
+        assert first.metrics['cache_misses'] == 1
+        assert first.metrics['cache_hits'] == 0
+        
+        second = self._evaluator(memo_recipe, cache)
+        with patch.object(second, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.return_value = {'content': 'Analysis'}
+            await second.execute(inputs)
+            
+            # Only the uncached LLM node ran
+            assert mock_comp.call_count == 1
+        
+        assert second.metrics['cache_hits'] == 1
+        assert second.metrics['nodes_executed'] == 2
+        assert second.execution_state['node1.output'] == {'pages': ['page1']}
+        assert second.execution_state['node1.cached'] is True
+    
+    @pytest.mark.asyncio
+    async def test_different_inputs_miss(self, memo_recipe):
+        """Should key memoized results by recipe inputs"""
+        from components.utils.cache_manager import CacheManager
+        cache = CacheManager()
+        
+        for url in ['https://a.example.com', 'https://b.example.com']:
+            evaluator = self._evaluator(memo_recipe, cache)
+            with patch.object(evaluator, '_execute_component', new_callable=AsyncMock) as mock_comp:
+                mock_comp.return_value = {'data': url}
+                await evaluator.execute({'website_url': url})
+            assert evaluator.metrics['cache_hits'] == 0
+    
+    @pytest.mark.asyncio
+    async def test_cached_result_isolated_from_mutation(self, memo_recipe):
+        """Should not let callers mutate the cached value"""
+        from components.utils.cache_manager import CacheManager
+        cache = CacheManager()
+        inputs = {'website_url': 'https://example.com'}
+        
+        first = self._evaluator(memo_recipe, cache)
+        with patch.object(first, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.return_value = {'pages': ['page1']}
+            await first.execute(inputs)
+        first.execution_state['node1.output']['pages'].append('mutated')
+        
+        second = self._evaluator(memo_recipe, cache)
+        with patch.object(second, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.return_value = {}
+            await second.execute(inputs)
+        
+        assert second.execution_state['node1.output'] == {'pages': ['page1']}
+    
+    @pytest.mark.asyncio
+    async def test_no_cache_ttl_not_memoized(self, mock_recipe_simple):
+        """Should only memoize nodes that opt in"""
+        from components.utils.cache_manager import CacheManager
+        cache = CacheManager()
+        evaluator = self._evaluator(mock_recipe_simple, cache)
+        
+        with patch.object(evaluator, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.return_value = {'data': 'test'}
+            await evaluator.execute({'website_url': 'https://example.com'})
+        
+        assert evaluator.metrics['cache_hits'] == 0
+        assert evaluator.metrics['cache_misses'] == 0
+        assert cache._local_cache == {}
+
+
+class TestCheckpointResume:
+    """Test checkpointing and resume of failed executions"""
+    
+    @staticmethod
+    def _evaluator(recipe, store, checkpoint_id='task-1'):
+        return RecipeEvaluator(
+            recipe_definition=recipe,
+            mock_mode=True,
+            checkpoint_id=checkpoint_id,
+            checkpoint_store=store
+        )
+    
+    @pytest.fixture
+    def store(self):
+        from agents.checkpoint_store import CheckpointStore
+        from components.utils.cache_manager import CacheManager
+        return CheckpointStore(cache_manager=CacheManager())
+    
+    @pytest.mark.asyncio
+    async def test_resume_skips_completed_nodes(self, mock_recipe_simple, store):
+        """Should only re-run nodes that did not complete before the failure"""
+        inputs = {'website_url': 'https://example.com', 'max_depth': 2}
+        
+        first = self._evaluator(mock_recipe_simple, store)
+        with patch.object(first, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.side_effect = [{'pages': ['page1']}, Exception("LLM unavailable")]
+            with pytest.raises(Exception, match="LLM unavailable"):
+                await first.execute(inputs)
+        
+        checkpoint = await store.load('task-1')
+        assert checkpoint['completed_nodes'] == ['node1']
+        assert checkpoint['inputs'] == inputs
+        
+        second = self._evaluator(mock_recipe_simple, store)
+        with patch.object(second, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.return_value = {'content': 'Analysis'}
+            result = await second.resume('task-1')
+            
+            # Only the failed LLM node ran, with the restored crawler output
+            assert mock_comp.call_count == 1
+            assert mock_comp.call_args[0][3] == {'node1': {'pages': ['page1']}}
+        
+        assert result['success'] is True
+        assert result['metrics']['nodes_resumed'] == 1
+        assert second.execution_state['node1.output'] == {'pages': ['page1']}
+        # Checkpoint discarded after success
+        assert await store.load('task-1') is None
+    
+    @pytest.mark.asyncio
+    async def test_resume_with_output_node(self, mock_recipe_simple, store):
+        """Should honour output_node when resuming"""
+        first = self._evaluator(mock_recipe_simple, store)
+        with patch.object(first, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.side_effect = [{'pages': ['page1']}, Exception("LLM unavailable")]
+            with pytest.raises(Exception, match="LLM unavailable"):
+                await first.execute({'website_url': 'https://example.com'})
+        
+        second = self._evaluator(mock_recipe_simple, store)
+        with patch.object(second, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            result = await second.resume('task-1', output_node='node1')
+            
+            # node1 was restored and node2 is not needed for its output
+            mock_comp.assert_not_called()
+        
+        assert result['output'] == {'pages': ['page1']}
+        assert second.execution_state['node2.status'] == 'skipped'
+    
+    @pytest.mark.asyncio
+    async def test_resume_missing_checkpoint(self, mock_recipe_simple, store):
+        """Should raise CheckpointError when no checkpoint exists"""
+        from agents.checkpoint_store import CheckpointError
+        evaluator = self._evaluator(mock_recipe_simple, store)
+        
+        with pytest.raises(CheckpointError, match="not found"):
+            await evaluator.resume('task-1')
+    
+    @pytest.mark.asyncio
+    async def test_resume_rejects_changed_recipe(self, mock_recipe_simple, store):
+        """Should not resume a checkpoint produced by a different recipe version"""
+        from agents.checkpoint_store import CheckpointError
+        first = self._evaluator(mock_recipe_simple, store)
+        with patch.object(first, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.side_effect = [{'pages': []}, Exception("boom")]
+            with pytest.raises(Exception):
+                await first.execute({'website_url': 'https://example.com'})
+        
+        mock_recipe_simple['workflow']['nodes'][1]['config']['prompt_template'] = 'Changed'
+        second = self._evaluator(mock_recipe_simple, store)
+        
+        with pytest.raises(CheckpointError, match="different recipe version"):
+            await second.resume('task-1')
+    
+    @pytest.mark.asyncio
+    async def test_no_checkpoint_id_no_checkpoint(self, mock_recipe_simple, store):
+        """Should not write checkpoints unless checkpoint_id is set"""
+        evaluator = self._evaluator(mock_recipe_simple, store, checkpoint_id=None)
+        with patch.object(evaluator, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.side_effect = [{'pages': []}, Exception("boom")]
+            with pytest.raises(Exception):
+                await evaluator.execute({'website_url': 'https://example.com'})
+        
+        assert store.cache._local_cache == {}
+
+
+class TestExecuteStream:
+    """Test streaming execution events"""
+    
+    @pytest.mark.asyncio
+    async def test_event_sequence(self, mock_recipe_simple):
+        """Should yield start, per-node and final events in order"""
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_simple, mock_mode=True)
+        
+        events = [event async for event in evaluator.execute_stream({'website_url': 'https://example.com'})]
+        names = [event['event'] for event in events]
+        
+        assert names[0] == 'execution_started'
+        assert names[-1] == 'execution_finished'
+        assert events[-1]['result']['success'] is True
+        
+        node_events = [(e['event'], e['node_id']) for e in events if e['event'].startswith('node_')]
+        assert node_events == [
+            ('node_started', 'node1'), ('node_finished', 'node1'),
+            ('node_started', 'node2'), ('node_finished', 'node2')
+        ]
+        finished = [e for e in events if e['event'] == 'node_finished']
+        assert all(e['status'] == 'success' and 'elapsed_ms' in e for e in finished)
+        
+        # Mock LLM emits its response as a token delta tagged with the node
+        tokens = [e for e in events if e['event'] == 'llm_token']
+        assert tokens and tokens[0]['node_id'] == 'node2'
+    
+    @pytest.mark.asyncio
+    async def test_component_events_forwarded(self, mock_recipe_simple):
+        """Should forward events emitted by components"""
+        from components.base import emit_event
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_simple, mock_mode=True)
+        
+        async def run(component, component_name, config, node_inputs):
+            emit_event('page_fetched', url='https://example.com')
+            return {'data': 'ok'}
+        
+        with patch.object(evaluator, '_execute_component', side_effect=run):
+            events = [event async for event in evaluator.execute_stream({'website_url': 'https://example.com'})]
+        
+        pages = [e for e in events if e['event'] == 'page_fetched']
+        assert [e['node_id'] for e in pages] == ['node1', 'node2']
+    
+    @pytest.mark.asyncio
+    async def test_failure_event(self, mock_recipe_simple):
+        """Should end with execution_failed instead of raising"""
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_simple, mock_mode=True)
+        
+        with patch.object(evaluator, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.side_effect = Exception("Crawl failed")
+            events = [event async for event in evaluator.execute_stream({'website_url': 'https://example.com'})]
+        
+        assert events[-1] == {'event': 'execution_failed', 'error': 'Crawl failed'}
+        assert any(e['event'] == 'node_finished' and e['status'] == 'failed' for e in events)
+    
+    @pytest.mark.asyncio
+    async def test_closing_stream_cancels_execution(self, mock_recipe_simple):
+        """Should cancel the run when the consumer goes away"""
+        import asyncio
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_simple, mock_mode=True)
+        cancelled = []
+        
+        async def run(component, component_name, config, node_inputs):
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+        
+        with patch.object(evaluator, '_execute_component', side_effect=run):
+            stream = evaluator.execute_stream({'website_url': 'https://example.com'})
+            async for event in stream:
+                if event['event'] == 'node_started':
+                    break
+            await stream.aclose()
+        
+        assert cancelled == [True]
+    
+    @pytest.mark.asyncio
+    async def test_execute_without_listener(self, mock_recipe_simple):
+        """Should not emit anything for plain execute()"""
+        from components.base import get_event_sink
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_simple, mock_mode=True)
+        
+        result = await evaluator.execute({'website_url': 'https://example.com'})
+        
+        assert result['success'] is True
+        assert get_event_sink() is None
+
+
+class TestExecuteMany:
+    """Test batch execution over many inputs"""
+    
+    @pytest.mark.asyncio
+    async def test_dedupes_identical_inputs(self, mock_recipe_simple):
+        """Should run identical inputs once and report every position"""
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_simple, mock_mode=True)
+        inputs_list = [
+            {'website_url': 'https://a.example.com'},
+            {'website_url': 'https://b.example.com'},
+            {'website_url': 'https://a.example.com'}
+        ]
+        
+        items = [item async for item in evaluator.execute_many(inputs_list, concurrency=2)]
+        
+        assert len(items) == 2
+        indices = sorted(item['indices'] for item in items)
+        assert indices == [[0, 2], [1]]
+        assert all(item['success'] for item in items)
+        assert all(item['result']['metrics']['nodes_executed'] == 2 for item in items)
+    
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency(self, mock_recipe_simple):
+        """Should never run more than `concurrency` items at once"""
+        import asyncio
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_simple, mock_mode=True)
+        running = []
+        peak = []
+        
+        async def run(component, component_name, config, node_inputs):
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+            return {'data': 'ok'}
+        
+        inputs_list = [{'website_url': f'https://{i}.example.com'} for i in range(6)]
+        with patch.object(RecipeEvaluator, '_execute_component', side_effect=run):
+            items = [item async for item in evaluator.execute_many(inputs_list, concurrency=2)]
+        
+        assert len(items) == 6
+        assert max(peak) <= 2
+    
+    @pytest.mark.asyncio
+    async def test_reuses_component_instances(self, mock_recipe_simple):
+        """Should share component instances across items"""
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_simple, mock_mode=True)
+        seen = []
+        
+        async def run(component, component_name, config, node_inputs):
+            seen.append(id(component))
+            return {'data': 'ok'}
+        
+        inputs_list = [{'website_url': f'https://{i}.example.com'} for i in range(4)]
+        with patch.object(RecipeEvaluator, '_execute_component', side_effect=run):
+            [item async for item in evaluator.execute_many(inputs_list)]
+        
+        # One crawler and one LLM instance serve all 8 node executions
+        assert len(seen) == 8
+        assert len(set(seen)) == 2
+    
+    @pytest.mark.asyncio
+    async def test_item_failure_isolated(self, mock_recipe_simple):
+        """Should report failed items without aborting the batch"""
+        mock_recipe_simple['workflow']['nodes'][0]['config']['url'] = '{{ inputs.website_url }}'
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_simple, mock_mode=True)
+        
+        async def run(component, component_name, config, node_inputs):
+            if 'bad' in config.get('url', ''):
+                raise Exception("Site unreachable")
+            return {'data': 'ok'}
+        
+        inputs_list = [{'website_url': 'https://ok.example.com'}, {'website_url': 'https://bad.example.com'}]
+        
+        with patch.object(RecipeEvaluator, '_execute_component', side_effect=run):
+            items = [item async for item in evaluator.execute_many(inputs_list)]
+        
+        by_index = {item['indices'][0]: item for item in items}
+        assert by_index[0]['success'] is True
+        assert by_index[1]['success'] is False
+        assert by_index[1]['error'] == 'Site unreachable'
+
+
+class TestDeadlines:
+    """Test recipe deadlines and per-node timeouts"""
+    
+    @staticmethod
+    def _hanging_component(log: list):
+        """Fake _execute_component whose crawler never finishes"""
+        import asyncio
+        
+        async def run(component, component_name, config, node_inputs):
+            if component_name == 'WebCrawler':
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    log.append('cancelled')
+                    raise
+            return {'data': 'ok'}
+        return run
+    
+    @pytest.mark.asyncio
+    async def test_node_timeout_cancels_node(self, mock_recipe_simple):
+        """Should cancel a node exceeding timeout_ms and report timeout status"""
+        from agents.recipe_evaluator import RecipeTimeoutError
+        mock_recipe_simple['workflow']['nodes'][0]['timeout_ms'] = 50
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_simple, mock_mode=True)
+        log = []
+        
+        with patch.object(evaluator, '_execute_component', side_effect=self._hanging_component(log)):
+            with pytest.raises(RecipeTimeoutError) as exc_info:
+                await evaluator.execute({'website_url': 'https://example.com'})
+        
+        assert exc_info.value.node_id == 'node1'
+        assert log == ['cancelled']
+        assert evaluator.execution_state['node1.status'] == 'timeout'
+        assert evaluator.metrics['execution_status'] == 'timeout'
+        assert evaluator.metrics['nodes_timed_out'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_timeout_tracked_as_timeout(self, mock_recipe_simple):
+        """Should report timeout status to SubscriptionTracker"""
+        from agents.recipe_evaluator import RecipeTimeoutError
+        mock_recipe_simple['workflow']['nodes'][0]['timeout_ms'] = 20
+        evaluator = RecipeEvaluator(
+            recipe_definition=mock_recipe_simple,
+            mock_mode=True,
+            tracking_config={'agent_instance_id': 'a', 'recipe_id': 'r', 'agency_id': 'x'}
+        )
+        
+        with patch.object(evaluator, '_execute_component', side_effect=self._hanging_component([])):
+            with patch.object(evaluator.subscription_tracker, 'execute', new_callable=AsyncMock) as mock_track:
+                with pytest.raises(RecipeTimeoutError):
+                    await evaluator.execute({'website_url': 'https://example.com'})
+        
+        assert mock_track.call_args[0][0]['status'] == 'timeout'
+    
+    @pytest.mark.asyncio
+    async def test_allow_failure_node_timeout_continues(self, mock_recipe_simple):
+        """Should continue past a timed-out node that allows failure"""
+        mock_recipe_simple['workflow']['nodes'][0]['timeout_ms'] = 20
+        mock_recipe_simple['workflow']['nodes'][0]['allow_failure'] = True
+        mock_recipe_simple['workflow']['nodes'][1]['config']['prompt_template'] = 'Analyze {{ inputs.website_url }}'
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_simple, mock_mode=True)
+        
+        with patch.object(evaluator, '_execute_component', side_effect=self._hanging_component([])):
+            result = await evaluator.execute({'website_url': 'https://example.com'})
+        
+        assert result['success'] is True
+        assert evaluator.execution_state['node1.status'] == 'timeout'
+        assert evaluator.execution_state['node2.status'] == 'success'
+    
+    @pytest.mark.asyncio
+    async def test_recipe_deadline(self, mock_recipe_simple):
+        """Should enforce workflow.timeout_ms even on allow_failure nodes"""
+        from agents.recipe_evaluator import RecipeTimeoutError
+        mock_recipe_simple['workflow']['timeout_ms'] = 50
+        mock_recipe_simple['workflow']['nodes'][0]['allow_failure'] = True
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_simple, mock_mode=True)
+        
+        with patch.object(evaluator, '_execute_component', side_effect=self._hanging_component([])):
+            with pytest.raises(RecipeTimeoutError):
+                await evaluator.execute({'website_url': 'https://example.com'})
+    
+    @pytest.mark.asyncio
+    async def test_components_see_remaining_budget(self, mock_recipe_simple):
+        """Should expose the tighter of node and recipe budget to components"""
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_simple, mock_mode=True, timeout_ms=60000)
+        mock_recipe_simple['workflow']['nodes'][1]['timeout_ms'] = 2000
+        budgets = {}
+        
+        async def run(component, component_name, config, node_inputs):
+            budgets[component_name] = component.remaining_time()
+            return {'data': 'ok'}
+        
+        with patch.object(evaluator, '_execute_component', side_effect=run):
+            await evaluator.execute({'website_url': 'https://example.com'})
+        
+        assert 50 < budgets['WebCrawler'] <= 60
+        assert 0 < budgets['LLMProcessor'] <= 2
+    
+    def test_llm_max_tokens_shrinks_with_budget(self):
+        """Should cap max_tokens to what fits in the remaining time"""
+        import time
+        from components.base import set_deadline
+        from components.processors.llm_processor import LLMProcessor
+        llm = LLMProcessor({'max_tokens': 2048, 'tokens_per_second': 100}, mock_mode=True)
+        
+        assert llm._budget_max_tokens() == 2048
+        token = set_deadline(time.monotonic() + 2)
+        try:
+            assert 150 <= llm._budget_max_tokens() <= 200
+        finally:
+            from components.base import _deadline
+            _deadline.reset(token)
+    
+    @pytest.mark.asyncio
+    async def test_crawler_stops_when_budget_exhausted(self):
+        """Should return partial pages instead of fetching past the deadline"""
+        import time
+        from components.base import set_deadline, _deadline
+        from components.processors.web_crawler import WebCrawler
+        crawler = WebCrawler({'deadline_reserve': 1.0})
+        crawler.connector.execute = AsyncMock()
+        
+        token = set_deadline(time.monotonic() + 0.5)
+        try:
+            result = await crawler.execute('https://example.com')
+        finally:
+            _deadline.reset(token)
+        
+        crawler.connector.execute.assert_not_called()
+        assert result['deadline_reached'] is True
+        assert result['pages'] == []
+
+
+class TestBlobOffload:
+    """Test out-of-line storage of large node outputs"""
+    
+    @pytest.fixture
+    def blob_store(self):
+        from agents.blob_store import InMemoryBlobStore
+        return InMemoryBlobStore()
+    
+    @staticmethod
+    def _evaluator(recipe, blob_store, **kwargs):
+        return RecipeEvaluator(
+            recipe_definition=recipe,
+            mock_mode=True,
+            blob_store=blob_store,
+            blob_threshold_bytes=100,
+            **kwargs
+        )
+    
+    @pytest.mark.asyncio
+    async def test_large_output_stored_by_reference(self, mock_recipe_simple, blob_store):
+        """Should keep a BlobRef in execution_state and pass real data downstream"""
+        from agents.blob_store import BlobRef
+        pages = {'pages': [{'url': f'https://example.com/{i}'} for i in range(20)]}
+        evaluator = self._evaluator(mock_recipe_simple, blob_store)
+        
+        with patch.object(evaluator, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.side_effect = [pages, {'content': 'ok'}]
+            result = await evaluator.execute({'website_url': 'https://example.com'})
+            
+            # Downstream node received the materialized output
+            assert mock_comp.call_args_list[1][0][3] == {'node1': pages}
+        
+        ref = result['execution_state']['node1.output']
+        assert isinstance(ref, BlobRef)
+        assert blob_store.get_json(ref) == pages
+        assert result['metrics']['blobs_stored'] == 1
+        # Small outputs stay inline
+        assert result['execution_state']['node2.output'] == {'content': 'ok'}
+    
+    @pytest.mark.asyncio
+    async def test_blob_written_off_event_loop(self, mock_recipe_simple, blob_store):
+        """Should serialize and write large outputs in a worker thread"""
+        import threading
+        pages = {'pages': [{'url': f'https://example.com/{i}'} for i in range(20)]}
+        evaluator = self._evaluator(mock_recipe_simple, blob_store)
+        put_threads = []
+        put = blob_store.put
+        
+        def recording_put(data):
+            put_threads.append(threading.get_ident())
+            return put(data)
+        
+        with patch.object(evaluator, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.side_effect = [pages, {'content': 'ok'}]
+            with patch.object(blob_store, 'put', side_effect=recording_put):
+                await evaluator.execute({'website_url': 'https://example.com'})
+        
+        assert len(put_threads) == 1
+        assert put_threads[0] != threading.get_ident()
+    
+    @pytest.mark.asyncio
+    async def test_templates_materialize_lazily(self, mock_recipe_simple, blob_store):
+        """Should load a blob only when a template references it"""
+        mock_recipe_simple['workflow']['nodes'][1]['config']['label'] = '{{ node1.output.pages | length }} pages'
+        mock_recipe_simple['workflow']['nodes'][1]['config']['prompt_template'] = 'Audit {{ inputs.website_url }}'
+        pages = {'pages': [{'url': f'https://example.com/{i}'} for i in range(20)]}
+        evaluator = self._evaluator(mock_recipe_simple, blob_store)
+        
+        with patch.object(evaluator, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.side_effect = [pages, {'content': 'ok'}]
+            with patch.object(blob_store, 'get', wraps=blob_store.get) as mock_get:
+                await evaluator.execute({'website_url': 'https://example.com'})
+            
+            assert mock_comp.call_args_list[1][0][2]['label'] == '20 pages'
+        
+        # Once for the label template, once for node2's inputs
+        assert mock_get.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_template_reads_load_once(self, mock_recipe_simple, blob_store):
+        """Should keep a lazily loaded output for every later template read"""
+        config = mock_recipe_simple['workflow']['nodes'][1]['config']
+        config['label'] = '{{ node1.output.pages | length }} pages'
+        config['first'] = '{{ node1.output.pages[0].url }}'
+        config['options'] = {'last': '{{ node1.output.pages[-1].url }}'}
+        pages = {'pages': [{'url': f'https://example.com/{i}'} for i in range(20)]}
+        evaluator = self._evaluator(mock_recipe_simple, blob_store)
+        
+        with patch.object(evaluator, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.side_effect = [pages, {'content': 'ok'}]
+            with patch.object(blob_store, 'get_json', wraps=blob_store.get_json) as mock_get:
+                await evaluator.execute({'website_url': 'https://example.com'})
+            
+            resolved = mock_comp.call_args_list[1][0][2]
+            assert resolved['first'] == 'https://example.com/0'
+            assert resolved['options']['last'] == 'https://example.com/19'
+        
+        # Once for all three templates, once for node2's inputs
+        assert mock_get.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_blob_read_off_event_loop(self, mock_recipe_simple, blob_store):
+        """Should read blobs for templates and node inputs in worker threads"""
+        import threading
+        mock_recipe_simple['workflow']['nodes'][1]['config']['label'] = '{{ node1.output.pages | length }} pages'
+        pages = {'pages': [{'url': f'https://example.com/{i}'} for i in range(20)]}
+        evaluator = self._evaluator(mock_recipe_simple, blob_store)
+        get_threads = []
+        get = blob_store.get
+        
+        def recording_get(key):
+            get_threads.append(threading.get_ident())
+            return get(key)
+        
+        with patch.object(evaluator, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.side_effect = [pages, {'content': 'ok'}]
+            with patch.object(blob_store, 'get', side_effect=recording_get):
+                await evaluator.execute({'website_url': 'https://example.com'})
+        
+        assert len(get_threads) == 2
+        assert threading.get_ident() not in get_threads
+    
+    @pytest.mark.asyncio
+    async def test_resolved_output_materialized(self, mock_recipe_simple, blob_store):
+        """Should return the real final output, not a handle"""
+        mock_recipe_simple['workflow']['output'] = {'source': 'node1.output'}
+        pages = {'pages': ['x' * 200]}
+        evaluator = self._evaluator(mock_recipe_simple, blob_store)
+        
+        with patch.object(evaluator, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.side_effect = [pages, {'content': 'ok'}]
+            result = await evaluator.execute({'website_url': 'https://example.com'})
+        
+        assert result['output'] == pages
+    
+    @pytest.mark.asyncio
+    async def test_serialize_state(self, mock_recipe_simple, blob_store):
+        """Should expose blobs as handle dicts in serialized state"""
+        evaluator = self._evaluator(mock_recipe_simple, blob_store)
+        
+        with patch.object(evaluator, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.side_effect = [{'pages': ['x' * 200]}, {'content': 'ok'}]
+            result = await evaluator.execute({'website_url': 'https://example.com'})
+        
+        state = RecipeEvaluator.serialize_state(result['execution_state'])
+        assert set(state['node1.output']) == {'$blob', 'size'}
+        assert state['node2.output'] == {'content': 'ok'}
+    
+    @pytest.mark.asyncio
+    async def test_checkpoint_keeps_handles(self, mock_recipe_simple, blob_store):
+        """Should checkpoint blob handles and restore them on resume"""
+        from agents.checkpoint_store import CheckpointStore
+        from components.utils.cache_manager import CacheManager
+        store = CheckpointStore(cache_manager=CacheManager())
+        pages = {'pages': ['x' * 200]}
+        
+        first = self._evaluator(mock_recipe_simple, blob_store, checkpoint_id='t', checkpoint_store=store)
+        with patch.object(first, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.side_effect = [pages, Exception("boom")]
+            with pytest.raises(Exception):
+                await first.execute({'website_url': 'https://example.com'})
+        
+        checkpoint = await store.load('t')
+        assert '$blob' in checkpoint['execution_state']['node1.output']
+        
+        second = self._evaluator(mock_recipe_simple, blob_store, checkpoint_id='t', checkpoint_store=store)
+        with patch.object(second, '_execute_component', new_callable=AsyncMock) as mock_comp:
+            mock_comp.return_value = {'content': 'ok'}
+            await second.resume('t')
+            assert mock_comp.call_args[0][3] == {'node1': pages}
+
+
+@pytest.fixture
+def mock_recipe_with_branches():
+    """Recipe with an unused branch and a mandatory metering node"""
+    return {
+        'id': 'branch-recipe',
+        'name': 'Branch Recipe',
+        'workflow': {
+            'nodes': [
+                {'id': 'crawl', 'component': 'WebCrawler', 'config': {}},
+                {
+                    'id': 'analyze',
+                    'component': 'LLMProcessor',
+                    'config': {'prompt_template': 'Analyze'},
+                    'depends_on': ['crawl']
+                },
+                {
+                    'id': 'summarize',
+                    'component': 'LLMProcessor',
+                    'config': {'prompt_template': 'Summarize'},
+                    'depends_on': ['crawl']
+                },
+                {
+                    'id': 'track',
+                    'component': 'LLMProcessor',
+                    'config': {'prompt_template': 'Track'},
+                    'depends_on': ['summarize'],
+                    'mandatory': True
+                }
+            ],
+            'edges': [
+                {'from': 'crawl', 'to': 'analyze'},
+                {'from': 'crawl', 'to': 'summarize'},
+                {'from': 'summarize', 'to': 'track'}
+            ],
+            'output': {'source': 'analyze.output'}
+        }
+    }
+
+
+class TestDeadNodeElimination:
+    """Test planning pass that skips nodes the output does not need"""
+    
+    @staticmethod
+    def _recording_component(calls: list):
+        async def run(component, component_name, config, node_inputs):
+            calls.append(config['prompt_template'] if 'prompt_template' in config else 'crawl')
+            return {'data': 'ok'}
+        return run
+    
+    @pytest.mark.asyncio
+    async def test_unused_branch_skipped(self, mock_recipe_with_branches):
+        """Should skip summarize but still run the mandatory node last"""
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_with_branches, mock_mode=True)
+        calls = []
+        
+        with patch.object(evaluator, '_execute_component', side_effect=self._recording_component(calls)):
+            result = await evaluator.execute({'website_url': 'https://example.com'})
+        
+        assert calls == ['crawl', 'Analyze', 'Track']
+        assert result['execution_state']['summarize.status'] == 'skipped'
+        assert result['execution_state']['track.status'] == 'success'
+        assert result['metrics']['nodes_skipped'] == 1
+        assert result['output'] == {'data': 'ok'}
+    
+    @pytest.mark.asyncio
+    async def test_output_node_runs_ancestors_only(self, mock_recipe_with_branches):
+        """Should evaluate only the requested node's ancestors (plus mandatory nodes)"""
+        mock_recipe_with_branches['workflow']['nodes'][3]['mandatory'] = False
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_with_branches, mock_mode=True)
+        calls = []
+        
+        with patch.object(evaluator, '_execute_component', side_effect=self._recording_component(calls)):
+            result = await evaluator.execute({'website_url': 'https://example.com'}, output_node='crawl')
+        
+        assert calls == ['crawl']
+        assert result['output'] == {'data': 'ok'}
+        assert result['metrics']['nodes_skipped'] == 3
+    
+    @pytest.mark.asyncio
+    async def test_unknown_output_node(self, mock_recipe_with_branches):
+        """Should reject output nodes that are not in the recipe"""
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_with_branches, mock_mode=True)
+        
+        with pytest.raises(ValueError, match="Unknown output node"):
+            await evaluator.execute({'website_url': 'https://example.com'}, output_node='missing')
+    
+    @pytest.mark.asyncio
+    async def test_no_output_source_runs_everything(self, mock_recipe_simple):
+        """Should run every node when the output source is not a node"""
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_simple, mock_mode=True)
+        result = await evaluator.execute({'website_url': 'https://example.com'})
+        
+        assert result['metrics']['nodes_executed'] == 2
+        assert result['metrics']['nodes_skipped'] == 0
+
+
+@pytest.fixture
+def mock_recipe_with_map():
+    """Recipe that analyzes each crawled page separately, then reduces"""
+    return {
+        'id': 'map-recipe',
+        'name': 'Map Recipe',
+        'workflow': {
+            'nodes': [
+                {'id': 'crawl', 'component': 'WebCrawler', 'config': {}},
+                {
+                    'id': 'per_page',
+                    'component': 'LLMProcessor',
+                    'config': {'prompt_template': 'Analyze {{ page.url }}'},
+                    'depends_on': ['crawl'],
+                    'map': {'over': 'crawl.output.pages', 'item_var': 'page', 'concurrency': 2}
+                },
+                {
+                    'id': 'reduce',
+                    'component': 'LLMProcessor',
+                    'config': {'prompt_template': 'Summarize'},
+                    'depends_on': ['per_page']
+                }
+            ],
+            'edges': [
+                {'from': 'crawl', 'to': 'per_page'},
+                {'from': 'per_page', 'to': 'reduce'}
+            ]
+        }
+    }
+
+
+class TestMapNodes:
+    """Test map (fan-out) nodes"""
+    
+    PAGES = {'pages': [{'url': f'https://example.com/{i}'} for i in range(5)]}
+    
+    @staticmethod
+    def _component(log: list, delay: float = 0.0):
+        import asyncio
+        active = {'now': 0, 'max': 0}
+        
+        async def run(component, component_name, config, node_inputs, variables=None):
+            if component_name == 'WebCrawler':
+                return TestMapNodes.PAGES
+            active['now'] += 1
+            active['max'] = max(active['max'], active['now'])
+            await asyncio.sleep(delay)
+            active['now'] -= 1
+            log.append((config['prompt_template'], node_inputs))
+            return {'content': config['prompt_template'], 'usage': {'total_tokens': 10}}
+        return run, active
+    
+    @pytest.mark.asyncio
+    async def test_runs_once_per_item_in_order(self, mock_recipe_with_map):
+        """Should bind each element, bound concurrency and gather results in order"""
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_with_map, mock_mode=True)
+        log = []
+        run, active = self._component(log, delay=0.01)
+        
+        with patch.object(evaluator, '_execute_component', side_effect=run):
+            result = await evaluator.execute({'website_url': 'https://example.com'})
+        
+        outputs = result['execution_state']['per_page.output']
+        assert [o['content'] for o in outputs] == [f'Analyze https://example.com/{i}' for i in range(5)]
+        assert active['max'] == 2
+        # Reducer receives the gathered list
+        assert log[-1][1] == {'per_page': outputs}
+        assert result['metrics']['map_items'] == 5
+        assert result['metrics']['tokens_used'] == 60
+    
+    @pytest.mark.asyncio
+    async def test_chunking(self, mock_recipe_with_map):
+        """Should bind lists of chunk_size elements"""
+        node = mock_recipe_with_map['workflow']['nodes'][1]
+        node['map']['chunk_size'] = 2
+        node['config']['prompt_template'] = '{{ page | length }}'
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_with_map, mock_mode=True)
+        log = []
+        run, _ = self._component(log)
+        
+        with patch.object(evaluator, '_execute_component', side_effect=run):
+            result = await evaluator.execute({'website_url': 'https://example.com'})
+        
+        assert [o['content'] for o in result['execution_state']['per_page.output']] == [2, 2, 1]
+        assert log[0][1]['page'] == self.PAGES['pages'][:2]
+    
+    @pytest.mark.asyncio
+    async def test_chunked_prompt_binds_list(self, mock_recipe_with_map):
+        """Should bind the chunk as a list when rendering the real prompt"""
+        from components.processors.llm_processor import LLMProcessor
+        from components.processors.web_crawler import WebCrawler
+        node = mock_recipe_with_map['workflow']['nodes'][1]
+        node['map']['chunk_size'] = 2
+        node['config']['prompt_template'] = '{{ page | length }} pages:{% for p in page %} {{ p.url }}{% endfor %}'
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_with_map, mock_mode=True)
+        built = []
+        build_prompt = evaluator._build_prompt
+        
+        def recording_build_prompt(template, node_inputs, variables=None):
+            prompt = build_prompt(template, node_inputs, variables)
+            built.append(prompt)
+            return prompt
+        
+        with patch.object(WebCrawler, 'execute', new_callable=AsyncMock, return_value=self.PAGES), \
+                patch.object(LLMProcessor, 'execute', new_callable=AsyncMock, return_value={'content': 'ok'}) as llm, \
+                patch.object(evaluator, '_build_prompt', side_effect=recording_build_prompt), \
+                patch.object(evaluator.component_pool, 'acquire', wraps=evaluator.component_pool.acquire) as acquire:
+            await evaluator.execute({'website_url': 'https://example.com'})
+        
+        assert built[:3] == [
+            '2 pages: https://example.com/0 https://example.com/1',
+            '2 pages: https://example.com/2 https://example.com/3',
+            '1 pages: https://example.com/4'
+        ]
+        assert [call.kwargs['prompt'] for call in llm.call_args_list[:3]] == built[:3]
+        # The prompt path binds the chunk like config interpolation does
+        chunk = self.PAGES['pages'][:2]
+        assert build_prompt(node['config']['prompt_template'], {'crawl': self.PAGES, 'page': chunk}, {'page': chunk}) == built[0]
+        # One pooled instance per node, not per chunk
+        assert acquire.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_source_must_be_list(self, mock_recipe_with_map):
+        """Should fail the node when the map source is not a list"""
+        mock_recipe_with_map['workflow']['nodes'][1]['map']['over'] = 'crawl.output.missing'
+        evaluator = RecipeEvaluator(recipe_definition=mock_recipe_with_map, mock_mode=True)
+        run, _ = self._component([])
+        
+        with patch.object(evaluator, '_execute_component', side_effect=run):
+            with pytest.raises(ValueError, match="Map source not found"):
+                await evaluator.execute({'website_url': 'https://example.com'})
+    
+    def test_map_requires_dependency(self, mock_recipe_with_map):
+        """Should reject map sources that are not dependencies"""
+        from agents.recipe_compiler import CompiledRecipe
+        mock_recipe_with_map['workflow']['nodes'][1]['depends_on'] = []
+        plan = CompiledRecipe(mock_recipe_with_map, RecipeEvaluator.COMPONENTS.keys())
+        
+        assert not plan.is_valid
+        assert 'must depend on its source node' in plan.validation_errors[0]
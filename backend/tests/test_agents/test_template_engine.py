@@ -0,0 +1,75 @@
+"""
+Test Template Engine - shared sandboxed Jinja2 environment
+"""
+import pytest
+from jinja2 import TemplateSyntaxError
+from jinja2.exceptions import SecurityError
+from agents.template_engine import (
+    get_template,
+    clear_template_cache,
+    configure_bytecode_cache,
+    template_key,
+)
+
+
+class TestTemplateCache:
+    """Test compiled template cache"""
+    
+    def test_same_source_same_template(self):
+        """Should compile identical sources once"""
+        first = get_template("Hello {{ name }}")
+        second = get_template("Hello {{ name }}")
+        
+        assert first is second
+        assert first.render(name='SEO') == 'Hello SEO'
+    
+    def test_different_sources(self):
+        """Should key templates by source hash"""
+        assert get_template("{{ a }}") is not get_template("{{ b }}")
+        assert template_key("{{ a }}") != template_key("{{ b }}")
+    
+    def test_syntax_error_raises(self):
+        """Should surface template syntax errors"""
+        with pytest.raises(TemplateSyntaxError):
+            get_template("{% for x in %}")
+    
+    def test_clear_cache_recompiles(self):
+        """Should recompile after cache clear"""
+        first = get_template("{{ value }}")
+        clear_template_cache()
+        
+        assert get_template("{{ value }}") is not first
+
+
+class TestSandbox:
+    """Test sandboxed rendering"""
+    
+    def test_unsafe_attribute_blocked(self):
+        """Should block access to Python internals from recipe templates"""
+        template = get_template("{{ ''.__class__.__mro__[1].__subclasses__() }}")
+        
+        with pytest.raises(SecurityError):
+            template.render()
+    
+    def test_undefined_renders_empty(self):
+        """Should keep default (lenient) undefined semantics"""
+        assert get_template("[{{ missing }}]").render() == "[]"
+
+
+class TestBytecodeCache:
+    """Test optional on-disk bytecode cache"""
+    
+    def test_bytecode_written_to_disk(self, tmp_path):
+        """Should persist compiled bytecode when configured"""
+        configure_bytecode_cache(str(tmp_path))
+        try:
+            clear_template_cache()
+            get_template("Warm {{ start }}")
+            
+            assert any(tmp_path.iterdir())
+            
+            # Fresh in-memory cache loads from bytecode
+            clear_template_cache()
+            assert get_template("Warm {{ start }}").render(start='up') == 'Warm up'
+        finally:
+            configure_bytecode_cache(None)
@@ -5,7 +5,8 @@ import pytest
 import json
 import time
 from unittest.mock import AsyncMock, Mock, patch
-from components.utils.cache_manager import CacheManager
+from components.utils import cache_manager as cache_module
+from components.utils.cache_manager import CacheManager, create_cache_manager
 
 
 @pytest.fixture
@@ -282,3 +283,64 @@ class TestEdgeCases:
         result = await cache_manager.get("test", "large")
         
         assert result == large_value
+
+
+class TestInMemoryEviction:
+    """Test bounded in-memory fallback"""
+    
+    @pytest.mark.asyncio
+    async def test_lru_bound(self):
+        """Should evict least recently used entries beyond max_entries"""
+        manager = CacheManager(max_entries=2)
+        await manager.set("node", "a", 1)
+        await manager.set("node", "b", 2)
+        await manager.get("node", "a")  # a is now more recent than b
+        await manager.set("node", "c", 3)
+        
+        assert await manager.get("node", "b") is None
+        assert await manager.get("node", "a") == 1
+        assert await manager.get("node", "c") == 3
+        assert manager.evictions == 1
+    
+    @pytest.mark.asyncio
+    async def test_expired_entries_swept_without_reads(self):
+        """Should drop expired entries even if their keys are never read again"""
+        manager = CacheManager()
+        with patch('time.time', return_value=1000.0):
+            for i in range(10):
+                await manager.set("node", f"once-{i}", {"pages": []}, ttl=60)
+        
+        with patch('time.time', return_value=2000.0):
+            for i in range(CacheManager.SWEEP_INTERVAL):
+                await manager.set("node", f"fresh-{i}", i, ttl=60)
+        
+        assert not any('once-' in key for key in manager._local_cache)
+        assert len(manager._local_cache) == CacheManager.SWEEP_INTERVAL
+
+
+class TestCreateCacheManager:
+    """Test settings-driven backend selection for shared stores"""
+    
+    @pytest.fixture(autouse=True)
+    def fresh_client(self, monkeypatch):
+        monkeypatch.setattr(cache_module, '_redis_client', None)
+    
+    def test_redis_when_configured(self, monkeypatch):
+        """Should use the REDIS_URL client when Redis is configured"""
+        from app import config
+        monkeypatch.setattr(config, 'settings', config.Settings(REDIS_URL='redis://localhost:6379/5'))
+        
+        manager = create_cache_manager('checkpoints')
+        
+        assert manager.redis is not None
+        assert manager.redis is cache_module.get_redis_client()
+    
+    def test_memory_fallback_is_logged(self, monkeypatch, capsys):
+        """Should fall back to memory (and say so) without REDIS_URL"""
+        monkeypatch.setattr(cache_module, 'get_redis_client', lambda: None)
+        
+        manager = create_cache_manager('checkpoints', default_ttl=60)
+        
+        assert manager.redis is None
+        assert manager.default_ttl == 60
+        assert 'checkpoints kept in process memory' in capsys.readouterr().out
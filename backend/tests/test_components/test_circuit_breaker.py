@@ -0,0 +1,100 @@
+"""
+Test HostCircuitBreaker - per-host failure isolation
+"""
+import asyncio
+import time
+import pytest
+from components.utils.circuit_breaker import HostCircuitBreaker
+
+
+class TestHostCircuitBreaker:
+    """Test open, half-open and close transitions"""
+    
+    def test_opens_after_consecutive_failures(self):
+        """Should refuse requests once failure_threshold is reached"""
+        breaker = HostCircuitBreaker(failure_threshold=3, reset_timeout=60)
+        
+        for _ in range(3):
+            assert breaker.allow('dead.com')
+            breaker.record('dead.com', success=False)
+        
+        assert not breaker.allow('dead.com')
+        assert breaker.allow('alive.com')
+        assert breaker.trips == 1
+        assert breaker.rejected == 1
+        assert breaker.open_hosts() == ['dead.com']
+    
+    def test_success_resets_failures(self):
+        """Should only count consecutive failures"""
+        breaker = HostCircuitBreaker(failure_threshold=2)
+        
+        breaker.record('flaky.com', success=False)
+        breaker.record('flaky.com', success=True)
+        breaker.record('flaky.com', success=False)
+        
+        assert breaker.allow('flaky.com')
+        assert not breaker.is_open('flaky.com')
+    
+    def test_half_open_probe(self):
+        """Should let one probe through after reset_timeout"""
+        breaker = HostCircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record('host.com', success=False)
+        assert not breaker.allow('host.com')
+        
+        time.sleep(0.06)
+        assert breaker.allow('host.com')  # the probe
+        assert not breaker.allow('host.com')  # others wait for its outcome
+        
+        breaker.record('host.com', success=True)
+        assert breaker.allow('host.com')
+        assert breaker.open_hosts() == []
+    
+    def test_failed_probe_reopens(self):
+        """Should re-open the circuit when the probe fails"""
+        breaker = HostCircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record('host.com', success=False)
+        time.sleep(0.06)
+        
+        assert breaker.allow('host.com')
+        breaker.record('host.com', success=False)
+        
+        assert not breaker.allow('host.com')
+        assert breaker.trips == 1
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_frees_slot(self):
+        """Should let a new probe through when the previous one was cancelled"""
+        breaker = HostCircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record('host.com', success=False)
+        time.sleep(0.06)
+        
+        async def probe():
+            assert breaker.allow('host.com')
+            try:
+                await asyncio.sleep(10)
+                breaker.record('host.com', success=True)
+            finally:
+                breaker.release('host.com')
+        
+        task = asyncio.ensure_future(probe())
+        await asyncio.sleep(0)
+        assert not breaker.allow('host.com')  # probe in flight
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        
+        assert breaker.allow('host.com')
+        assert breaker.is_open('host.com')
+    
+    def test_release_after_outcome_keeps_state(self):
+        """Should not change the circuit once the probe recorded its outcome"""
+        breaker = HostCircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record('host.com', success=False)
+        time.sleep(0.06)
+        
+        assert breaker.allow('host.com')
+        breaker.record('host.com', success=False)
+        breaker.release('host.com')
+        
+        assert not breaker.allow('host.com')
+        assert breaker.trips == 1
@@ -0,0 +1,156 @@
+"""
+Test ComponentPool
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from components.component_pool import ComponentPool
+from components.processors.llm_processor import LLMProcessor
+from components.processors.web_crawler import WebCrawler
+
+
+@pytest.fixture
+def pool():
+    """Empty component pool"""
+    return ComponentPool(max_size=4)
+
+
+class TestComponentReuse:
+    """Test instance sharing"""
+    
+    def test_same_config_same_instance(self, pool):
+        """Should hand out one instance per (class, config)"""
+        first = pool.acquire(WebCrawler, {'max_pages': 5}, mock_mode=True)
+        second = pool.acquire(WebCrawler, {'max_pages': 5}, mock_mode=True)
+        
+        assert first is second
+        assert pool.get_stats()['hits'] == 1
+    
+    def test_different_config_different_instance(self, pool):
+        """Should not share instances across configs, classes or mock mode"""
+        crawler = pool.acquire(WebCrawler, {'max_pages': 5}, mock_mode=True)
+        
+        assert pool.acquire(WebCrawler, {'max_pages': 10}, mock_mode=True) is not crawler
+        assert pool.acquire(WebCrawler, {'max_pages': 5}, mock_mode=False) is not crawler
+        assert pool.acquire(LLMProcessor, {'max_pages': 5}, mock_mode=True) is not crawler
+    
+    def test_runtime_keys_ignored(self, pool):
+        """Should share instances across per-execution config values"""
+        first = pool.acquire(LLMProcessor, {'model': 'm', 'prompt_template': 'A'}, mock_mode=True)
+        second = pool.acquire(LLMProcessor, {'model': 'm', 'prompt_template': 'B'}, mock_mode=True)
+        
+        assert first is second
+        assert 'prompt_template' not in first.config
+    
+    def test_lru_bound(self, pool):
+        """Should keep at most max_size instances"""
+        for pages in range(10):
+            pool.acquire(WebCrawler, {'max_pages': pages + 1}, mock_mode=True)
+        
+        assert pool.get_stats()['size'] == 4
+    
+    def test_unserializable_config_not_pooled(self, pool):
+        """Should build a private instance when config cannot be keyed"""
+        config = {'max_pages': 5, 'callback': object()}
+        
+        assert pool.acquire(WebCrawler, config, mock_mode=True) is not pool.acquire(WebCrawler, config, mock_mode=True)
+        assert pool.get_stats()['size'] == 0
+
+
+class TestSecretIsolation:
+    """Test tenant-safe handling of secret-bearing config"""
+    
+    def test_secrets_scoped_by_agency(self, pool):
+        """Should never share a secret-bearing instance across agencies"""
+        agency_a = pool.acquire(LLMProcessor, {}, secrets={'api_key': 'k'}, mock_mode=True, scope='agency-a')
+        agency_b = pool.acquire(LLMProcessor, {}, secrets={'api_key': 'k'}, mock_mode=True, scope='agency-b')
+        
+        assert agency_a is not agency_b
+        assert agency_a is pool.acquire(LLMProcessor, {}, secrets={'api_key': 'k'}, mock_mode=True, scope='agency-a')
+    
+    def test_different_secrets_different_instance(self, pool):
+        """Should key instances by secret values"""
+        first = pool.acquire(LLMProcessor, {}, secrets={'api_key': 'k1'}, mock_mode=True, scope='a')
+        second = pool.acquire(LLMProcessor, {}, secrets={'api_key': 'k2'}, mock_mode=True, scope='a')
+        
+        assert first is not second
+        assert second.api_key == 'k2'
+    
+    def test_key_has_no_secret_values(self, pool):
+        """Should not keep secret values in pool keys"""
+        pool.acquire(LLMProcessor, {}, secrets={'api_key': 'super-secret'}, mock_mode=True, scope='a')
+        
+        assert 'super-secret' not in repr(list(pool._instances.keys()))
+
+
+class TestLifecycle:
+    """Test shutdown"""
+    
+    @pytest.mark.asyncio
+    async def test_close_releases_instances(self, pool):
+        """Should aclose() every pooled instance and empty the pool"""
+        crawler = pool.acquire(WebCrawler, {}, mock_mode=True)
+        crawler.aclose = AsyncMock()
+        
+        await pool.close()
+        
+        crawler.aclose.assert_awaited_once()
+        assert pool.get_stats()['size'] == 0
+    
+    @pytest.mark.asyncio
+    async def test_close_continues_on_error(self, pool):
+        """Should close remaining instances when one fails"""
+        first = pool.acquire(WebCrawler, {'max_pages': 1}, mock_mode=True)
+        second = pool.acquire(WebCrawler, {'max_pages': 2}, mock_mode=True)
+        first.aclose = AsyncMock(side_effect=Exception("boom"))
+        second.aclose = AsyncMock()
+        
+        await pool.close()
+        
+        second.aclose.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_evicted_instances_closed(self, pool):
+        """Should aclose() released instances dropped by the LRU"""
+        evicted = pool.acquire(WebCrawler, {'max_pages': 0}, mock_mode=True)
+        evicted.aclose = AsyncMock()
+        await pool.release(evicted)
+        for pages in range(1, 5):
+            await pool.release(pool.acquire(WebCrawler, {'max_pages': pages}, mock_mode=True))
+        
+        await asyncio.sleep(0)
+        
+        evicted.aclose.assert_awaited_once()
+        assert pool.get_stats()['evictions'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_checked_out_instance_closed_on_last_release(self, pool):
+        """Should keep an instance evicted while checked out open until its last holder releases it"""
+        evicted = pool.acquire(WebCrawler, {'max_pages': 0}, mock_mode=True)
+        assert pool.acquire(WebCrawler, {'max_pages': 0}, mock_mode=True) is evicted
+        evicted.aclose = AsyncMock()
+        for pages in range(1, 5):
+            await pool.release(pool.acquire(WebCrawler, {'max_pages': pages}, mock_mode=True))
+        await asyncio.sleep(0)
+        
+        await pool.release(evicted)
+        evicted.aclose.assert_not_awaited()
+        
+        await pool.release(evicted)
+        evicted.aclose.assert_awaited_once()
+        
+        await pool.close()
+        evicted.aclose.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_evicted_outside_loop_closed_at_shutdown(self, pool):
+        """Should close instances evicted without a running loop on close()"""
+        evicted = await asyncio.to_thread(pool.acquire, WebCrawler, {'max_pages': 0}, mock_mode=True)
+        evicted.aclose = AsyncMock()
+        for pages in range(1, 5):
+            await asyncio.to_thread(pool.acquire, WebCrawler, {'max_pages': pages}, mock_mode=True)
+        evicted.aclose.assert_not_awaited()
+        
+        await pool.close()
+        
+        evicted.aclose.assert_awaited_once()
@@ -0,0 +1,127 @@
+"""
+Test compact crawl output - URL interning, page records, lossless expansion
+"""
+import json
+from agents.template_engine import get_template
+from components.processors.crawl_result import (
+    PageRecord,
+    URLTable,
+    compact_crawl,
+    expand_crawl,
+    is_compact
+)
+
+
+def site_crawl(pages: int = 100, nav_links: int = 40):
+    """Standard crawl output where every page shares the same navigation links"""
+    nav = [f'https://example.com/section/{i}/overview' for i in range(nav_links)]
+    page_dicts = [
+        {
+            'url': f'https://example.com/page/{n}',
+            'status_code': 200,
+            'title': f'Page {n}',
+            'meta_description': 'Example page',
+            'meta_keywords': '',
+            'h1_tags': [f'Page {n}'],
+            'h2_tags': ['Intro', 'Details'],
+            'word_count': 350,
+            'links': nav + [f'https://example.com/page/{n + 1}'],
+            'images': 3,
+            'fingerprint': '',
+            'depth': 1,
+            'elapsed_ms': 42,
+            'from_cache': False,
+            'duplicates': []
+        }
+        for n in range(pages)
+    ]
+    return {
+        'pages': page_dicts,
+        'total_pages': pages,
+        'visited_urls': [page['url'] for page in page_dicts],
+        'base_url': 'https://example.com/',
+        'deadline_reached': False
+    }
+
+
+class TestURLTable:
+    """Test URL interning"""
+    
+    def test_intern_returns_stable_indices(self):
+        """Should store each URL once"""
+        urls = URLTable()
+        
+        assert urls.intern('https://a.com/') == 0
+        assert urls.intern('https://b.com/') == 1
+        assert urls.intern('https://a.com/') == 0
+        assert len(urls) == 2
+        assert urls[1] == 'https://b.com/'
+
+
+class TestCompactCrawl:
+    """Test conversion and expansion"""
+    
+    def test_round_trip_is_lossless(self):
+        """Should restore the standard output exactly"""
+        result = site_crawl()
+        
+        compact = compact_crawl(result)
+        
+        assert is_compact(compact)
+        assert expand_crawl(compact) == result
+    
+    def test_round_trip_through_json(self):
+        """Should survive JSON serialization (execution_state, caches, task storage)"""
+        result = site_crawl(pages=5)
+        
+        restored = expand_crawl(json.loads(json.dumps(compact_crawl(result))))
+        
+        assert restored == result
+    
+    def test_serialized_size_shrinks(self):
+        """Should serialize several times smaller for a 100-page crawl"""
+        result = site_crawl()
+        
+        full_size = len(json.dumps(result))
+        compact_size = len(json.dumps(compact_crawl(result)))
+        
+        assert full_size / compact_size >= 4
+    
+    def test_links_interned_once(self):
+        """Should keep one table entry per distinct URL"""
+        compact = compact_crawl(site_crawl(pages=10, nav_links=5))
+        
+        assert len(compact['urls']) == len(set(compact['urls'])) == 5 + 11
+        assert 'visited_urls' not in compact
+    
+    def test_non_compact_passthrough(self):
+        """Should leave other outputs untouched"""
+        result = site_crawl(pages=1)
+        
+        assert expand_crawl(result) is result
+        assert expand_crawl('text') == 'text'
+        assert compact_crawl(compact_crawl(result)) == compact_crawl(result)
+    
+    def test_page_records_use_slots(self):
+        """Should hold pages without per-instance dicts"""
+        urls = URLTable()
+        record = PageRecord.from_page(site_crawl(pages=1)['pages'][0], urls)
+        
+        assert not hasattr(record, '__dict__')
+        assert record.links.itemsize <= 4
+        assert record.to_page(urls) == site_crawl(pages=1)['pages'][0]
+
+
+class TestTemplateExpansion:
+    """Test the expand_crawl template filter"""
+    
+    def test_filter_renders_pages(self):
+        """Should let prompt templates iterate expanded pages"""
+        template = get_template(
+            '{% set crawl = fetch_pages | expand_crawl %}'
+            '{% for page in crawl.pages %}{{ page.url }}:{{ page.links | length }};{% endfor %}'
+        )
+        
+        rendered = template.render(fetch_pages=compact_crawl(site_crawl(pages=2, nav_links=3)))
+        
+        assert rendered == 'https://example.com/page/0:4;https://example.com/page/1:4;'
@@ -0,0 +1,163 @@
+"""
+Test HTML extractors - single-pass lxml extractor parity with BeautifulSoup
+"""
+import random
+import pytest
+from components.connectors.website_connector import WebsiteConnector
+from components.processors.html_extractor import (
+    BeautifulSoupExtractor,
+    LxmlExtractor,
+    get_extractor
+)
+
+
+BASE_URL = 'https://example.com/blog/post'
+
+PAGES = {
+    'mock_fetch': WebsiteConnector(mock_mode=True)._mock_fetch(BASE_URL)['html'],
+    'typical': '''
+        <!DOCTYPE html>
+        <html lang="en">
+        <head>
+            <meta charset="utf-8">
+            <title>Pricing &amp; Plans | Example</title>
+            <meta name="description" content="Compare plans &amp; pricing">
+            <meta property="og:keywords" content="pricing, plans">
+            <script>window.dataLayer = [{"page": "pricing"}];</script>
+            <style>h1 { color: red; }</style>
+        </head>
+        <body>
+            <!-- navigation -->
+            <nav><a href="/">Home</a> | <a href="/about/">About</a> | <a href="#top">Top</a></nav>
+            <h1>Simple <em>transparent</em> pricing</h1>
+            <p>Start free, upgrade when you&rsquo;re ready.&nbsp;No card required.</p>
+            <h2>Starter</h2><p>For individuals<br>and small teams.</p>
+            <h2>  Pro <span>plan</span>  </h2>
+            <img src="/a.png"><img src="/b.png" alt="B">
+            <a href="mailto:sales@example.com">Contact</a>
+            <a href="https://other.com/partner?utm_source=x">Partner</a>
+            <a>No href</a>
+            <template><h2>Hidden</h2><p>template text</p></template>
+            <noscript>Enable JavaScript</noscript>
+            <footer>&copy; 2024 Example Inc.</footer>
+        </body>
+        </html>
+    ''',
+    'missing_fields': '<html><body><p>Just a paragraph</p></body></html>',
+    'empty_title': '<html><head><title></title></head><body><h1></h1></body></html>',
+    'unclosed_tags': '<title>Broken<h1>Heading <b>bold<h2>Sub</h1><p>text <a href="../up">up',
+    'meta_priority': (
+        '<meta property="og:description" content="og first">'
+        '<meta name="description" content="named">'
+        '<meta name="description" content="second">'
+    ),
+    'svg_title': '<body><svg><title>icon</title></svg><title>late</title><p>words here</p></body>',
+}
+
+
+class TestExtractorParity:
+    """Single-pass extractor must match the BeautifulSoup reference"""
+    
+    @pytest.mark.parametrize('name', sorted(PAGES))
+    def test_pages(self, name):
+        """Should extract identical fields on representative pages"""
+        html = PAGES[name]
+        
+        assert LxmlExtractor().extract(html, BASE_URL) == BeautifulSoupExtractor().extract(html, BASE_URL)
+    
+    def test_randomized_markup(self):
+        """Should match on malformed, randomly nested markup"""
+        tags = ['div', 'p', 'span', 'b', 'h1', 'h2', 'a href="/x"', 'img', 'script', 'style', 'title',
+                'template', 'textarea', 'table', 'tr', 'td', 'li', 'br', 'meta name="description" content="D"',
+                'svg', 'head', 'body', 'select', 'option']
+        texts = ['foo', 'bar baz', ' ', '  x  ', '&amp;', '&nbsp;', 'caf&eacute;', '<!-- c -->', 'a&lt;b', '\n', '']
+        rnd = random.Random(2024)
+        
+        for _ in range(500):
+            parts = []
+            for _ in range(rnd.randint(1, 40)):
+                roll = rnd.random()
+                tag = rnd.choice(tags)
+                if roll < 0.35:
+                    parts.append(f'<{tag}>')
+                elif roll < 0.6:
+                    parts.append(f'</{tag.split()[0]}>')
+                else:
+                    parts.append(rnd.choice(texts))
+            html = ''.join(parts)
+            
+            assert LxmlExtractor().extract(html, BASE_URL) == BeautifulSoupExtractor().extract(html, BASE_URL), html
+    
+    def test_fingerprint_parity(self):
+        """Should fingerprint the same words (words may span text nodes)"""
+        pages = list(PAGES.values()) + ['<p>sp<b>lit</b> word<!-- c -->s and <i>more</i></p>' * 3]
+        for html in pages:
+            lxml_fields = LxmlExtractor(fingerprint=True).extract(html, BASE_URL)
+            
+            assert lxml_fields == BeautifulSoupExtractor(fingerprint=True).extract(html, BASE_URL)
+            assert bool(lxml_fields['fingerprint']) == bool(lxml_fields['word_count'])
+        assert LxmlExtractor().extract(PAGES['typical'], BASE_URL)['fingerprint'] == ''
+    
+    def test_randomized_fingerprint_parity(self):
+        """Should fingerprint the same main content on malformed markup with site chrome"""
+        tags = ['div', 'p', 'b', 'h1', 'nav', 'header', 'footer', 'aside', 'script', 'title', 'body']
+        texts = ['foo', 'bar baz', ' ', 'x', '&amp;', '<!-- c -->', '\n', 'menu item']
+        rnd = random.Random(7)
+        
+        for _ in range(300):
+            parts = []
+            for _ in range(rnd.randint(1, 40)):
+                roll = rnd.random()
+                tag = rnd.choice(tags)
+                if roll < 0.35:
+                    parts.append(f'<{tag}>')
+                elif roll < 0.6:
+                    parts.append(f'</{tag}>')
+                else:
+                    parts.append(rnd.choice(texts))
+            html = ''.join(parts)
+            
+            lxml_fields = LxmlExtractor(fingerprint=True).extract(html, BASE_URL)
+            assert lxml_fields == BeautifulSoupExtractor(fingerprint=True).extract(html, BASE_URL), html
+    
+    @pytest.mark.parametrize('name', ['lxml', 'beautifulsoup'])
+    def test_fingerprint_main_content_only(self, name):
+        """Should ignore nav/header/footer/aside text in fingerprints but count its words"""
+        extractor = get_extractor(name, fingerprint=True)
+        main = '<main><h1>Red shoe</h1><p>' + 'soft leather sole ' * 20 + '</p></main>'
+        chrome = '<header>Shop</header> <nav>Home Men Women Sale</nav> {} <aside>Related</aside> <footer>Contact us</footer>'
+        
+        bare = extractor.extract(f'<body>{main}</body>', BASE_URL)
+        framed = extractor.extract('<body>' + chrome.format(main) + '</body>', BASE_URL)
+        
+        assert framed['fingerprint'] == bare['fingerprint']
+        assert framed['word_count'] == bare['word_count'] + 8
+        assert extractor.extract('<body><nav>Home About</nav></body>', BASE_URL)['fingerprint'] == ''
+    
+    def test_fields(self):
+        """Should extract the expected values"""
+        fields = LxmlExtractor().extract(PAGES['typical'], BASE_URL)
+        
+        assert fields['title'] == 'Pricing & Plans | Example'
+        assert fields['meta_description'] == 'Compare plans & pricing'
+        assert fields['meta_keywords'] == 'pricing, plans'
+        # Same joining as BeautifulSoup get_text(strip=True)
+        assert fields['h1_tags'] == ['Simpletransparentpricing']
+        assert fields['h2_tags'] == ['Starter', 'Proplan', '']  # <template> text is not page text
+        assert fields['images'] == 2
+        assert 'https://example.com/about/' in fields['links']
+        assert not any(link.startswith('mailto:') for link in fields['links'])
+
+
+class TestExtractorSelection:
+    """Test config-driven extractor choice"""
+    
+    def test_get_extractor(self):
+        assert isinstance(get_extractor('lxml'), LxmlExtractor)
+        assert isinstance(get_extractor('beautifulsoup'), BeautifulSoupExtractor)
+        with pytest.raises(ValueError):
+            get_extractor('regex')
+    
+    def test_empty_document(self):
+        """Should return empty fields for empty HTML"""
+        assert LxmlExtractor().extract('', BASE_URL)['word_count'] == 0
@@ -0,0 +1,239 @@
+"""
+Test HTTPCache - conditional requests, LRU eviction and agency isolation
+"""
+import httpx
+import pytest
+from components.base import set_tenant
+from components.connectors.http_cache import HTTPCache
+from components.connectors.website_connector import WebsiteConnector
+from components.processors.web_crawler import WebCrawler
+
+
+PAGE = '<html><head><title>Cached page</title></head><body>' + 'content ' * 200 + '</body></html>'
+
+
+def revalidating_transport(requests: list, etag: str = '"v1"'):
+    """MockTransport serving PAGE with an ETag and answering matching revalidations with 304"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get('if-none-match') == etag:
+            return httpx.Response(304, headers={'ETag': etag})
+        return httpx.Response(
+            200,
+            html=PAGE,
+            headers={'ETag': etag, 'Last-Modified': 'Mon, 05 Oct 2026 10:00:00 GMT'}
+        )
+    return httpx.MockTransport(handler)
+
+
+def cached_connector(cache: HTTPCache, requests: list, **config) -> WebsiteConnector:
+    client = httpx.AsyncClient(transport=revalidating_transport(requests))
+    return WebsiteConnector({'http_cache': True, **config}, client=client, http_cache=cache)
+
+
+class TestConditionalRequests:
+    """Test revalidation through WebsiteConnector"""
+    
+    @pytest.mark.asyncio
+    async def test_second_fetch_served_from_cache(self, tmp_path):
+        """Should send validators and serve the 304 from disk"""
+        requests = []
+        connector = cached_connector(HTTPCache(str(tmp_path)), requests)
+        
+        first = await connector.execute('https://example.com/page')
+        second = await connector.execute('https://example.com/page')
+        
+        assert first['from_cache'] is False
+        assert 'if-none-match' not in requests[0].headers
+        assert requests[1].headers['if-none-match'] == '"v1"'
+        assert requests[1].headers['if-modified-since'] == 'Mon, 05 Oct 2026 10:00:00 GMT'
+        assert second['from_cache'] is True
+        assert second['status_code'] == 200
+        assert second['html'] == first['html'] == PAGE
+    
+    @pytest.mark.asyncio
+    async def test_keyed_by_request_url(self, tmp_path):
+        """Should keep one entry per request URL (fragments are not part of the request)"""
+        requests = []
+        connector = cached_connector(HTTPCache(str(tmp_path)), requests)
+        
+        await connector.execute('https://example.com/page')
+        slash = await connector.execute('https://example.com/page/')
+        fragment = await connector.execute('https://example.com/page#top')
+        
+        assert slash['from_cache'] is False
+        assert 'if-none-match' not in requests[1].headers
+        assert fragment['from_cache'] is True
+    
+    @pytest.mark.asyncio
+    async def test_cookies_and_hop_by_hop_headers_not_stored(self, tmp_path):
+        """Should strip Set-Cookie and connection-level headers before writing to disk"""
+        cache = HTTPCache(str(tmp_path))
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, html=PAGE, headers={
+                'ETag': '"v1"', 'Set-Cookie': 'session=secret', 'Connection': 'keep-alive, X-Hop',
+                'Keep-Alive': 'timeout=5', 'X-Hop': '1', 'Content-Language': 'en'
+            })
+        
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await WebsiteConnector({'http_cache': True}, client=client, http_cache=cache).execute('https://example.com/')
+        
+        headers = {name.lower() for name in cache.lookup('https://example.com/')['headers']}
+        assert 'content-language' in headers
+        assert headers.isdisjoint({'set-cookie', 'connection', 'keep-alive', 'x-hop'})
+    
+    @pytest.mark.asyncio
+    async def test_no_store_not_cached(self, tmp_path):
+        """Should not store responses without validators or marked no-store"""
+        cache = HTTPCache(str(tmp_path))
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == '/plain':
+                return httpx.Response(200, html=PAGE)
+            return httpx.Response(200, html=PAGE, headers={'ETag': '"x"', 'Cache-Control': 'no-store'})
+        
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        connector = WebsiteConnector({'http_cache': True}, client=client, http_cache=cache)
+        await connector.execute('https://example.com/plain')
+        await connector.execute('https://example.com/private')
+        
+        assert cache.get_stats()['entries'] == 0
+    
+    @pytest.mark.asyncio
+    async def test_evicted_entry_refetched(self, tmp_path):
+        """Should fetch unconditionally when the entry vanished after the 304"""
+        requests = []
+        cache = HTTPCache(str(tmp_path))
+        connector = cached_connector(cache, requests)
+        await connector.execute('https://example.com/page')
+        
+        cache.load = lambda url, namespace=None: None
+        result = await connector.execute('https://example.com/page')
+        
+        assert result['from_cache'] is False
+        assert result['html'] == PAGE
+        assert 'if-none-match' not in requests[-1].headers
+    
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, tmp_path):
+        """Should not send conditional headers unless http_cache is enabled"""
+        requests = []
+        cache = HTTPCache(str(tmp_path))
+        client = httpx.AsyncClient(transport=revalidating_transport(requests))
+        connector = WebsiteConnector(client=client, http_cache=cache)
+        
+        await connector.execute('https://example.com/page')
+        await connector.execute('https://example.com/page')
+        
+        assert all('if-none-match' not in request.headers for request in requests)
+        assert cache.get_stats()['entries'] == 0
+
+
+class TestAgencyIsolation:
+    """Test per-agency cache namespaces"""
+    
+    @pytest.mark.asyncio
+    async def test_agencies_do_not_share_entries(self, tmp_path):
+        """Should keep one agency's entries invisible to another"""
+        requests = []
+        connector = cached_connector(HTTPCache(str(tmp_path)), requests)
+        
+        set_tenant('agency-a')
+        await connector.execute('https://example.com/page')
+        set_tenant('agency-b')
+        result = await connector.execute('https://example.com/page')
+        
+        assert result['from_cache'] is False
+        assert 'if-none-match' not in requests[1].headers
+        
+        set_tenant('agency-a')
+        assert (await connector.execute('https://example.com/page'))['from_cache'] is True
+    
+    @pytest.mark.asyncio
+    async def test_shared_scope(self, tmp_path):
+        """Should share entries across agencies with http_cache_scope 'shared'"""
+        requests = []
+        connector = cached_connector(HTTPCache(str(tmp_path)), requests, http_cache_scope='shared')
+        
+        set_tenant('agency-a')
+        await connector.execute('https://example.com/page')
+        set_tenant('agency-b')
+        result = await connector.execute('https://example.com/page')
+        
+        assert result['from_cache'] is True
+    
+    def test_invalid_scope(self):
+        """Should reject unknown cache scopes"""
+        assert not WebsiteConnector({'http_cache_scope': 'team'}).validate_config()
+    
+    def test_clear_namespace(self, tmp_path):
+        """Should delete only the given agency's entries"""
+        cache = HTTPCache(str(tmp_path))
+        cache.store('https://example.com/', {'etag': '"a"'}, b'a', namespace='agency-a')
+        cache.store('https://example.com/', {'etag': '"b"'}, b'b', namespace='agency-b')
+        
+        cache.clear('agency-a')
+        
+        assert cache.lookup('https://example.com/', 'agency-a') is None
+        assert cache.lookup('https://example.com/', 'agency-b') == {'etag': '"b"'}
+
+
+class TestLRUEviction:
+    """Test size-bounded eviction"""
+    
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Should drop the oldest unused entry once max_bytes is exceeded"""
+        body = bytes(range(256)) * 8  # incompressible enough to size entries predictably
+        probe = HTTPCache(str(tmp_path / 'probe'))
+        probe.store('https://example.com/probe', {}, body)
+        entry_size = probe.get_stats()['bytes']
+        
+        cache = HTTPCache(str(tmp_path / 'cache'), max_bytes=entry_size * 2)
+        cache.store('https://example.com/1', {}, body)
+        cache.store('https://example.com/2', {}, body)
+        assert cache.load('https://example.com/1') is not None  # 1 is now most recent
+        cache.store('https://example.com/3', {}, body)
+        
+        assert cache.lookup('https://example.com/2') is None
+        assert cache.lookup('https://example.com/1') is not None
+        assert cache.lookup('https://example.com/3') is not None
+        assert cache.get_stats()['evictions'] == 1
+        assert cache.get_stats()['bytes'] <= cache.max_bytes
+    
+    def test_index_rebuilt_from_disk(self, tmp_path):
+        """Should account for entries written by a previous process"""
+        HTTPCache(str(tmp_path)).store('https://example.com/', {'etag': '"a"'}, b'body')
+        
+        cache = HTTPCache(str(tmp_path))
+        
+        assert cache.get_stats()['entries'] == 1
+        header, body = cache.load('https://example.com/')
+        assert header == {'etag': '"a"'}
+        assert body == b'body'
+    
+    def test_bodies_stored_compressed(self, tmp_path):
+        """Should store bodies gzip-compressed"""
+        cache = HTTPCache(str(tmp_path))
+        cache.store('https://example.com/', {}, PAGE.encode())
+        
+        assert cache.get_stats()['bytes'] < len(PAGE) / 4
+
+
+class TestCrawlerCache:
+    """Test recurring crawls through WebCrawler"""
+    
+    @pytest.mark.asyncio
+    async def test_recrawl_counts_cache_hits(self, tmp_path):
+        """Should report pages served from cache on a repeat crawl"""
+        requests = []
+        crawler = WebCrawler({'http_cache': True, 'rate_limit_delay': 0})
+        crawler.connector = cached_connector(HTTPCache(str(tmp_path)), requests)
+        
+        first = await crawler.execute('https://example.com/', max_depth=0)
+        second = await crawler.execute('https://example.com/', max_depth=0)
+        
+        assert first['cache_hits'] == 0
+        assert second['cache_hits'] == 1
+        assert second['pages'][0]['from_cache'] is True
+        assert second['pages'][0]['title'] == 'Cached page'
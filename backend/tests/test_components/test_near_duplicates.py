@@ -0,0 +1,95 @@
+"""
+Test near-duplicate detection - SimHash fingerprints and clustering
+"""
+import random
+from components.processors.near_duplicates import (
+    cluster_fingerprints,
+    collapse_near_duplicates,
+    hamming_distance,
+    simhash
+)
+
+
+def text(seed: int, words: int = 400):
+    rnd = random.Random(seed)
+    return [f'word{rnd.randrange(5000)}' for _ in range(words)]
+
+
+class TestSimHash:
+    """Test text fingerprints"""
+    
+    def test_deterministic_64_bit(self):
+        """Should return the same 16-digit fingerprint for the same text"""
+        fingerprint = simhash(text(1))
+        
+        assert fingerprint == simhash(text(1))
+        assert len(fingerprint) == 16
+        assert simhash([]) == ''
+    
+    def test_case_insensitive(self):
+        assert simhash(['Red', 'Shoes', 'Sale']) == simhash(['red', 'shoes', 'SALE'])
+    
+    def test_near_identical_texts_are_close(self):
+        """Should keep fingerprints of lightly edited text within a few bits"""
+        original = text(2)
+        variant = list(original)
+        variant[120] = 'blue'
+        variant[250] = 'XL'
+        
+        assert hamming_distance(simhash(original), simhash(variant)) <= 6
+    
+    def test_unrelated_texts_are_far(self):
+        """Should keep fingerprints of unrelated texts far apart"""
+        distances = [hamming_distance(simhash(text(seed)), simhash(text(seed + 100))) for seed in range(20)]
+        
+        assert min(distances) > 12
+        assert 24 <= sum(distances) / len(distances) <= 40
+
+
+class TestClustering:
+    """Test fingerprint clustering and collapsing"""
+    
+    def test_leader_clustering(self):
+        """Should join fingerprints within max_distance of a representative"""
+        fingerprints = [
+            '0000000000000000',
+            'ffffffffffffffff',
+            '0000000000000007',  # 3 bits from the first
+            '',                  # never clustered
+            '0000000000000000',  # exact duplicate
+            'fffffffffffffff0',  # 4 bits from the second
+        ]
+        
+        assert cluster_fingerprints(fingerprints, max_distance=3) == [[0, 2, 4], [1], [3], [5]]
+        assert cluster_fingerprints(fingerprints, max_distance=4) == [[0, 2, 4], [1, 5], [3]]
+        assert cluster_fingerprints(fingerprints, max_distance=0) == [[0, 4], [1], [2], [3], [5]]
+    
+    def test_matches_pairwise_comparison(self):
+        """Should find the same clusters as comparing every pair"""
+        rnd = random.Random(7)
+        bases = [rnd.getrandbits(64) for _ in range(20)]
+        values = [base ^ (1 << rnd.randrange(64)) ^ (1 << rnd.randrange(64)) for base in bases for _ in range(5)]
+        rnd.shuffle(values)
+        fingerprints = [f'{value:016x}' for value in values]
+        
+        expected = []
+        leaders = []
+        for index, value in enumerate(values):
+            for leader, members in zip(leaders, expected):
+                if (leader ^ value).bit_count() <= 4:
+                    members.append(index)
+                    break
+            else:
+                leaders.append(value)
+                expected.append([index])
+        
+        assert cluster_fingerprints(fingerprints, max_distance=4) == expected
+    
+    def test_collapse_keeps_first_page(self):
+        pages = ['home', 'red shoe', 'about', 'blue shoe', 'green shoe']
+        fingerprints = ['00000000000000ff', 'f0f0f0f0f0f0f0f0', 'ffffffff00000000', 'f0f0f0f0f0f0f0f1', 'f0f0f0f0f0f0f0f3']
+        
+        kept, collapsed = collapse_near_duplicates(pages, fingerprints)
+        
+        assert kept == ['home', 'red shoe', 'about']
+        assert collapsed == {1: [3, 4]}
@@ -0,0 +1,84 @@
+"""
+Test ParsePool - process-pool HTML parsing for WebCrawler
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+from components.processors.html_extractor import extract_html, LxmlExtractor
+from components.utils.parse_pool import ParsePool
+
+
+HTML = '<html><head><title>Café</title></head><body><h1>Big page</h1>' + '<p>word </p>' * 5000 + '</body></html>'
+
+
+@pytest.fixture
+def pool():
+    """Small pool, shut down after the test"""
+    parse_pool = ParsePool(max_workers=1, max_pending=2)
+    yield parse_pool
+    parse_pool.shutdown()
+
+
+class TestParsePool:
+    """Test worker process execution"""
+    
+    @pytest.mark.asyncio
+    async def test_parses_in_worker(self, pool):
+        """Should return the same fields as inline extraction"""
+        fields = await pool.run(extract_html, 'lxml', HTML.encode('utf-8'), 'utf-8', 'https://example.com/')
+        
+        assert fields == LxmlExtractor().extract(HTML, 'https://example.com/')
+        assert fields['title'] == 'Café'
+        assert pool.get_stats()['started']
+    
+    @pytest.mark.asyncio
+    async def test_configure_restarts(self, pool):
+        """Should apply a new size on next use"""
+        await pool.run(extract_html, 'lxml', b'<p>x</p>', None, 'https://example.com/')
+        pool.configure(max_workers=2)
+        
+        assert pool.get_stats() == {'max_workers': 2, 'max_pending': 4, 'started': False}
+
+
+class TestCrawlerParseStage:
+    """Test WebCrawler routing between inline and pooled parsing"""
+    
+    @staticmethod
+    def _crawler(**config):
+        from components.processors.web_crawler import WebCrawler
+        return WebCrawler(config={'parse_pool': True, **config})
+    
+    @pytest.mark.asyncio
+    async def test_small_pages_inline(self):
+        """Should not use the pool below parse_inline_max_bytes"""
+        crawler = self._crawler(parse_inline_max_bytes=len(HTML) + 1)
+        
+        with patch('components.processors.web_crawler.parse_pool.run', new_callable=AsyncMock) as run:
+            fields = await crawler._extract({'html': HTML}, 'https://example.com/')
+        
+        run.assert_not_called()
+        assert fields['h1_tags'] == ['Big page']
+    
+    @pytest.mark.asyncio
+    async def test_large_pages_pooled(self):
+        """Should send raw bytes and encoding to the pool for large pages"""
+        crawler = self._crawler(parse_inline_max_bytes=1024)
+        fetch_result = {'html': HTML, 'content': HTML.encode('latin-1'), 'encoding': 'latin-1'}
+        
+        with patch('components.processors.web_crawler.parse_pool.run', new_callable=AsyncMock) as run:
+            run.return_value = {'title': 'pooled'}
+            fields = await crawler._extract(fetch_result, 'https://example.com/')
+        
+        assert fields == {'title': 'pooled'}
+        assert run.call_args[0][1:] == ('lxml', fetch_result['content'], 'latin-1', 'https://example.com/', False)
+    
+    @pytest.mark.asyncio
+    async def test_broken_pool_falls_back_inline(self):
+        """Should parse inline when the pool is broken"""
+        from concurrent.futures.process import BrokenProcessPool
+        crawler = self._crawler(parse_inline_max_bytes=1024)
+        
+        with patch('components.processors.web_crawler.parse_pool.run', new_callable=AsyncMock) as run:
+            run.side_effect = BrokenProcessPool('worker died')
+            fields = await crawler._extract({'html': HTML}, 'https://example.com/')
+        
+        assert fields['h1_tags'] == ['Big page']
@@ -0,0 +1,123 @@
+"""
+Test robots.txt parsing and per-host caching
+"""
+import pytest
+from components.utils.robots import RobotsRules, RobotsCache
+
+
+ROBOTS = """
+# Example robots.txt
+User-agent: *
+Disallow: /admin
+Disallow: /*?sort=
+Allow: /admin/public
+Disallow: /*.pdf$
+Crawl-delay: 2
+
+User-agent: TeamAI-Bot
+User-agent: OtherBot
+Disallow: /private
+Crawl-delay: 0.5
+
+Sitemap: https://example.com/sitemap_index.xml
+"""
+
+
+class TestRobotsRules:
+    """Test rule matching"""
+    
+    def test_wildcard_group_rules(self):
+        """Should apply * group rules with longest match winning"""
+        rules = RobotsRules(ROBOTS)
+        
+        assert rules.can_fetch('SomeBot/2.0', 'https://example.com/')
+        assert not rules.can_fetch('SomeBot/2.0', 'https://example.com/admin/users')
+        assert rules.can_fetch('SomeBot/2.0', 'https://example.com/admin/public/page')
+        assert not rules.can_fetch('SomeBot/2.0', 'https://example.com/shop?sort=price')
+        assert rules.can_fetch('SomeBot/2.0', 'https://example.com/shop?page=2')
+    
+    def test_end_anchor(self):
+        """Should honour $ anchors"""
+        rules = RobotsRules(ROBOTS)
+        
+        assert not rules.can_fetch('SomeBot', 'https://example.com/files/report.pdf')
+        assert rules.can_fetch('SomeBot', 'https://example.com/files/report.pdf.html')
+    
+    def test_specific_group_replaces_wildcard(self):
+        """Should use only the most specific user-agent group"""
+        rules = RobotsRules(ROBOTS)
+        
+        assert rules.can_fetch('TeamAI-Bot/1.0', 'https://example.com/admin')
+        assert not rules.can_fetch('TeamAI-Bot/1.0', 'https://example.com/private/x')
+        assert rules.crawl_delay('TeamAI-Bot/1.0') == 0.5
+        assert rules.crawl_delay('SomeBot') == 2.0
+    
+    def test_allow_wins_ties(self):
+        """Should allow when equally long allow and disallow rules match"""
+        rules = RobotsRules("User-agent: *\nDisallow: /page\nAllow: /page\n")
+        
+        assert rules.can_fetch('Bot', 'https://example.com/page')
+    
+    def test_sitemaps_and_empty(self):
+        """Should collect Sitemap lines and allow everything without rules"""
+        assert RobotsRules(ROBOTS).sitemaps == ['https://example.com/sitemap_index.xml']
+        assert RobotsRules('').can_fetch('Bot', 'https://example.com/anything')
+        assert RobotsRules('').crawl_delay('Bot') is None
+    
+    def test_disallow_all(self):
+        """Should block everything but robots.txt itself"""
+        rules = RobotsRules(disallow_all=True)
+        
+        assert not rules.can_fetch('Bot', 'https://example.com/')
+        assert rules.can_fetch('Bot', 'https://example.com/robots.txt')
+
+
+class TestRobotsCache:
+    """Test per-host caching and fetch failure handling"""
+    
+    @staticmethod
+    def fetcher(status_code, text='', calls=None):
+        async def fetch(url):
+            if calls is not None:
+                calls.append(url)
+            return {'url': url, 'status_code': status_code, 'html': text}
+        return fetch
+    
+    @pytest.mark.asyncio
+    async def test_fetched_once_per_host(self):
+        """Should reuse cached rules within ttl"""
+        calls = []
+        cache = RobotsCache()
+        fetch = self.fetcher(200, ROBOTS, calls)
+        
+        first = await cache.get('https://example.com', fetch)
+        second = await cache.get('https://example.com', fetch)
+        
+        assert first is second
+        assert calls == ['https://example.com/robots.txt']
+    
+    @pytest.mark.asyncio
+    async def test_missing_robots_allows_all(self):
+        """Should allow everything when robots.txt is 404"""
+        rules = await RobotsCache().get('https://example.com', self.fetcher(404))
+        
+        assert rules.can_fetch('Bot', 'https://example.com/admin')
+    
+    @pytest.mark.asyncio
+    async def test_server_error_disallows_all(self):
+        """Should disallow everything when robots.txt is unreachable"""
+        rules = await RobotsCache().get('https://example.com', self.fetcher(503))
+        
+        assert not rules.can_fetch('Bot', 'https://example.com/')
+    
+    @pytest.mark.asyncio
+    async def test_expired_entries_refetched(self):
+        """Should refetch after ttl"""
+        calls = []
+        cache = RobotsCache(ttl=0, error_ttl=0)
+        fetch = self.fetcher(200, ROBOTS, calls)
+        
+        await cache.get('https://example.com', fetch)
+        await cache.get('https://example.com', fetch)
+        
+        assert len(calls) == 2
@@ -0,0 +1,94 @@
+"""
+Test streaming sitemap parsing
+"""
+import gzip
+import pytest
+from components.utils.sitemap import SitemapParser, SitemapTooLarge
+
+
+URLSET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">
+  <url><loc>https://example.com/</loc><priority>1.0</priority></url>
+  <url>
+    <loc> https://example.com/pricing </loc>
+    <lastmod>2026-09-01</lastmod>
+    <priority>0.8</priority>
+    <image:image><image:loc>https://cdn.example.com/a.png</image:loc></image:image>
+  </url>
+  <url><loc>https://example.com/blog</loc><priority>high</priority></url>
+</urlset>
+"""
+
+INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://example.com/sitemap-pages.xml.gz</loc></sitemap>
+  <sitemap><loc>https://example.com/sitemap-blog.xml</loc></sitemap>
+</sitemapindex>
+"""
+
+
+def parse(data: bytes, chunk_size: int = 7, **kwargs):
+    parser = SitemapParser(**kwargs)
+    entries = []
+    for offset in range(0, len(data), chunk_size):
+        entries.extend(parser.feed(data[offset:offset + chunk_size]))
+    entries.extend(parser.close())
+    return entries
+
+
+class TestSitemapParser:
+    """Test urlset and index parsing"""
+    
+    def test_urlset(self):
+        """Should return page entries with priority and lastmod"""
+        entries = parse(URLSET)
+        
+        assert [entry['loc'] for entry in entries] == [
+            'https://example.com/', 'https://example.com/pricing', 'https://example.com/blog'
+        ]
+        assert entries[1] == {
+            'loc': 'https://example.com/pricing', 'priority': 0.8, 'lastmod': '2026-09-01', 'sitemap': False
+        }
+        assert entries[2]['priority'] == 0.5  # invalid priority falls back to the default
+    
+    def test_sitemap_index(self):
+        """Should mark index entries as sitemaps"""
+        entries = parse(INDEX)
+        
+        assert [entry['sitemap'] for entry in entries] == [True, True]
+        assert entries[0]['loc'] == 'https://example.com/sitemap-pages.xml.gz'
+    
+    def test_gzip_streamed(self):
+        """Should detect and decompress gzip across chunk boundaries"""
+        assert parse(gzip.compress(URLSET), chunk_size=1) == parse(URLSET)
+    
+    def test_entries_returned_while_streaming(self):
+        """Should hand out entries before the document ends"""
+        parser = SitemapParser()
+        cut = URLSET.index(b'<url><loc>https://example.com/blog')
+        
+        assert [entry['loc'] for entry in parser.feed(URLSET[:cut])] == [
+            'https://example.com/', 'https://example.com/pricing'
+        ]
+    
+    def test_size_limit(self):
+        """Should stop once the decompressed size exceeds max_bytes"""
+        with pytest.raises(SitemapTooLarge):
+            parse(gzip.compress(URLSET * 100), chunk_size=64, max_bytes=1024)
+    
+    def test_truncated_document(self):
+        """Should keep entries parsed before a truncated tail"""
+        entries = parse(URLSET[:URLSET.index(b'<url><loc>https://example.com/blog') + 20])
+        
+        assert len(entries) == 2
+    
+    def test_entities_not_expanded(self):
+        """Should not resolve external entities"""
+        doc = (
+            b'<?xml version="1.0"?><!DOCTYPE urlset [<!ENTITY x SYSTEM "file:///etc/passwd">]>'
+            b'<urlset><url><loc>https://example.com/&x;</loc></url></urlset>'
+        )
+        entries = parse(doc)
+        
+        assert all('root:' not in entry['loc'] for entry in entries)
@@ -0,0 +1,79 @@
+"""
+Test URL canonicalization and frontier seen-sets
+"""
+import pytest
+from components.utils.url_canonicalizer import (
+    URLCanonicalizer, BloomFilter, canonicalize_url, fetch_url, make_seen_set
+)
+
+
+class TestURLCanonicalizer:
+    """Test canonical URL forms"""
+    
+    @pytest.mark.parametrize('url,expected', [
+        ('HTTPS://Example.COM/About', 'https://example.com/About'),
+        ('https://example.com:443/a', 'https://example.com/a'),
+        ('http://example.com:80/a', 'http://example.com/a'),
+        ('http://example.com:8080/a', 'http://example.com:8080/a'),
+        ('https://example.com/a#top', 'https://example.com/a'),
+        ('https://example.com/a/', 'https://example.com/a'),
+        ('https://example.com', 'https://example.com/'),
+        ('https://example.com/?utm_source=x&b=2&a=1&gclid=y', 'https://example.com/?a=1&b=2'),
+        ('https://example.com/caf%c3%a9', 'https://example.com/caf%C3%A9'),
+        ('https://example.com/a%2fb?q', 'https://example.com/a%2Fb?q='),
+        ('https://example.com/%7Euser/a%2Db', 'https://example.com/~user/a-b'),
+    ])
+    def test_default_rules(self, url, expected):
+        """Should map equivalent URLs to one form"""
+        assert canonicalize_url(url) == expected
+    
+    def test_configurable_params(self):
+        """Should strip only the configured parameters"""
+        canonicalizer = URLCanonicalizer(strip_params=['page', 'sort*'])
+        
+        assert canonicalizer('https://e.com/?page=2&sort_by=x&utm_source=y') == 'https://e.com/?utm_source=y'
+    
+    def test_fetch_url(self):
+        """Should keep the linked form apart from fragments and an empty path"""
+        assert fetch_url('https://example.com/blog/?page=2#comments') == 'https://example.com/blog/?page=2'
+        assert fetch_url('https://example.com') == 'https://example.com/'
+        assert fetch_url('https://example.com/a%2Fb') == 'https://example.com/a%2Fb'
+    
+    def test_keep_trailing_slash(self):
+        """Should keep trailing slashes when configured"""
+        assert URLCanonicalizer(keep_trailing_slash=True)('https://e.com/a/') == 'https://e.com/a/'
+
+
+class TestSeenSets:
+    """Test exact and Bloom seen-sets"""
+    
+    def test_bloom_no_false_negatives(self):
+        """Should always report added items"""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        urls = [f'https://example.com/{i}' for i in range(1000)]
+        for url in urls:
+            bloom.add(url)
+        
+        assert all(url in bloom for url in urls)
+    
+    def test_bloom_false_positive_rate(self):
+        """Should stay near the configured error rate at capacity"""
+        bloom = BloomFilter(capacity=5000, error_rate=0.01)
+        for i in range(5000):
+            bloom.add(f'https://example.com/{i}')
+        
+        false_positives = sum(f'https://other.com/{i}' in bloom for i in range(5000))
+        assert false_positives / 5000 < 0.03
+    
+    def test_bloom_fixed_memory(self):
+        """Should size the bit array from capacity and error rate"""
+        bloom = BloomFilter(capacity=1_000_000, error_rate=0.001)
+        
+        assert len(bloom._bits) < 2 * 1024 * 1024
+    
+    def test_make_seen_set(self):
+        """Should build the requested kind"""
+        assert isinstance(make_seen_set('exact'), set)
+        assert isinstance(make_seen_set('bloom', capacity=10), BloomFilter)
+        with pytest.raises(ValueError):
+            make_seen_set('other')
@@ -0,0 +1,678 @@
+"""
+Test WebCrawler - concurrent frontier, per-host politeness, crawl limits
+"""
+import asyncio
+import gzip
+import time
+import pytest
+from unittest.mock import AsyncMock
+from components.processors.crawl_result import expand_crawl
+from components.processors.web_crawler import WebCrawler
+from components.base import set_tenant
+from components.utils.cache_manager import CacheManager
+from components.utils.crawl_index import CrawlIndexStore
+from components.utils.host_throttle import HostThrottle
+from components.utils.robots import robots_cache
+
+
+def make_site(fanout: int = 3, depth: int = 3):
+    """Synthetic site: every page links to `fanout` children, `depth` levels deep"""
+    site = {}
+    
+    def build(path: str, level: int):
+        children = [f'{path}/{i}' for i in range(fanout)] if level < depth else []
+        links = ''.join(f'<a href="{child}">{child}</a>' for child in children)
+        site[f'https://example.com{path or "/"}'] = (
+            f'<html><head><title>{path or "home"}</title></head>'
+            f'<body><h1>{path}</h1>{links}<a href="https://other.com/x">ext</a></body></html>'
+        )
+        for child in children:
+            build(child, level + 1)
+    
+    build('', 0)
+    return site
+
+
+class FakeConnector:
+    """Stands in for WebsiteConnector, records concurrency per host"""
+    
+    def __init__(self, site, latency: float = 0.01):
+        self.site = site
+        self.latency = latency
+        self.fetched = []
+        self.content_types = {}
+        self.active = 0
+        self.max_active = 0
+    
+    async def execute(self, url, content_types=None):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.latency)
+            self.fetched.append(url)
+            self.content_types[url] = content_types
+            html = self.site.get(url)
+            if isinstance(html, dict):
+                return {'url': url, 'html': None, **html}  # canned fetch result (errors)
+            if html is None:
+                return {'url': url, 'status_code': 404, 'error': 'HTTP 404', 'html': None}
+            if isinstance(html, bytes):
+                return {'url': url, 'status_code': 200, 'html': html.decode('latin-1'), 'content': html}
+            return {'url': url, 'status_code': 200, 'html': html, 'elapsed_ms': 10}
+        finally:
+            self.active -= 1
+    
+    async def stream(self, url):
+        self.fetched.append(url)
+        body = self.site.get(url)
+        if body is None:
+            raise ValueError('HTTP 404')
+        if isinstance(body, str):
+            body = body.encode()
+        for offset in range(0, len(body), 64):
+            yield body[offset:offset + 64]
+    
+    async def aclose(self):
+        pass
+
+
+def crawler(site, latency=0.01, **config):
+    instance = WebCrawler(config={'rate_limit_delay': 0, 'respect_robots': False, 'sitemaps': False, **config})
+    instance.connector = FakeConnector(site, latency)
+    return instance
+
+
+class TestConcurrentCrawl:
+    """Test worker pool over the frontier"""
+    
+    @pytest.mark.asyncio
+    async def test_respects_max_pages(self):
+        """Should never return (or fetch) more than max_pages pages"""
+        web_crawler = crawler(make_site(), max_pages=10, concurrency=8, per_host_concurrency=8)
+        result = await web_crawler.execute('https://example.com/', max_depth=3)
+        
+        assert result['total_pages'] == 10
+        assert len(web_crawler.connector.fetched) == 10
+        assert set(result) >= {'pages', 'total_pages', 'visited_urls', 'base_url'}
+    
+    @pytest.mark.asyncio
+    async def test_respects_max_depth_and_domain(self):
+        """Should stop at max_depth and stay on the start domain"""
+        web_crawler = crawler(make_site(fanout=2, depth=3), max_pages=100)
+        result = await web_crawler.execute('https://example.com/', max_depth=1)
+        
+        assert result['total_pages'] == 3
+        assert max(page['depth'] for page in result['pages']) == 1
+        assert not any('other.com' in url for url in web_crawler.connector.fetched)
+    
+    @pytest.mark.asyncio
+    async def test_breadth_first_output_order(self):
+        """Should return pages in discovery order regardless of completion order"""
+        web_crawler = crawler(make_site(fanout=2, depth=2), max_pages=100, concurrency=4, per_host_concurrency=4)
+        result = await web_crawler.execute('https://example.com/', max_depth=2)
+        
+        depths = [page['depth'] for page in result['pages']]
+        assert depths == sorted(depths)
+        assert result['visited_urls'] == [page['url'] for page in result['pages']]
+        assert result['total_pages'] == 7
+    
+    @pytest.mark.asyncio
+    async def test_fetches_concurrently(self):
+        """Should overlap fetches up to the per-host limit"""
+        web_crawler = crawler(make_site(fanout=4, depth=2), latency=0.05, max_pages=21,
+                              concurrency=8, per_host_concurrency=3)
+        await web_crawler.execute('https://example.com/', max_depth=2)
+        
+        assert web_crawler.connector.max_active == 3
+    
+    @pytest.mark.asyncio
+    async def test_failed_pages_skipped(self):
+        """Should skip pages that fail to fetch and keep crawling"""
+        site = make_site(fanout=2, depth=1)
+        del site['https://example.com/0']
+        web_crawler = crawler(site, max_pages=10)
+        result = await web_crawler.execute('https://example.com/', max_depth=1)
+        
+        assert [page['url'] for page in result['pages']] == ['https://example.com/', 'https://example.com/1']
+
+
+class TestHostThrottle:
+    """Test per-host politeness"""
+    
+    @pytest.mark.asyncio
+    async def test_spaces_request_starts(self):
+        """Should space request starts to one host by delay"""
+        throttle = HostThrottle(concurrency=4, delay=0.02)
+        starts = []
+        
+        async def request():
+            async with throttle.slot('example.com'):
+                starts.append(time.monotonic())
+        
+        await asyncio.gather(*(request() for _ in range(4)))
+        
+        gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+        assert all(gap >= 0.015 for gap in gaps)
+    
+    @pytest.mark.asyncio
+    async def test_hosts_independent(self):
+        """Should not delay requests to other hosts"""
+        throttle = HostThrottle(concurrency=1, delay=1.0)
+        start = time.monotonic()
+        
+        for host in ('a.com', 'b.com', 'c.com'):
+            async with throttle.slot(host):
+                pass
+        
+        assert time.monotonic() - start < 0.5
+    
+    def test_per_host_delay_defaults_to_rate_limit(self):
+        """Should keep the per-host rate at rate_limit_delay unless overridden"""
+        assert WebCrawler({'rate_limit_delay': 0.5, 'per_host_concurrency': 4}).per_host_delay == 0.5
+        assert WebCrawler({'rate_limit_delay': 0.5, 'per_host_delay': 0.1}).per_host_delay == 0.1
+
+
+class TestFrontierDeduplication:
+    """Test canonical enqueue-time deduplication"""
+    
+    SITE = {
+        'https://example.com/': (
+            '<a href="/a">a</a><a href="/a#top">a</a><a href="/a/">a</a>'
+            '<a href="/a?utm_source=nav">a</a><a href="HTTPS://EXAMPLE.COM:443/a">a</a><a href="/b">b</a>'
+        ),
+        'https://example.com/a': '<a href="/">home</a><a href="/b">b</a>',
+        'https://example.com/b': '<a href="/a">a</a>',
+    }
+    
+    @pytest.mark.parametrize('seen_set', ['exact', 'bloom'])
+    @pytest.mark.asyncio
+    async def test_equivalent_links_fetched_once(self, seen_set):
+        """Should fetch each canonical URL once"""
+        web_crawler = crawler(self.SITE, max_pages=50, seen_set=seen_set)
+        result = await web_crawler.execute('https://example.com', max_depth=3)
+        
+        assert sorted(web_crawler.connector.fetched) == sorted(self.SITE)
+        assert result['total_pages'] == 3
+    
+    @pytest.mark.asyncio
+    async def test_relative_links_from_directory_url(self):
+        """Should fetch the URL as linked and resolve relative links against it"""
+        site = {
+            'https://example.com/blog/': '<a href="post-1">post</a><a href="?page=2">next</a>',
+            'https://example.com/blog/post-1': '<p>post</p>',
+            'https://example.com/blog/?page=2': '<p>page 2</p>',
+        }
+        web_crawler = crawler(site, max_pages=50)
+        result = await web_crawler.execute('https://example.com/blog/', max_depth=2)
+        
+        assert sorted(web_crawler.connector.fetched) == sorted(site)
+        assert result['pages'][0]['links'] == ['https://example.com/blog/post-1', 'https://example.com/blog/?page=2']
+    
+    @pytest.mark.asyncio
+    async def test_links_resolve_against_redirect_target(self):
+        """Should resolve relative links against the final URL after redirects"""
+        site = {
+            'https://example.com/old': {
+                'status_code': 200, 'html': '<a href="child">child</a>', 'url': 'https://example.com/new/'
+            },
+            'https://example.com/new/child': '<p>child</p>',
+        }
+        web_crawler = crawler(site, max_pages=50)
+        await web_crawler.execute('https://example.com/old', max_depth=1)
+        
+        assert web_crawler.connector.fetched == ['https://example.com/old', 'https://example.com/new/child']
+    
+    @pytest.mark.asyncio
+    async def test_invalid_seen_set(self):
+        """Should reject unknown seen_set kinds"""
+        with pytest.raises(ValueError):
+            await crawler(self.SITE, seen_set='other').execute('https://example.com')
+
+
+class TestExtractorConfig:
+    """Test extractor selection in WebCrawler"""
+    
+    @pytest.mark.asyncio
+    async def test_extractors_produce_same_pages(self):
+        """Should return identical crawl output with either extractor"""
+        site = make_site(fanout=2, depth=2)
+        fast = await crawler(site, max_pages=50, extractor='lxml').execute('https://example.com/', max_depth=2)
+        reference = await crawler(site, max_pages=50, extractor='beautifulsoup').execute('https://example.com/', max_depth=2)
+        
+        assert fast == reference
+    
+    @pytest.mark.asyncio
+    async def test_unknown_extractor(self):
+        """Should reject unknown extractors"""
+        with pytest.raises(ValueError):
+            await crawler(make_site(), extractor='regex').execute('https://example.com/')
+
+
+def urlset(*entries):
+    """Sitemap XML for (path, priority) pairs"""
+    urls = ''.join(
+        f'<url><loc>https://example.com{path}</loc><priority>{priority}</priority></url>'
+        for path, priority in entries
+    )
+    return f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+
+
+class TestDiscovery:
+    """Test robots.txt and sitemap seeding"""
+    
+    @pytest.fixture(autouse=True)
+    def clear_robots_cache(self):
+        robots_cache.clear()
+        yield
+        robots_cache.clear()
+    
+    @staticmethod
+    def discovering_crawler(site, latency=0.01, **config):
+        return crawler(site, latency, **{'respect_robots': True, 'sitemaps': True, **config})
+    
+    @pytest.mark.asyncio
+    async def test_sitemap_urls_seeded_by_priority(self):
+        """Should crawl sitemap URLs right after the start page, best first"""
+        site = make_site(fanout=3, depth=2)
+        site['https://example.com/sitemap.xml'] = urlset(('/1/1', 0.3), ('/2/2', 0.9), ('https://other.com/x', 1.0))
+        
+        result = await self.discovering_crawler(site, max_pages=3, concurrency=1).execute(
+            'https://example.com/', max_depth=2
+        )
+        
+        assert result['visited_urls'] == [
+            'https://example.com/', 'https://example.com/2/2', 'https://example.com/1/1'
+        ]
+        assert result['sitemap_urls'] == 2
+    
+    @pytest.mark.asyncio
+    async def test_sitemap_index_and_robots_sitemap(self):
+        """Should follow Sitemap: lines and gzipped sitemap indexes"""
+        site = make_site(fanout=2, depth=2)
+        site['https://example.com/robots.txt'] = 'User-agent: *\nSitemap: https://example.com/index.xml\n'
+        site['https://example.com/index.xml'] = (
+            '<sitemapindex><sitemap><loc>https://example.com/pages.xml.gz</loc></sitemap></sitemapindex>'
+        )
+        site['https://example.com/pages.xml.gz'] = gzip.compress(urlset(('/1/0', 0.5)).encode())
+        
+        web_crawler = self.discovering_crawler(site, max_pages=2, concurrency=1)
+        result = await web_crawler.execute('https://example.com/', max_depth=2)
+        
+        assert result['visited_urls'] == ['https://example.com/', 'https://example.com/1/0']
+        assert 'https://example.com/sitemap.xml' not in web_crawler.connector.fetched
+    
+    @pytest.mark.asyncio
+    async def test_sitemaps_off_by_default(self):
+        """Should not request sitemaps unless enabled"""
+        site = make_site(fanout=2, depth=1)
+        site['https://example.com/sitemap.xml'] = urlset(('/1', 1.0))
+        
+        web_crawler = crawler(site, respect_robots=True, max_pages=50)
+        result = await web_crawler.execute('https://example.com/', max_depth=1)
+        
+        assert 'https://example.com/sitemap.xml' not in web_crawler.connector.fetched
+        assert result['sitemap_urls'] == 0
+    
+    @pytest.mark.asyncio
+    async def test_sitemap_fetched_as_xml_like_pages(self, capsys):
+        """Should accept only XML/gzip sitemaps and skip soft-404s without parsing them"""
+        from components.utils.sitemap import SITEMAP_CONTENT_TYPES
+        site = make_site(fanout=2, depth=1)
+        # What the connector returns for an HTML soft-404 when only XML is accepted
+        site['https://example.com/sitemap.xml'] = {
+            'status_code': 200, 'error': 'Unsupported content type: text/html', 'attempts': 1
+        }
+        
+        web_crawler = self.discovering_crawler(site, max_pages=50)
+        result = await web_crawler.execute('https://example.com/', max_depth=1)
+        
+        assert web_crawler.connector.content_types['https://example.com/sitemap.xml'] == SITEMAP_CONTENT_TYPES
+        assert result['total_pages'] == 3
+        assert result['sitemap_urls'] == 0
+        assert 'Error reading sitemap' not in capsys.readouterr().out
+    
+    @pytest.mark.asyncio
+    async def test_sitemap_failures_count_against_host(self):
+        """Should retry sitemaps and record their failures in the circuit breaker"""
+        site = make_site(fanout=2, depth=1)
+        site['https://example.com/sitemap.xml'] = {'status_code': 503, 'error': 'HTTP 503', 'attempts': 4}
+        
+        result = await self.discovering_crawler(site, max_pages=50, breaker_threshold=1).execute(
+            'https://example.com/', max_depth=1
+        )
+        
+        assert result['retries'] == 3
+        assert result['breaker_trips'] == 1
+        assert result['total_pages'] == 0
+    
+    @pytest.mark.asyncio
+    async def test_disallowed_urls_never_fetched(self):
+        """Should skip URLs disallowed by robots.txt without fetching them"""
+        site = make_site(fanout=2, depth=2)
+        site['https://example.com/robots.txt'] = 'User-agent: *\nDisallow: /1\n'
+        site['https://example.com/sitemap.xml'] = urlset(('/1/1', 1.0))
+        
+        web_crawler = self.discovering_crawler(site, max_pages=50)
+        result = await web_crawler.execute('https://example.com/', max_depth=2)
+        
+        assert not any(url.startswith('https://example.com/1') for url in web_crawler.connector.fetched)
+        assert result['total_pages'] == 4  # /, /0, /0/0, /0/1
+        assert result['robots_disallowed'] == 2  # /1/1 (sitemap) and /1 (link)
+    
+    @pytest.mark.asyncio
+    async def test_robots_ignored_when_disabled(self):
+        """Should fetch disallowed URLs when respect_robots is off"""
+        site = make_site(fanout=2, depth=1)
+        site['https://example.com/robots.txt'] = 'User-agent: *\nDisallow: /\n'
+        
+        result = await crawler(site, respect_robots=False, sitemaps=True, max_pages=50).execute(
+            'https://example.com/', max_depth=1
+        )
+        
+        assert result['total_pages'] == 3
+        assert result['robots_disallowed'] == 0
+    
+    @pytest.mark.asyncio
+    async def test_crawl_delay_spaces_requests(self):
+        """Should space requests to the host by robots.txt Crawl-delay"""
+        site = make_site(fanout=2, depth=1)
+        site['https://example.com/robots.txt'] = 'User-agent: *\nCrawl-delay: 0.1\n'
+        
+        web_crawler = self.discovering_crawler(site, max_pages=3, sitemaps=False, latency=0)
+        start = time.monotonic()
+        await web_crawler.execute('https://example.com/', max_depth=1)
+        
+        assert time.monotonic() - start >= 0.2  # three page starts, 0.1s apart
+    
+    @pytest.mark.asyncio
+    async def test_robots_fetched_once_per_host(self):
+        """Should reuse cached robots.txt across crawls"""
+        site = make_site(fanout=1, depth=1)
+        web_crawler = self.discovering_crawler(site, sitemaps=False)
+        
+        await web_crawler.execute('https://example.com/')
+        await web_crawler.execute('https://example.com/')
+        
+        assert web_crawler.connector.fetched.count('https://example.com/robots.txt') == 1
+
+
+class TestFailureHandling:
+    """Test retry counters and the per-host circuit breaker"""
+    
+    @pytest.mark.asyncio
+    async def test_breaker_stops_fetching_dead_host(self):
+        """Should stop requesting a host after breaker_threshold failed pages"""
+        site = {'https://example.com/': ''.join(f'<a href="/{i}">{i}</a>' for i in range(20))}
+        for i in range(20):
+            site[f'https://example.com/{i}'] = {'status_code': 0, 'error': 'Connection refused', 'attempts': 4}
+        
+        web_crawler = crawler(site, max_pages=50, concurrency=1, breaker_threshold=3)
+        result = await web_crawler.execute('https://example.com/', max_depth=1)
+        
+        assert len(web_crawler.connector.fetched) == 4  # start page + 3 failures
+        assert result['total_pages'] == 1
+        assert result['failed_pages'] == 3
+        assert result['retries'] == 9
+        assert result['breaker_trips'] == 1
+        assert result['breaker_skipped'] == 17
+        assert result['breaker_open_hosts'] == ['example.com']
+    
+    @pytest.mark.asyncio
+    async def test_missing_pages_do_not_trip_breaker(self):
+        """Should treat 404s as a healthy host"""
+        site = {'https://example.com/': ''.join(f'<a href="/{i}">{i}</a>' for i in range(10))}
+        
+        web_crawler = crawler(site, max_pages=50, concurrency=1, breaker_threshold=3)
+        result = await web_crawler.execute('https://example.com/', max_depth=1)
+        
+        assert len(web_crawler.connector.fetched) == 11
+        assert result['failed_pages'] == 10
+        assert result['breaker_trips'] == 0
+
+
+class TestCompactOutput:
+    """Test output_format 'compact'"""
+    
+    @pytest.mark.asyncio
+    async def test_compact_expands_to_full_output(self):
+        """Should produce compact output that expands to the full crawl"""
+        site = make_site(fanout=3, depth=2)
+        full = await crawler(site, max_pages=50).execute('https://example.com/', max_depth=2)
+        compact = await crawler(site, max_pages=50, output_format='compact').execute(
+            'https://example.com/', max_depth=2
+        )
+        
+        assert compact['format'] == 'compact'
+        assert compact['total_pages'] == full['total_pages'] == 13
+        assert expand_crawl(compact) == full
+    
+    @pytest.mark.asyncio
+    async def test_mock_mode_compact(self):
+        """Should compact mock crawl output as well"""
+        result = await WebCrawler({'output_format': 'compact'}, mock_mode=True).execute('https://example.com')
+        
+        assert result['format'] == 'compact'
+        assert expand_crawl(result)['pages'][0]['title'] == 'Example Domain - SEO Test'
+    
+    @pytest.mark.asyncio
+    async def test_invalid_output_format(self):
+        """Should reject unknown output formats"""
+        with pytest.raises(ValueError):
+            await crawler(make_site(), output_format='tiny').execute('https://example.com/')
+
+
+class TestIncrementalCrawl:
+    """Test incremental recrawls against the per-site crawl index"""
+    
+    @staticmethod
+    def incremental_crawler(site, store, **config):
+        instance = crawler(site, max_pages=50, incremental=True, **config)
+        instance.index_store = store
+        return instance
+    
+    @pytest.mark.asyncio
+    async def test_recrawl_reuses_unchanged_pages(self, monkeypatch):
+        """Should reparse only new and changed pages and report the change set"""
+        store = CrawlIndexStore(CacheManager())
+        site = make_site(fanout=2, depth=2)
+        first = await self.incremental_crawler(site, store).execute('https://example.com/', max_depth=2)
+        
+        assert first['reused_pages'] == 0
+        assert 'changes' not in first  # First audit: no previous index to compare with
+        
+        # Change one page, remove another (and its link) between audits
+        site['https://example.com/0'] = site['https://example.com/0'].replace('<h1>/0</h1>', '<h1>Updated</h1>')
+        del site['https://example.com/1/1']
+        site['https://example.com/1'] = site['https://example.com/1'].replace('<a href="/1/1">/1/1</a>', '')
+        
+        second_crawler = self.incremental_crawler(site, store)
+        parsed = []
+        extract = second_crawler._extract
+        
+        async def counting_extract(fetch_result, url):
+            parsed.append(url)
+            return await extract(fetch_result, url)
+        
+        monkeypatch.setattr(second_crawler, '_extract', counting_extract)
+        second = await second_crawler.execute('https://example.com/', max_depth=2)
+        
+        assert sorted(parsed) == ['https://example.com/0', 'https://example.com/1']
+        assert second['changes']['changed'] == ['https://example.com/0', 'https://example.com/1']
+        assert second['changes']['new'] == []
+        assert second['changes']['missing'] == ['https://example.com/1/1']
+        assert len(second['changes']['unchanged']) == second['reused_pages'] == 4
+        
+        # Reused pages are indistinguishable from reparsed ones
+        fresh = await crawler(site, max_pages=50).execute('https://example.com/', max_depth=2)
+        assert second['pages'] == fresh['pages']
+    
+    @pytest.mark.asyncio
+    async def test_revalidated_pages_are_reused(self):
+        """Should reuse stored fields for 304-revalidated pages without comparing bodies"""
+        store = CrawlIndexStore(CacheManager())
+        site = make_site(fanout=1, depth=1)
+        await self.incremental_crawler(site, store).execute('https://example.com/', max_depth=1)
+        
+        web_crawler = self.incremental_crawler(site, store)
+        execute = web_crawler.connector.execute
+        
+        async def revalidated(url, content_types=None):
+            return {**await execute(url), 'content': b're-encoded body', 'from_cache': True}
+        
+        web_crawler.connector.execute = revalidated
+        result = await web_crawler.execute('https://example.com/', max_depth=1)
+        
+        assert result['reused_pages'] == 2
+        assert result['cache_hits'] == 2
+    
+    @pytest.mark.asyncio
+    async def test_index_is_scoped_per_agency(self):
+        """Should not reuse another agency's crawl index"""
+        store = CrawlIndexStore(CacheManager())
+        site = make_site(fanout=1, depth=1)
+        
+        async def audit(agency_id):
+            set_tenant(agency_id)
+            try:
+                return await self.incremental_crawler(site, store).execute('https://example.com/', max_depth=1)
+            finally:
+                set_tenant(None)
+        
+        await audit('agency-a')
+        assert (await audit('agency-b'))['reused_pages'] == 0
+        assert (await audit('agency-a'))['reused_pages'] == 2
+    
+    @pytest.mark.asyncio
+    async def test_compact_output_keeps_change_set(self):
+        """Should carry the change set through compact output"""
+        store = CrawlIndexStore(CacheManager())
+        site = make_site(fanout=1, depth=1)
+        await self.incremental_crawler(site, store).execute('https://example.com/', max_depth=1)
+        site['https://example.com/0'] += '<p>new paragraph</p>'
+        result = await self.incremental_crawler(site, store, output_format='compact').execute(
+            'https://example.com/', max_depth=1
+        )
+        
+        assert result['format'] == 'compact'
+        assert expand_crawl(result)['changes'] == {
+            'new': [], 'changed': ['https://example.com/0'], 'unchanged': ['https://example.com/'], 'missing': []
+        }
+    
+    @pytest.mark.asyncio
+    async def test_store_bounds_site_count(self):
+        """Should delete the least recently saved site indexes beyond max_sites"""
+        store = CrawlIndexStore(CacheManager(), max_sites=2)
+        for site in ('https://a.com', 'https://b.com', 'https://c.com'):
+            await store.save('agency-a', site, {f'{site}/': {'hash': 'h', 'fields': {}}})
+        await store.save('agency-a', 'https://b.com', {})
+        await store.save('agency-b', 'https://d.com', {'https://d.com/': {}})
+        
+        assert await store.load('agency-a', 'https://a.com') == {}
+        assert await store.load('agency-a', 'https://c.com') == {}
+        assert await store.load('agency-b', 'https://d.com') == {'https://d.com/': {}}
+        assert len(store.cache._local_cache) == 2
+    
+    @pytest.mark.asyncio
+    async def test_store_bounds_site_count_in_redis(self):
+        """Should evict through the shared Redis registry"""
+        redis = AsyncMock()
+        redis.zcard.return_value = 3
+        redis.zpopmin.return_value = [('agency-a:https://old.com', 1.0)]
+        store = CrawlIndexStore(CacheManager(redis_client=redis), max_sites=2)
+        
+        await store.save('agency-a', 'https://new.com', {})
+        
+        redis.zadd.assert_awaited_once()
+        redis.zpopmin.assert_awaited_once_with('cache:crawl_index:_sites', 1)
+        redis.delete.assert_awaited_once_with('cache:crawl_index:agency-a:https://old.com')
+
+
+class TestNearDuplicates:
+    """Test collapse_near_duplicates"""
+    
+    @staticmethod
+    def variant_site(variants: int = 8):
+        """Home page, an about page and product pages differing in one word, all in the same site chrome"""
+        description = ' '.join(f'feature{i} keeps you comfortable all day long' for i in range(160))
+        products = [f'https://example.com/shoe-{n}' for n in range(variants)]
+        links = ''.join(f'<a href="{product}">shoe</a>' for product in products)
+        menu = ' '.join(f'category{i} collection' for i in range(100))
+        
+        def page(title, main, related=''):
+            return (
+                f'<html><title>{title}</title><body><header>Example shop</header><nav>{menu}</nav>'
+                f'<main>{main}</main><aside>{related}</aside><footer>Contact us</footer></body></html>'
+            )
+        
+        site = {
+            'https://example.com/': page('Home', f'<h1>Welcome</h1>{links}<a href="/about">about</a>'),
+            'https://example.com/about': page('About', '<h1>About us</h1><p>Founded in 1990 in Leeds</p>'),
+        }
+        for n, product in enumerate(products):
+            site[product] = page(
+                f'Shoe colour {n}', f'<h1>Shoe colour {n}</h1><p>{description}</p>', f'See also shoe {n + 1}'
+            )
+        return site
+    
+    @pytest.mark.asyncio
+    async def test_collapses_template_pages(self):
+        """Should keep one representative per cluster and list the collapsed pages on it"""
+        result = await crawler(self.variant_site(), max_pages=50, collapse_near_duplicates=True).execute(
+            'https://example.com/', max_depth=1
+        )
+        
+        assert result['total_pages'] == 10
+        assert [page['url'] for page in result['pages']] == [
+            'https://example.com/', 'https://example.com/shoe-0', 'https://example.com/about'
+        ]
+        assert result['visited_urls'] == [page['url'] for page in result['pages']]
+        assert result['pages'][1]['duplicates'] == [
+            {'url': f'https://example.com/shoe-{n}', 'title': f'Shoe colour {n}', 'meta_description': ''}
+            for n in range(1, 8)
+        ]
+        assert result['pages'][0]['duplicates'] == result['pages'][2]['duplicates'] == []
+        assert result['near_duplicate_pages'] == 7
+    
+    @pytest.mark.asyncio
+    async def test_short_pages_in_shared_chrome_kept(self):
+        """Should compare main content only, so short distinct pages are not collapsed"""
+        site = self.variant_site(variants=0)
+        site['https://example.com/'] = site['https://example.com/'].replace(
+            '<a href="/about">', '<a href="/contact">contact</a><a href="/about">'
+        )
+        site['https://example.com/contact'] = site['https://example.com/about'].replace(
+            'About us</h1><p>Founded in 1990 in Leeds', 'Contact</h1><p>Write to hello@example.com'
+        )
+        result = await crawler(site, max_pages=50, collapse_near_duplicates=True).execute(
+            'https://example.com/', max_depth=1
+        )
+        
+        assert len(result['pages']) == 3
+        assert result['near_duplicate_pages'] == 0
+    
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        """Should keep every page and skip fingerprinting unless enabled"""
+        result = await crawler(self.variant_site(), max_pages=50).execute('https://example.com/', max_depth=1)
+        
+        assert len(result['pages']) == 10
+        assert 'near_duplicate_pages' not in result
+        assert all(page['fingerprint'] == '' for page in result['pages'])
+    
+    @pytest.mark.asyncio
+    async def test_compact_output(self):
+        """Should collapse compact output the same way"""
+        site = self.variant_site()
+        full = await crawler(site, max_pages=50, collapse_near_duplicates=True).execute(
+            'https://example.com/', max_depth=1
+        )
+        compact = await crawler(site, max_pages=50, collapse_near_duplicates=True, output_format='compact').execute(
+            'https://example.com/', max_depth=1
+        )
+        
+        assert expand_crawl(compact) == full
+    
+    @pytest.mark.asyncio
+    async def test_invalid_distance(self):
+        with pytest.raises(ValueError):
+            await crawler(self.variant_site(), near_duplicate_distance=40).execute('https://example.com/')
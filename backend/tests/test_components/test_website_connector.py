@@ -0,0 +1,325 @@
+"""
+Test WebsiteConnector - shared keep-alive client lifecycle
+"""
+import httpx
+import pytest
+from components.connectors.website_connector import (
+    WebsiteConnector,
+    get_shared_client,
+    close_shared_clients
+)
+
+
+def html_transport(requests: list):
+    """MockTransport that records requests and returns a small page"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, html='<html><title>ok</title></html>')
+    return httpx.MockTransport(handler)
+
+
+class TestSharedClient:
+    """Test client reuse across connectors"""
+    
+    @pytest.mark.asyncio
+    async def test_connectors_share_client(self):
+        """Should hand every connector the same client on one event loop"""
+        first = WebsiteConnector()
+        second = WebsiteConnector({'user_agent': 'Other/1.0', 'timeout': 5})
+        
+        assert first.client is second.client
+        assert first.client is get_shared_client()
+        
+        await close_shared_clients()
+        assert get_shared_client() is not None
+    
+    @pytest.mark.asyncio
+    async def test_close_shared_clients(self):
+        """Should close and replace the shared client"""
+        client = get_shared_client()
+        await close_shared_clients()
+        
+        assert client.is_closed
+        assert get_shared_client() is not client
+        await close_shared_clients()
+    
+    @pytest.mark.asyncio
+    async def test_private_client_closed_by_aclose(self):
+        """Should own and close a private client when shared_client is off"""
+        connector = WebsiteConnector({'shared_client': False})
+        client = connector.client
+        
+        assert client is not get_shared_client()
+        assert connector.client is client
+        
+        await connector.aclose()
+        assert client.is_closed
+        await close_shared_clients()
+    
+    @pytest.mark.asyncio
+    async def test_http2_falls_back_without_h2(self, monkeypatch):
+        """Should use HTTP/1.1 when h2 is not installed"""
+        import components.connectors.website_connector as module
+        monkeypatch.setattr(module, 'HTTP2_AVAILABLE', False)
+        
+        assert module._resolve_http2(True) is False
+
+
+class TestInjectedClient:
+    """Test externally owned clients"""
+    
+    @pytest.mark.asyncio
+    async def test_per_request_settings(self):
+        """Should send connector User-Agent on a shared client"""
+        requests = []
+        client = httpx.AsyncClient(transport=html_transport(requests))
+        connector = WebsiteConnector({'user_agent': 'TeamAI-Test/1.0'}, client=client)
+        
+        result = await connector.execute('https://example.com/')
+        
+        assert result['status_code'] == 200
+        assert '<title>ok</title>' in result['html']
+        assert requests[0].headers['User-Agent'] == 'TeamAI-Test/1.0'
+        await client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_injected_client_left_open(self):
+        """Should not close a client it does not own"""
+        client = httpx.AsyncClient(transport=html_transport([]))
+        connector = WebsiteConnector(client=client)
+        
+        await connector.execute('https://example.com/')
+        await connector.aclose()
+        
+        assert not client.is_closed
+        await client.aclose()
+
+
+class CountingStream(httpx.AsyncByteStream):
+    """Response body that records how many chunks were read"""
+    
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.read = 0
+    
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+
+def streaming_connector(body: CountingStream, headers: dict, **config) -> WebsiteConnector:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers=headers, stream=body)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return WebsiteConnector(config, client=client)
+
+
+class TestStreamingBody:
+    """Test content-type gating, body limits and incremental decoding"""
+    
+    @pytest.mark.asyncio
+    async def test_non_html_abandoned_unread(self):
+        """Should reject non-HTML responses without reading the body"""
+        body = CountingStream([b'%PDF-1.7'] * 100)
+        connector = streaming_connector(body, {'Content-Type': 'application/pdf'})
+        
+        result = await connector.execute('https://example.com/report.pdf')
+        
+        assert result['html'] is None
+        assert result['error'] == 'Unsupported content type: application/pdf'
+        assert body.read == 0
+    
+    @pytest.mark.asyncio
+    async def test_content_types_override(self):
+        """Should accept any type when content_types is empty (robots.txt)"""
+        body = CountingStream([b'User-agent: *\nDisallow: /admin\n'])
+        connector = streaming_connector(body, {'Content-Type': 'text/plain'})
+        
+        result = await connector.execute('https://example.com/robots.txt', content_types=())
+        
+        assert result['html'].startswith('User-agent')
+    
+    @pytest.mark.asyncio
+    async def test_body_truncated_at_limit(self):
+        """Should stop reading at max_body_bytes and flag the page"""
+        body = CountingStream([b'<p>' + b'x' * 997] * 10)
+        connector = streaming_connector(body, {'Content-Type': 'text/html'}, max_body_bytes=2500)
+        
+        result = await connector.execute('https://example.com/')
+        
+        assert result['truncated'] is True
+        assert len(result['content']) == 2500
+        assert len(result['html']) == 2500
+        assert body.read == 3
+    
+    @pytest.mark.asyncio
+    async def test_oversized_rejected_up_front(self):
+        """Should reject a declared oversized body when truncation is off"""
+        body = CountingStream([b'x' * 5000])
+        connector = streaming_connector(
+            body,
+            {'Content-Type': 'text/html', 'Content-Length': '5000'},
+            max_body_bytes=1000,
+            truncate_oversized=False
+        )
+        
+        result = await connector.execute('https://example.com/')
+        
+        assert result['error'] == 'Body exceeds 1000 bytes'
+        assert body.read == 0
+    
+    @pytest.mark.asyncio
+    async def test_meta_charset_used(self):
+        """Should decode with <meta charset> when the header has no charset"""
+        page = '<html><head><meta charset="iso-8859-1"><title>Café</title></head></html>'.encode('iso-8859-1')
+        connector = streaming_connector(CountingStream([page]), {'Content-Type': 'text/html'})
+        
+        result = await connector.execute('https://example.com/')
+        
+        assert result['encoding'] == 'iso8859-1'
+        assert '<title>Café</title>' in result['html']
+    
+    @pytest.mark.asyncio
+    async def test_multibyte_split_across_chunks(self):
+        """Should decode characters split between chunks"""
+        page = ('<html>' + 'é' * 2000 + '</html>').encode('utf-8')
+        chunks = [page[i:i + 333] for i in range(0, len(page), 333)]  # odd size splits 2-byte chars
+        connector = streaming_connector(CountingStream(chunks), {'Content-Type': 'text/html; charset=utf-8'})
+        
+        result = await connector.execute('https://example.com/')
+        
+        assert result['html'] == page.decode('utf-8')
+        assert result['truncated'] is False
+
+
+def flaky_connector(responses: list, requests: list, **config) -> WebsiteConnector:
+    """Connector whose transport returns (or raises) responses in order"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return WebsiteConnector({'retry_backoff': 0, **config}, client=client)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record retry delays instead of sleeping"""
+    delays = []
+    
+    async def fake_sleep(delay):
+        delays.append(delay)
+    
+    import components.connectors.website_connector as module
+    monkeypatch.setattr(module.asyncio, 'sleep', fake_sleep)
+    return delays
+
+
+class TestRetries:
+    """Test retry with backoff and Retry-After"""
+    
+    @pytest.mark.asyncio
+    async def test_retryable_status_retried(self, sleeps):
+        """Should retry 5xx responses until one succeeds"""
+        requests = []
+        connector = flaky_connector(
+            [httpx.Response(503), httpx.Response(502), httpx.Response(200, html='<p>ok</p>')],
+            requests
+        )
+        
+        result = await connector.execute('https://example.com/')
+        
+        assert result['status_code'] == 200
+        assert result['attempts'] == 3
+        assert len(sleeps) == 2
+    
+    @pytest.mark.asyncio
+    async def test_timeouts_retried(self, sleeps):
+        """Should retry timeouts and network errors"""
+        requests = []
+        connector = flaky_connector(
+            [httpx.ConnectTimeout('timed out'), httpx.Response(200, html='<p>ok</p>')],
+            requests
+        )
+        
+        result = await connector.execute('https://example.com/')
+        
+        assert result['html'] == '<p>ok</p>'
+        assert result['attempts'] == 2
+    
+    @pytest.mark.asyncio
+    async def test_client_errors_not_retried(self, sleeps):
+        """Should return 404 immediately"""
+        requests = []
+        connector = flaky_connector([httpx.Response(404)], requests)
+        
+        result = await connector.execute('https://example.com/missing')
+        
+        assert result['error'] == 'HTTP 404'
+        assert result['attempts'] == 1
+        assert sleeps == []
+    
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, sleeps):
+        """Should stop after max_retries retries"""
+        requests = []
+        connector = flaky_connector([httpx.Response(500)] * 5, requests, max_retries=2)
+        
+        result = await connector.execute('https://example.com/')
+        
+        assert result['error'] == 'HTTP 500'
+        assert result['attempts'] == 3
+        assert len(requests) == 3
+    
+    @pytest.mark.asyncio
+    async def test_retry_after_honoured(self, sleeps):
+        """Should wait at least Retry-After seconds"""
+        requests = []
+        connector = flaky_connector(
+            [httpx.Response(429, headers={'Retry-After': '7'}), httpx.Response(200, html='<p>ok</p>')],
+            requests
+        )
+        
+        result = await connector.execute('https://example.com/')
+        
+        assert result['status_code'] == 200
+        assert sleeps == [7.0]
+    
+    @pytest.mark.asyncio
+    async def test_long_retry_after_gives_up(self, sleeps):
+        """Should not wait beyond retry_max_delay"""
+        requests = []
+        connector = flaky_connector(
+            [httpx.Response(503, headers={'Retry-After': '3600'})], requests, retry_max_delay=10
+        )
+        
+        result = await connector.execute('https://example.com/')
+        
+        assert result['status_code'] == 503
+        assert result['attempts'] == 1
+        assert sleeps == []
+    
+    def test_backoff_grows_with_jitter(self):
+        """Should draw delays from a doubling window capped at retry_max_delay"""
+        connector = WebsiteConnector({'retry_backoff': 1.0, 'retry_max_delay': 5.0})
+        
+        for attempt, window in ((1, 1.0), (2, 2.0), (3, 4.0), (6, 5.0)):
+            delays = [connector._retry_delay(attempt, None) for _ in range(50)]
+            assert all(0 <= delay <= window for delay in delays)
+            assert len(set(delays)) > 1
+    
+    def test_parse_retry_after(self):
+        """Should parse seconds and HTTP dates"""
+        from email.utils import format_datetime
+        from datetime import datetime, timedelta, timezone
+        from components.connectors.website_connector import parse_retry_after
+        
+        future = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=120), usegmt=True)
+        
+        assert parse_retry_after('30') == 30.0
+        assert 100 < parse_retry_after(future) <= 120
+        assert parse_retry_after('soon') is None
+        assert parse_retry_after(None) is None